@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""Offline microbenchmarks for the perception and grounding hot paths."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from difflib import SequenceMatcher
+from typing import Callable, List, Optional
+
+from voice.config import SETTINGS_ROOT
+from voice.grounding import Target, contains_any_text, ground_target, normalize_text
+from voice.kiosk_profile import KioskProfile, MenuRecord
+from voice.matcher import Matcher, similarity
+from voice.perception import ObservedElement, Rect, ScreenObservation
+
+
+def synthetic_observation(elements: int, seed: int = 0) -> ScreenObservation:
+    """A menu-like screen: a grid of menu cards plus a short cart list."""
+    rows: List[ObservedElement] = []
+    for index in range(elements):
+        column, row = index % 4, index // 4
+        rows.append(
+            ObservedElement(
+                f"메뉴 {seed}-{index} 아이스 {index % 7}",
+                Rect(20 + column * 180, 120 + row * 90, 180 + column * 180, 170 + row * 90),
+                role="ButtonControl",
+                source="uia" if index % 3 else "ocr",
+                confidence=0.9,
+            )
+        )
+    return ScreenObservation(tuple(rows), 1080, 1920, visual_hash=str(seed))
+
+
+def _poll_round(observation: ScreenObservation, baseline: ScreenObservation) -> None:
+    # One postcondition check plus the state/page evidence reads that follow it.
+    observation.signature != baseline.signature
+    observation.signature == baseline.signature
+    contains_any_text(observation, ("장바구니", "메뉴 0-3"))
+    for marker in ("결제하기", "총 수량", "메뉴 0-1", "메뉴 0-2"):
+        contains_any_text(observation, (marker,))
+    ground_target(observation, Target("menu", ("메뉴 0-5 아이스 5",)), cutoff=0.0, ambiguity_margin=0.0)
+
+
+def _measure(call: Callable[[], None], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - started) / repeat
+
+
+def bench_observation(args: argparse.Namespace) -> dict:
+    observations = [synthetic_observation(args.elements, seed) for seed in range(args.observations)]
+    baseline = synthetic_observation(args.elements, seed=-1)
+
+    def rederived() -> None:
+        # Clearing the memo before every read reproduces per-access derivation.
+        for observation in observations:
+            for _ in range(args.reads):
+                observation._derived.clear()
+                baseline._derived.clear()
+                _poll_round(observation, baseline)
+
+    def memoized() -> None:
+        for observation in observations:
+            observation._derived.clear()
+            for _ in range(args.reads):
+                _poll_round(observation, baseline)
+
+    before = _measure(rederived, args.repeat)
+    after = _measure(memoized, args.repeat)
+    return {
+        "observations": args.observations,
+        "elements": args.elements,
+        "reads_per_observation": args.reads,
+        "rederived_ms": round(before * 1000, 3),
+        "memoized_ms": round(after * 1000, 3),
+        "speedup": round(before / max(after, 1e-12), 2),
+    }
+
+
+def bench_index(args: argparse.Namespace) -> dict:
+    observations = [synthetic_observation(args.elements, seed) for seed in range(args.observations)]
+    markers = tuple(f"메뉴{seed}-{index}" for seed in range(2) for index in range(args.markers))
+
+    def scanned() -> None:
+        # The previous shape: every marker against every normalized text.
+        for observation in observations:
+            texts = observation.visible_texts
+            for marker in markers:
+                any(marker == text or marker in text for text in texts)
+
+    def indexed() -> None:
+        for observation in observations:
+            observation._derived.pop(("text_index", None), None)
+            observation.text_index().present(markers)
+
+    for observation in observations:
+        observation.visible_texts
+    before = _measure(scanned, args.repeat)
+    after = _measure(indexed, args.repeat)
+    return {
+        "observations": args.observations,
+        "elements": args.elements,
+        "markers": len(markers),
+        "scanned_ms": round(before * 1000, 3),
+        "indexed_ms": round(after * 1000, 3),
+        "speedup": round(before / max(after, 1e-12), 2),
+    }
+
+
+def scaled_catalog(path: str, size: int) -> List[str]:
+    """The menu card names, repeated under distinct prefixes up to ``size``."""
+    with open(path, "r", encoding="utf-8") as handle:
+        names = [str(card["name"]) for card in json.load(handle)]
+    prefixes = [""] + [chr(0xAC00 + 28 * step) for step in range(size // max(1, len(names)) + 1)]
+    catalog = [f"{prefix}{name}" for prefix in prefixes for name in names]
+    return catalog[:size]
+
+
+def _difflib_best(names: List[str], normalized: List[str], spoken: str, cutoff: float) -> Optional[str]:
+    # The previous MenuIndex.find_menu_best fallback: one ratio per menu.
+    wanted = normalize_text(spoken)
+    best, best_score = None, 0.0
+    for name, candidate in zip(names, normalized):
+        score = SequenceMatcher(None, wanted, candidate).ratio()
+        if score > best_score:
+            best, best_score = name, score
+    return best if best_score >= cutoff else None
+
+
+def bench_matcher(args: argparse.Namespace) -> dict:
+    names = scaled_catalog(args.cards, args.items)
+    normalized = [normalize_text(name) for name in names]
+    # Near misses: one syllable dropped, or one vowel swapped the way OCR does.
+    queries = []
+    for name in names[: args.queries]:
+        squashed = normalize_text(name)
+        queries.append(squashed[:-1])
+        queries.append(squashed.replace("라", "러", 1).replace("이", "어", 1))
+    started = time.perf_counter()
+    matcher = Matcher(names)
+    build = time.perf_counter() - started
+
+    def scanned() -> None:
+        for query in queries:
+            _difflib_best(names, normalized, query, args.cutoff)
+
+    def tiered() -> None:
+        for query in queries:
+            matcher.best(query, args.cutoff)
+
+    agreed = sum(
+        _difflib_best(names, normalized, query, args.cutoff)
+        == ((matcher.best(query, args.cutoff) or (None,))[0])
+        for query in queries
+    )
+    before = _measure(scanned, args.repeat)
+    after = _measure(tiered, args.repeat)
+    return {
+        "items": len(names),
+        "queries": len(queries),
+        "build_ms": round(build * 1000, 3),
+        "difflib_ms_per_query": round(before * 1000 / max(1, len(queries)), 3),
+        "tiered_ms_per_query": round(after * 1000 / max(1, len(queries)), 3),
+        "same_answer": agreed,
+        "speedup": round(before / max(after, 1e-12), 2),
+    }
+
+
+def bench_resolve(args: argparse.Namespace) -> dict:
+    with open(args.profile, "r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    names = scaled_catalog(args.cards, args.items)
+    records = [MenuRecord(name, "커피", 1, (0, 0)) for name in names]
+    started = time.perf_counter()
+    profile = KioskProfile(data, records)
+    build = time.perf_counter() - started
+    exact = [{"name": name, "temperature": "ICE"} for name in names[-args.queries :]]
+    # The scaled catalog repeats every name under one-syllable prefixes, so a
+    # dropped syllable leaves dozens of near ties: the worst case for pruning.
+    near_miss = [{"name": normalize_text(name)[:-1]} for name in names[-args.queries :]]
+
+    def scanned(items: List[dict]) -> Callable[[], None]:
+        def run() -> None:
+            # The previous shape: base names and a ratio for every record per item.
+            for item in items:
+                requested = profile._base_name(item["name"])
+                for record in profile.menu_records:
+                    similarity(requested, profile._base_name(record.name), 0.27)
+
+        return run
+
+    def indexed(items: List[dict]) -> Callable[[], None]:
+        def run() -> None:
+            for item in items:
+                try:
+                    profile.resolve_order_item(item)
+                except ValueError:
+                    pass
+
+        return run
+
+    before = _measure(scanned(exact + near_miss), args.repeat) / (len(exact) + len(near_miss))
+    exact_after = _measure(indexed(exact), args.repeat) / max(1, len(exact))
+    near_after = _measure(indexed(near_miss), args.repeat) / max(1, len(near_miss))
+    return {
+        "items": len(records),
+        "queries": len(exact) + len(near_miss),
+        "build_ms": round(build * 1000, 3),
+        "scanned_us_per_item": round(before * 1e6, 1),
+        "indexed_exact_us_per_item": round(exact_after * 1e6, 1),
+        "indexed_near_miss_us_per_item": round(near_after * 1e6, 1),
+        "speedup": round(before / max((exact_after + near_after) / 2, 1e-12), 2),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="화면 관찰/그라운딩 경로의 오프라인 마이크로벤치마크")
+    commands = parser.add_subparsers(dest="command", required=True)
+    observation = commands.add_parser("observation", help="관찰 파생값 메모이제이션 효과 측정")
+    observation.add_argument("--observations", type=int, default=20)
+    observation.add_argument("--elements", type=int, default=80)
+    observation.add_argument("--reads", type=int, default=4, help="관찰 하나당 poll 판정 횟수")
+    observation.add_argument("--repeat", type=int, default=5)
+    observation.set_defaults(run=bench_observation)
+    index = commands.add_parser("index", help="관찰 텍스트 인덱스의 마커 질의 비용 측정")
+    index.add_argument("--observations", type=int, default=20)
+    index.add_argument("--elements", type=int, default=80)
+    index.add_argument("--markers", type=int, default=20, help="질의 마커 수의 절반")
+    index.add_argument("--repeat", type=int, default=5)
+    index.set_defaults(run=bench_index)
+    matcher = commands.add_parser("matcher", help="메뉴 이름 퍼지 매칭: difflib 대비 단계별 매처")
+    matcher.add_argument("--cards", default=str(SETTINGS_ROOT / "menu_cards.json"))
+    matcher.add_argument("--items", type=int, default=5000, help="카탈로그를 늘릴 메뉴 수")
+    matcher.add_argument("--queries", type=int, default=20, help="질의를 만들 메뉴 수 (메뉴당 2개)")
+    matcher.add_argument("--cutoff", type=float, default=0.72)
+    matcher.add_argument("--repeat", type=int, default=3)
+    matcher.set_defaults(run=bench_matcher)
+    resolve = commands.add_parser("resolve", help="주문 항목 → 메뉴 해석: 전체 스캔 대비 사전 색인")
+    resolve.add_argument("--profile", default=str(SETTINGS_ROOT / "kiosk_profile.json"))
+    resolve.add_argument("--cards", default=str(SETTINGS_ROOT / "menu_cards.json"))
+    resolve.add_argument("--items", type=int, default=5000, help="카탈로그를 늘릴 메뉴 수")
+    resolve.add_argument("--queries", type=int, default=20, help="질의를 만들 메뉴 수 (메뉴당 2개)")
+    resolve.add_argument("--repeat", type=int, default=3)
+    resolve.set_defaults(run=bench_resolve)
+    args = parser.parse_args(argv)
+    print(json.dumps(args.run(args), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
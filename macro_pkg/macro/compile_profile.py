@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Validate the kiosk profile sources and write the compiled artifact."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from voice.config import Config
+from voice.errors import ProfileError
+from voice.profile_bundle import compile_bundle, write_bundle
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="프로필·메뉴 카드·UI 좌표를 함께 검증하고 미리 컴파일한 프로필 파일을 만듭니다."
+    )
+    parser.add_argument("--output", help="컴파일 결과 경로 (기본값: KIOSK_PROFILE_ARTIFACT)")
+    parser.add_argument("--check", action="store_true", help="검증만 하고 파일은 쓰지 않음")
+    args = parser.parse_args(argv)
+
+    config = Config()
+    try:
+        bundle = compile_bundle(config.profile_path, config.menu_cards_path, config.ui_coords_path)
+    except ProfileError as exc:
+        print(f"[ERR] {exc}", file=sys.stderr)
+        return 1
+
+    output = args.output or config.profile_artifact_path
+    payload = {
+        "menus": len(bundle.profile.menu_records),
+        "states": sorted(bundle.graph.state_markers),
+        "sources": [path for path, *_ in bundle.sources],
+        "artifact": None,
+        "sha256": None,
+    }
+    if not args.check:
+        if not output:
+            print("[ERR] --output 또는 KIOSK_PROFILE_ARTIFACT가 필요합니다.", file=sys.stderr)
+            return 2
+        payload["artifact"] = output
+        payload["sha256"] = write_bundle(bundle, output)
+    print(json.dumps(payload, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
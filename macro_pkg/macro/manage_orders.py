@@ -9,7 +9,8 @@ import os
 import sys
 from pathlib import Path
 
-from voice.order_queue import OrderQueue
+from voice.latency import latency_report
+from voice.order_queue import OrderQueue, queue_options
 
 
 def queue_path() -> str:
@@ -24,6 +25,10 @@ def main(argv=None) -> int:
     subcommands = parser.add_subparsers(dest="command", required=True)
     list_parser = subcommands.add_parser("list", help="최근 주문 상태 표시")
     list_parser.add_argument("--limit", type=int, default=50)
+    latency_parser = subcommands.add_parser(
+        "latency", help="최근 완료 주문의 발화 종료~결제 준비 단계별 p50/p95 지연"
+    )
+    latency_parser.add_argument("--limit", type=int, default=500)
 
     resolve_parser = subcommands.add_parser(
         "resolve", help="claimed/awaiting_handoff/uncertain 주문에 운영자 판단 기록"
@@ -36,13 +41,21 @@ def main(argv=None) -> int:
         help="실제 장바구니 상태를 확인했음을 명시",
     )
     args = parser.parse_args(argv)
-    orders = OrderQueue(queue_path())
+    if args.command == "resolve" and not args.side_effects_checked:
+        parser.error("resolve에는 실제 키오스크 상태 확인 후 --side-effects-checked가 필요합니다")
+    with OrderQueue(queue_path(), **queue_options()) as orders:
+        return run(args, orders)
+
 
+def run(args: argparse.Namespace, orders: OrderQueue) -> int:
     if args.command == "list":
         print(json.dumps(orders.list_orders(args.limit), ensure_ascii=False, indent=2))
         return 0
-    if not args.side_effects_checked:
-        parser.error("resolve에는 실제 키오스크 상태 확인 후 --side-effects-checked가 필요합니다")
+    if args.command == "latency":
+        history = orders.stage_history(args.limit)
+        report = latency_report(row["stamps"] for row in history)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
     try:
         status = orders.resolve_uncertain(args.order_id, args.resolution)
     except (KeyError, ValueError) as exc:
@@ -8,12 +8,14 @@ import hashlib
 import hmac
 import logging
 import os
+import select
+import socket
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Any, Dict, Mapping, Optional, Sequence
-from urllib.parse import unquote, urlparse
+from urllib.parse import parse_qs, unquote, urlparse
 
-from voice.order_queue import OrderQueue
+from voice.order_queue import OrderQueue, queue_options
 
 
 logging.basicConfig(level=logging.INFO)
@@ -44,7 +46,7 @@ def queue() -> OrderQueue:
     global _queue
     if _queue is None:
         default = Path.home() / ".macro" / "orders.sqlite3"
-        _queue = OrderQueue(os.environ.get("KIOSK_ORDER_DB", str(default)))
+        _queue = OrderQueue(os.environ.get("KIOSK_ORDER_DB", str(default)), **queue_options())
     return _queue
 
 
@@ -82,8 +84,42 @@ def idempotency_key(payload: Any, header_value: str = "") -> Optional[str]:
     return None
 
 
+def correlation_id(payload: Any, header_value: str = "") -> Optional[str]:
+    """Utterance correlation ID from the header or the backend's order payload."""
+    if header_value.strip():
+        return header_value.strip()
+    if not isinstance(payload, dict):
+        return None
+    for key in ("correlationId", "utteranceId"):
+        value = str(payload.get(key, "") or "").strip()
+        if value:
+            return value
+    return None
+
+
+def claim_wait(query: str, limit: float) -> float:
+    """Seconds a ``GET /api/orders?wait=N`` claim may block, capped at ``limit``."""
+    values = parse_qs(query).get("wait")
+    if not values:
+        return 0.0
+    wait = float(values[-1])
+    if not wait >= 0:
+        raise ValueError("wait must be a non-negative number of seconds")
+    return min(wait, limit)
+
+
+def client_disconnected(connection: socket.socket) -> bool:
+    """Whether the peer already closed ``connection``, e.g. after its read timed out."""
+    try:
+        readable, _, _ = select.select([connection], [], [], 0)
+        return bool(readable) and not connection.recv(1, socket.MSG_PEEK)
+    except OSError:
+        return True
+
+
 class OrdersHandler(BaseHTTPRequestHandler):
     max_body_bytes = 1024 * 1024
+    max_wait_sec = 30.0
 
     def _send_json(self, code: int, value: Any) -> None:
         body = json.dumps(value, ensure_ascii=False).encode("utf-8")
@@ -99,6 +135,10 @@ class OrdersHandler(BaseHTTPRequestHandler):
             raise ValueError("invalid content length")
         return json.loads(self.rfile.read(length).decode("utf-8"))
 
+    def _release_claim(self, order_id: str, reason: str) -> None:
+        if queue().release_claim(order_id):
+            logger.warning("order %s returned to the queue: %s", order_id, reason)
+
     def _require_authorization(self) -> bool:
         if is_authorized(self.headers):
             return True
@@ -106,23 +146,39 @@ class OrdersHandler(BaseHTTPRequestHandler):
         return False
 
     def do_GET(self) -> None:
-        path = urlparse(self.path).path
+        url = urlparse(self.path)
+        path = url.path
         if path.startswith("/api/") and not self._require_authorization():
             return
         if path == "/api/orders":
-            order = queue().claim_next()
+            try:
+                wait = claim_wait(url.query, self.max_wait_sec)
+            except ValueError:
+                self._send_json(400, {"success": False, "error": "invalid wait"})
+                return
+            order = queue().claim_next(wait)
             if order is None:
                 self.send_response(204)
                 self.end_headers()
                 return
-            self._send_json(
-                200,
-                {
-                    "order_id": order.order_id,
-                    "items": list(order.items),
-                    "attempt": order.attempt,
-                },
-            )
+            # A long-poll client may have given up while the claim waited.
+            if client_disconnected(self.connection):
+                self._release_claim(order.order_id, "client disconnected")
+                self.close_connection = True
+                return
+            try:
+                self._send_json(
+                    200,
+                    {
+                        "order_id": order.order_id,
+                        "items": list(order.items),
+                        "attempt": order.attempt,
+                        "correlation_id": order.correlation_id,
+                    },
+                )
+            except OSError:
+                self._release_claim(order.order_id, "response not delivered")
+                self.close_connection = True
             return
         if path == "/api/mic-pulse":
             self._send_json(200, {"mic_pulse_enabled": mic_pulse_enabled})
@@ -148,16 +204,19 @@ class OrdersHandler(BaseHTTPRequestHandler):
             if not items:
                 self._send_json(400, {"success": False, "error": "order items are required"})
                 return
+            correlation = correlation_id(payload, self.headers.get("X-Correlation-Id", ""))
             try:
                 order_id, created, status = queue().enqueue(
                     items,
                     idempotency_key=idempotency_key(
                         payload, self.headers.get("Idempotency-Key", "")
                     ),
+                    correlation_id=correlation,
                 )
             except ValueError as exc:
                 self._send_json(400, {"success": False, "error": str(exc)})
                 return
+            logger.info("order %s %s (correlation %s)", order_id, status, correlation or order_id)
             self._send_json(
                 200,
                 {
@@ -213,3 +272,5 @@ if __name__ == "__main__":
         logger.info("ordersHub stopped")
     finally:
         server.server_close()
+        if _queue is not None:
+            _queue.close()
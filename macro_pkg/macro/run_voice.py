@@ -70,6 +70,11 @@ def main():
             f"✅ 결제 동작 시뮬레이션: "
             f"{'ENABLED' if cfg.allow_checkout and cfg.dry_run else 'BLOCKED'}"
         )
+        print(
+            f"✅ OCR 워밍업: "
+            f"{'BACKGROUND' if cfg.ocr_warmup and cfg.ocr_enabled else 'ON FIRST USE'}"
+            + (f" (threads={cfg.ocr_threads})" if cfg.ocr_threads else "")
+        )
         
         print("\n🚀 마이크 오버레이 시작...")
         print("💡 마이크 버튼을 클릭하여 녹음을 시작하세요")
@@ -90,7 +95,12 @@ def main():
         overlay.root.bind('<Key>', on_escape)
         overlay.root.focus_set()
         
-        overlay.run()
+        try:
+            overlay.run()
+        finally:
+            # OCR 캐시 저장과 캡처·스레드 정리 (run()에서 이미 닫았으면 아무 일도 없음)
+            if getattr(overlay, "nav", None) is not None:
+                overlay.nav.close()
         
         print("✅ 프로그램 정상 종료")
         return 0
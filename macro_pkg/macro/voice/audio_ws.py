@@ -8,6 +8,7 @@ import time
 import websockets
 from typing import Optional, Callable
 from .config import Config
+from .latency import UtteranceLog, new_correlation_id
 from .tts_player import TTSPlayer
 
 class AudioWSClient:
@@ -24,6 +25,8 @@ class AudioWSClient:
         self.connected = False
         self.tts_player = TTSPlayer(prefer_pygame_fallback=cfg.tts_prefer_pygame_fallback)
         self._fallback_timer = None
+        # 발화 종료 시각(monotonic)을 상관 ID로 기록해 주문 지연 측정에 사용
+        self.utterances = UtteranceLog()
 
     async def _connect(self):
         try:
@@ -231,13 +234,15 @@ class AudioWSClient:
     def send_audio_end(self):
         if not (self.ws and self.loop and self.connected):
             return
+        utterance_id = new_correlation_id()
+        self.utterances.record(utterance_id)
         try:
             fut = asyncio.run_coroutine_threadsafe(
-                self.ws.send(json.dumps({"type": "audio.end"})),
+                self.ws.send(json.dumps({"type": "audio.end", "utteranceId": utterance_id})),
                 self.loop
             )
             fut.result(timeout=1)
-            print("[WS] audio.end 전송 (utterance)")
+            print(f"[WS] audio.end 전송 (utterance {utterance_id})")
         except Exception as e:
             print(f"[WS] audio.end 전송 실패: {e}")
 
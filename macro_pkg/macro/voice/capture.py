@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import platform
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def _bgr_frame(shot: Any, buffer: Any) -> Tuple[Any, Any]:
+    """Copy the BGRA grab into a reused contiguous BGR buffer.
+
+    The grab is viewed in place; the only copy is into ``buffer``, which the
+    recognizer receives directly instead of re-copying a strided slice.
+    """
+    import numpy as np  # type: ignore
+
+    height, width = int(shot.height), int(shot.width)
+    pixels = np.frombuffer(shot.raw, dtype=np.uint8).reshape(height, width, 4)
+    if buffer is None or buffer.shape != (height, width, 3):
+        buffer = np.empty((height, width, 3), dtype=np.uint8)
+    np.copyto(buffer, pixels[:, :, :3])
+    return buffer, buffer
+
+
+def _win32_window_rect(handle: Any) -> Optional[dict]:
+    """Re-validate a pinned window handle with three user32 calls."""
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32  # type: ignore[attr-defined]
+    hwnd = wintypes.HWND(int(handle))
+    if not user32.IsWindow(hwnd):
+        return None
+    if user32.IsIconic(hwnd):
+        raise RuntimeError("target kiosk window is minimized")
+    rect = wintypes.RECT()
+    if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+        return None
+    return {
+        "left": int(rect.left),
+        "top": int(rect.top),
+        "width": int(rect.right - rect.left),
+        "height": int(rect.bottom - rect.top),
+    }
+
+
+def _pygetwindow_windows() -> List[Any]:
+    import pygetwindow  # type: ignore
+
+    return list(pygetwindow.getAllWindows())
+
+
+def _mss_grabber() -> Any:
+    import mss  # type: ignore
+
+    return mss.mss()
+
+
+class CaptureSession:
+    """Long-lived screen grabber bound to one kiosk window.
+
+    The grabber stays open (one per thread, as mss requires), the window is
+    enumerated once and then re-validated through its native handle, and the
+    BGR frame buffer is reused between grabs. ``last_timings`` records seconds
+    spent locating the window, grabbing, and converting the last frame.
+    """
+
+    def __init__(
+        self,
+        window_title: str = "",
+        monitor_index: int = 1,
+        *,
+        grabber_factory: Callable[[], Any] = _mss_grabber,
+        list_windows: Callable[[], List[Any]] = _pygetwindow_windows,
+        window_rect: Callable[[Any], Optional[dict]] = _win32_window_rect,
+        convert: Callable[[Any, Any], Tuple[Any, Any]] = _bgr_frame,
+        windows_platform: Optional[bool] = None,
+        revalidate_sec: float = 5.0,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.window_title = window_title.strip()
+        self.monitor_index = monitor_index
+        self.window_handle: Any = None
+        self.last_timings: Dict[str, float] = {}
+        self.revalidate_sec = revalidate_sec
+        self._grabber_factory = grabber_factory
+        self._list_windows = list_windows
+        self._window_rect = window_rect
+        self._convert = convert
+        self._windows = (
+            platform.system() == "Windows" if windows_platform is None else windows_platform
+        )
+        self._clock = clock
+        self._local = threading.local()
+        self._grabbers: List[Any] = []
+        self._grabbers_lock = threading.Lock()
+        self._enumerated_at: Optional[float] = None
+
+    def _grabber(self) -> Any:
+        grabber = getattr(self._local, "grabber", None)
+        if grabber is None:
+            grabber = self._grabber_factory()
+            self._local.grabber = grabber
+            with self._grabbers_lock:
+                self._grabbers.append(grabber)
+        return grabber
+
+    def _enumerate(self) -> dict:
+        windows = [
+            window
+            for window in self._list_windows()
+            if getattr(window, "width", 0) > 0
+            and getattr(window, "height", 0) > 0
+            and self.window_title.casefold() in str(getattr(window, "title", "")).casefold()
+        ]
+        exact = [
+            window
+            for window in windows
+            if str(getattr(window, "title", "")).strip().casefold()
+            == self.window_title.casefold()
+        ]
+        candidates = exact or windows
+        if len(candidates) != 1:
+            raise RuntimeError(
+                f"target window must match exactly once: {self.window_title} "
+                f"(found {len(candidates)})"
+            )
+        window = candidates[0]
+        if bool(getattr(window, "isMinimized", False)):
+            raise RuntimeError("target kiosk window is minimized")
+        handle = getattr(window, "_hWnd", str(getattr(window, "title", "")))
+        if self.window_handle is None:
+            self.window_handle = handle
+        elif handle != self.window_handle:
+            raise RuntimeError("target kiosk window identity changed")
+        self._enumerated_at = self._clock()
+        return {
+            "left": int(window.left),
+            "top": int(window.top),
+            "width": int(window.width),
+            "height": int(window.height),
+        }
+
+    def target_region(self) -> Optional[dict]:
+        """Return the pinned window rectangle, enumerating windows only when needed."""
+        if not self.window_title or not self._windows:
+            return None
+        started = self._clock()
+        region = None
+        if (
+            isinstance(self.window_handle, int)
+            and self._enumerated_at is not None
+            and started - self._enumerated_at < self.revalidate_sec
+        ):
+            region = self._window_rect(self.window_handle)
+            if region is not None and (region["width"] <= 0 or region["height"] <= 0):
+                region = None
+        if region is None:
+            region = self._enumerate()
+        self.last_timings = {"locate": self._clock() - started}
+        return region
+
+    def monitor_region(self) -> dict:
+        grabber = self._grabber()
+        if self.monitor_index >= len(grabber.monitors):
+            raise RuntimeError(f"monitor index is unavailable: {self.monitor_index}")
+        return grabber.monitors[self.monitor_index]
+
+    def grab(self, region: Optional[dict] = None) -> Tuple[Any, dict]:
+        """Grab one BGR frame of ``region`` or of the configured monitor."""
+        started = self._clock()
+        if region is None:
+            region = self.monitor_region()
+        shot = self._grabber().grab(region)
+        grabbed = self._clock()
+        frame, self._local.buffer = self._convert(shot, getattr(self._local, "buffer", None))
+        converted = self._clock()
+        self.last_timings = {
+            **self.last_timings,
+            "grab": grabbed - started,
+            "convert": converted - grabbed,
+        }
+        return frame, region
+
+    def close(self) -> None:
+        with self._grabbers_lock:
+            grabbers, self._grabbers = self._grabbers, []
+        for grabber in grabbers:
+            try:
+                grabber.close()
+            except Exception:
+                pass
+        self._local = threading.local()
@@ -61,6 +61,15 @@ class Config:
             "KIOSK_PROFILE", str(SETTINGS_ROOT / "kiosk_profile.json")
         )
     )
+    profile_artifact_path: str = field(
+        default_factory=lambda: _env("KIOSK_PROFILE_ARTIFACT", "")
+    )
+    profile_reload: bool = field(
+        default_factory=lambda: _env_bool("KIOSK_PROFILE_RELOAD", True)
+    )
+    profile_check_interval_sec: float = field(
+        default_factory=lambda: _env_positive_float("KIOSK_PROFILE_CHECK_SEC", 1.0)
+    )
 
     audio_ws_url: str = field(
         default_factory=lambda: _env("KIOSK_AUDIO_WS_URL", "ws://localhost:8080/chat")
@@ -74,6 +83,10 @@ class Config:
     orders_poll_interval_sec: float = field(
         default_factory=lambda: float(_env("KIOSK_ORDERS_POLL_SEC", "0.1"))
     )
+    # Server-side long-poll per claim request; 0 falls back to plain polling.
+    orders_wait_sec: float = field(
+        default_factory=lambda: float(_env("KIOSK_ORDERS_WAIT_SEC", "2.0"))
+    )
 
     sample_rate: int = field(default_factory=lambda: int(_env("KIOSK_SAMPLE_RATE", "16000")))
     frame_ms: int = field(default_factory=lambda: int(_env("KIOSK_FRAME_MS", "20")))
@@ -110,6 +123,18 @@ class Config:
     transition_poll_sec: float = field(
         default_factory=lambda: _env_positive_float("KIOSK_TRANSITION_POLL_SEC", 0.20)
     )
+    transition_settle_sec: float = field(
+        default_factory=lambda: _env_positive_float("KIOSK_TRANSITION_SETTLE_SEC", 0.03)
+    )
+    observation_reuse: bool = field(
+        default_factory=lambda: _env_bool("KIOSK_OBSERVATION_REUSE", True)
+    )
+    observation_reuse_max_age_sec: float = field(
+        default_factory=lambda: _env_positive_float("KIOSK_OBSERVATION_REUSE_SEC", 0.5)
+    )
+    route_by_latency: bool = field(
+        default_factory=lambda: _env_bool("KIOSK_ROUTE_BY_LATENCY", True)
+    )
     match_cutoff: float = field(
         default_factory=lambda: _env_positive_float("KIOSK_MATCH_CUTOFF", 0.82)
     )
@@ -128,6 +153,15 @@ class Config:
 
     uia_enabled: bool = field(default_factory=lambda: _env_bool("KIOSK_UIA_ENABLED", True))
     ocr_enabled: bool = field(default_factory=lambda: _env_bool("KIOSK_OCR_ENABLED", True))
+    uia_tree_cache: bool = field(
+        default_factory=lambda: _env_bool("KIOSK_UIA_TREE_CACHE", True)
+    )
+    uia_batch_properties: bool = field(
+        default_factory=lambda: _env_bool("KIOSK_UIA_BATCH", True)
+    )
+    uia_cache_max_age_sec: float = field(
+        default_factory=lambda: _env_positive_float("KIOSK_UIA_CACHE_MAX_AGE_SEC", 2.0)
+    )
     kiosk_window_title: str = field(
         default_factory=lambda: _env("KIOSK_WINDOW_TITLE", "")
     )
@@ -140,6 +174,31 @@ class Config:
     ocr_allow_download: bool = field(
         default_factory=lambda: _env_bool("KIOSK_OCR_ALLOW_DOWNLOAD", False)
     )
+    ocr_tile_diff: bool = field(
+        default_factory=lambda: _env_bool("KIOSK_OCR_TILE_DIFF", True)
+    )
+    ocr_cache_entries: int = field(
+        default_factory=lambda: _env_positive_int("KIOSK_OCR_CACHE_ENTRIES", 256)
+    )
+    ocr_cache_path: str = field(
+        default_factory=lambda: _env("KIOSK_OCR_CACHE_PATH", "")
+    )
+    observe_parallel: bool = field(
+        default_factory=lambda: _env_bool("KIOSK_OBSERVE_PARALLEL", False)
+    )
+    uia_latency_budget_sec: float = field(
+        default_factory=lambda: _env_positive_float("KIOSK_UIA_LATENCY_BUDGET_SEC", 0.15)
+    )
+    uia_min_elements: int = field(
+        default_factory=lambda: _env_positive_int("KIOSK_UIA_MIN_ELEMENTS", 3)
+    )
+    ocr_warmup: bool = field(default_factory=lambda: _env_bool("KIOSK_OCR_WARMUP", False))
+    ocr_threads: int = field(default_factory=lambda: _env_positive_int("KIOSK_OCR_THREADS", 0))
+    order_grouping: bool = field(
+        default_factory=lambda: _env_bool("KIOSK_ORDER_GROUPING", False)
+    )
+    trace_orders: bool = field(default_factory=lambda: _env_bool("KIOSK_TRACE", True))
+    trace_dir: str = field(default_factory=lambda: _env("KIOSK_TRACE_DIR", ""))
     max_order_items: int = field(
         default_factory=lambda: _env_positive_int("KIOSK_MAX_ORDER_ITEMS", 10)
     )
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from difflib import SequenceMatcher
-from typing import Iterable, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from .errors import GroundingError
-from .perception import ObservedElement, ScreenObservation
+from .matcher import similarity
+from .perception import ObservedElement, ScreenObservation, same_control
 
 
 def normalize_text(value: str) -> str:
@@ -28,93 +30,206 @@ class GroundedTarget:
     score: float
 
 
-def _label_score(label: str, actual: str) -> float:
-    wanted = normalize_text(label)
-    observed = normalize_text(actual)
+def _label_score(label: str, actual: str, floor: float = 0.0) -> float:
+    return _normalized_score(normalize_text(label), normalize_text(actual), floor)
+
+
+def _normalized_score(wanted: str, observed: str, floor: float = 0.0) -> float:
     if not wanted or not observed:
         return 0.0
     if wanted == observed:
         return 1.0
     if wanted in observed or observed in wanted:
         return 0.91
-    return SequenceMatcher(None, wanted, observed).ratio()
+    return similarity(wanted, observed, floor)
 
 
-def _has_exact_label(labels: Sequence[str], actual: str) -> bool:
-    observed = normalize_text(actual)
-    return bool(observed) and any(
-        normalize_text(label) == observed for label in labels if normalize_text(label)
-    )
+# Role and UIA bonuses a label score can gain before the cutoff is applied.
+_MAX_BONUS = 0.06
 
 
-def ground_target(
-    observation: ScreenObservation,
-    target: Target,
-    *,
-    cutoff: float = 0.82,
-    ambiguity_margin: float = 0.08,
-) -> GroundedTarget:
-    ranked = []
-    wanted_roles = {role.casefold() for role in target.roles}
-    for element in observation.elements:
-        if target.region is not None:
-            left, top, right, bottom = target.region
-            center_x, center_y = element.rect.center
-            normalized_x = (center_x - observation.origin_x) / max(1, observation.width)
-            normalized_y = (center_y - observation.origin_y) / max(1, observation.height)
-            if not (left <= normalized_x <= right and top <= normalized_y <= bottom):
-                continue
-        score = max((_label_score(label, element.text) for label in target.labels), default=0.0)
-        role_match = bool(
-            wanted_roles and element.role.casefold() in wanted_roles
+# (score, exact label, role match, from UIA, element position), best first.
+_Ranked = Tuple[float, bool, bool, bool, int]
+
+
+@dataclass(frozen=True)
+class TargetRanking:
+    """Every in-region candidate for one target, ranked, plus the decision."""
+
+    target: Target
+    ranked: Tuple[Tuple[float, ObservedElement], ...]
+    grounded: Optional[GroundedTarget] = None
+    error: Optional[str] = None
+
+    def result(self) -> GroundedTarget:
+        if self.grounded is None:
+            raise GroundingError(self.error or f"visible target not found: {self.target.key}")
+        return self.grounded
+
+
+_MEMO_LIMIT = 128
+# (signature, target, cutoff, margin) -> (elements, rankings by position).
+_memo: "OrderedDict[Tuple[Any, ...], Tuple[Tuple[ObservedElement, ...], Tuple[_Ranked, ...]]]" = (
+    OrderedDict()
+)
+_memo_lock = threading.Lock()
+
+
+def _rank_targets(
+    observation: ScreenObservation, targets: Sequence[Target], floor: float = 0.0
+) -> List[List[_Ranked]]:
+    """Score every label of every target in one sweep over the elements.
+
+    Label scores that cannot reach ``floor`` are ranked as 0.0.
+    """
+    prepared = []
+    for target in targets:
+        labels = tuple(dict.fromkeys(normalize_text(label) for label in target.labels))
+        inside = (
+            None if target.region is None else frozenset(observation.positions_in(target.region))
         )
-        if role_match:
-            score += 0.04
-        if element.source == "uia":
-            score += 0.02
-        if element.source == "ocr":
-            # OCR confidence contributes evidence without making a correctly
-            # recognized label unusable solely because its glyph score is low.
-            score *= 0.75 + 0.25 * max(0.0, min(1.0, element.confidence))
-        ranked.append(
+        prepared.append(
             (
-                min(score, 1.0),
-                _has_exact_label(target.labels, element.text),
-                role_match,
-                element.source == "uia",
-                element,
+                labels,
+                frozenset(label for label in labels if label),
+                {role.casefold() for role in target.roles},
+                inside,
             )
         )
-    ranked.sort(key=lambda item: item[:4], reverse=True)
+    ranked: List[List[_Ranked]] = [[] for _ in targets]
+    scores: Dict[Tuple[str, str], float] = {}
+    for position, (element, observed) in enumerate(
+        zip(observation.elements, observation.normalized_texts)
+    ):
+        role = element.role.casefold()
+        for slot, (labels, exact_labels, wanted_roles, inside) in enumerate(prepared):
+            if inside is not None and position not in inside:
+                continue
+            score = 0.0
+            for label in labels:
+                key = (label, observed)
+                value = scores.get(key)
+                if value is None:
+                    value = scores[key] = _normalized_score(label, observed, floor)
+                score = max(score, value)
+            role_match = bool(wanted_roles and role in wanted_roles)
+            if role_match:
+                score += 0.04
+            if element.source == "uia":
+                score += 0.02
+            if element.source == "ocr":
+                # OCR confidence contributes evidence without making a correctly
+                # recognized label unusable solely because its glyph score is low.
+                score *= 0.75 + 0.25 * max(0.0, min(1.0, element.confidence))
+            ranked[slot].append(
+                (
+                    min(score, 1.0),
+                    observed in exact_labels,
+                    role_match,
+                    element.source == "uia",
+                    position,
+                )
+            )
+    for candidates in ranked:
+        candidates.sort(key=lambda item: item[:4], reverse=True)
+    return ranked
+
+
+def _decide(
+    observation: ScreenObservation,
+    target: Target,
+    ranked: Sequence[_Ranked],
+    cutoff: float,
+    ambiguity_margin: float,
+) -> TargetRanking:
+    elements = observation.elements
+    candidates = tuple((item[0], elements[item[4]]) for item in ranked)
     if not ranked or ranked[0][0] < cutoff:
-        raise GroundingError(f"visible target not found: {target.key}")
+        return TargetRanking(target, candidates, error=f"visible target not found: {target.key}")
     if len(ranked) > 1 and ranked[0][0] - ranked[1][0] < ambiguity_margin:
-        first, second = ranked[0][4], ranked[1][4]
+        first, second = elements[ranked[0][4]], elements[ranked[1][4]]
         stronger_semantics = (
             (ranked[0][1] and not ranked[1][1])
             or (ranked[0][2] and not ranked[1][2])
         )
-        same_control = (
-            normalize_text(first.text) == normalize_text(second.text)
-            and abs(first.rect.center[0] - second.rect.center[0]) < 20
-            and abs(first.rect.center[1] - second.rect.center[1]) < 20
-        )
-        if not stronger_semantics and not same_control:
-            raise GroundingError(
-                f"ambiguous visible target: {target.key} "
-                f"({first.text!r} vs {second.text!r})"
+        if not stronger_semantics and not same_control(first, second):
+            return TargetRanking(
+                target,
+                candidates,
+                error=(
+                    f"ambiguous visible target: {target.key} "
+                    f"({first.text!r} vs {second.text!r})"
+                ),
             )
-    return GroundedTarget(target, ranked[0][4], ranked[0][0])
+    grounded = GroundedTarget(target, elements[ranked[0][4]], ranked[0][0])
+    return TargetRanking(target, candidates, grounded=grounded)
+
+
+def ground_targets(
+    observation: ScreenObservation,
+    targets: Sequence[Target],
+    *,
+    cutoff: float = 0.82,
+    ambiguity_margin: float = 0.08,
+) -> List[TargetRanking]:
+    """Rank and decide several targets against one observation.
+
+    Each ranking applies exactly the ``ground_target`` cutoff and ambiguity
+    rules. Rankings are memoized by ``(signature, target)``; a memo entry is
+    only reused when the observed elements are equal, and its elements are
+    always taken from ``observation`` so invoked controls are never stale.
+    """
+    signature = observation.signature
+    keys: List[Optional[Tuple[Any, ...]]] = []
+    for target in targets:
+        key: Optional[Tuple[Any, ...]] = (signature, target, cutoff, ambiguity_margin)
+        try:
+            hash(key)
+        except TypeError:
+            # A target built with list fields is ranked but never memoized.
+            key = None
+        keys.append(key)
+    found: Dict[int, Tuple[_Ranked, ...]] = {}
+    with _memo_lock:
+        for slot, key in enumerate(keys):
+            entry = _memo.get(key) if key is not None else None
+            if entry is not None and entry[0] == observation.elements:
+                _memo.move_to_end(key)
+                found[slot] = entry[1]
+    missing = [slot for slot in range(len(targets)) if slot not in found]
+    if missing:
+        # Below this no candidate can pass the cutoff or tie the best one.
+        floor = max(0.0, cutoff - ambiguity_margin - _MAX_BONUS)
+        ranked = _rank_targets(observation, [targets[slot] for slot in missing], floor)
+        with _memo_lock:
+            for slot, candidates in zip(missing, ranked):
+                found[slot] = tuple(candidates)
+                if keys[slot] is not None:
+                    _memo[keys[slot]] = (observation.elements, found[slot])
+                    _memo.move_to_end(keys[slot])
+            while len(_memo) > _MEMO_LIMIT:
+                _memo.popitem(last=False)
+    return [
+        _decide(observation, target, found[slot], cutoff, ambiguity_margin)
+        for slot, target in enumerate(targets)
+    ]
+
+
+def ground_target(
+    observation: ScreenObservation,
+    target: Target,
+    *,
+    cutoff: float = 0.82,
+    ambiguity_margin: float = 0.08,
+) -> GroundedTarget:
+    return ground_targets(
+        observation, (target,), cutoff=cutoff, ambiguity_margin=ambiguity_margin
+    )[0].result()
 
 
 def contains_any_text(observation: ScreenObservation, labels: Iterable[str]) -> bool:
-    normalized = [normalize_text(label) for label in labels if normalize_text(label)]
-    return any(
-        wanted == normalize_text(actual) or wanted in normalize_text(actual)
-        for wanted in normalized
-        for actual in observation.texts
-        if normalize_text(actual)
-    )
+    index = observation.text_index()
+    return any(index.contains(wanted) for wanted in map(normalize_text, labels) if wanted)
 
 
 def scale_point(
@@ -3,6 +3,8 @@ import json
 import difflib
 from typing import Dict, Tuple, Optional, List
 
+from .matcher import Matcher
+
 class MenuIndex:
     """
     - Loads:
@@ -16,9 +18,21 @@ class MenuIndex:
     """
     def __init__(self, ui_coords_path: str, menu_cards_path: str):
         with open(ui_coords_path, "r", encoding="utf-8") as f:
-            self.ui = json.load(f)
+            ui = json.load(f)
         with open(menu_cards_path, "r", encoding="utf-8") as f:
-            self.cards = json.load(f)
+            cards = json.load(f)
+        self._build(ui, cards)
+
+    @classmethod
+    def from_data(cls, ui: dict, cards: list) -> "MenuIndex":
+        """Build from already-parsed ui coords and menu cards."""
+        index = cls.__new__(cls)
+        index._build(ui, cards)
+        return index
+
+    def _build(self, ui: dict, cards: list) -> None:
+        self.ui = ui
+        self.cards = cards
 
         self.category_centers: Dict[str, Tuple[int, int]] = {}
         for c in self.ui.get("categories", []):
@@ -37,6 +51,8 @@ class MenuIndex:
             self.name_to_entry[nm] = (cat, pg, xy)
 
         self.menu_names: List[str] = list(self.name_to_entry.keys())
+        self.matcher = Matcher(self.menu_names, normalize=self._normalize)
+        self._raw_matcher = Matcher(self.menu_names, normalize=str)
 
     @staticmethod
     def _normalize(s: str) -> str:
@@ -49,23 +65,16 @@ class MenuIndex:
             cat, pg, xy = it
             return spoken, cat, pg, xy
 
-        # fuzzy
-        cand = difflib.get_close_matches(spoken, self.menu_names, n=1, cutoff=cutoff)
+        # fuzzy, spaces included; the bounds only skip names below the cutoff
+        reachable = [name for _, name in self._raw_matcher.bounds(spoken, cutoff)]
+        cand = difflib.get_close_matches(spoken, reachable, n=1, cutoff=cutoff)
         if cand:
             name = cand[0]
-            cat, pg, xy = self.name_to_entry[name]
-            return name, cat, pg, xy
-
-        # normalized ratio
-        norm = self._normalize(spoken)
-        best = None
-        best_score = 0.0
-        for name in self.menu_names:
-            score = difflib.SequenceMatcher(None, norm, self._normalize(name)).ratio()
-            if score > best_score:
-                best_score = score
-                best = name
-        if best and best_score >= cutoff:
-            cat, pg, xy = self.name_to_entry[best]
-            return best, cat, pg, xy
-        return None
+        else:
+            # normalized ratio, then an OCR variant nothing else matched
+            found = self.matcher.best(spoken, cutoff, variants=False)
+            name = found[0] if found else self.matcher.variant(spoken)
+        if name is None:
+            return None
+        cat, pg, xy = self.name_to_entry[name]
+        return name, cat, pg, xy
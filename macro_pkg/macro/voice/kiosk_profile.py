@@ -2,12 +2,12 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from .errors import ProfileError
 from .grounding import Target, normalize_text
+from .matcher import Matcher
 from .transition_graph import Transition, TransitionGraph
 
 
@@ -27,6 +27,62 @@ class ResolvedOrderItem:
     option_targets: Tuple[Target, ...] = ()
 
 
+@dataclass(frozen=True)
+class QuantityStepper:
+    """Profile-declared +/- control that raises an item's count in place.
+
+    ``location`` is ``"modal"`` (pressed before confirming the option modal)
+    or ``"cart"`` (pressed on the item's cart line). ``count_labels`` are
+    templates with ``{count}`` and optionally ``{menu}`` matched against the
+    item's cart line to read the resulting count.
+    """
+
+    location: str
+    increment: Target
+    count_labels: Tuple[str, ...]
+
+
+def _quantity_stepper(raw: Any) -> Optional[QuantityStepper]:
+    if not raw:
+        return None
+    if not isinstance(raw, Mapping):
+        raise ProfileError("quantity_stepper must be an object")
+    location = str(raw.get("location", ""))
+    if location not in {"modal", "cart"}:
+        raise ProfileError(f"unsupported quantity_stepper location: {location}")
+    increment = raw.get("increment", {}) or {}
+    labels = tuple(str(label) for label in increment.get("labels", ()) or () if str(label).strip())
+    count_labels = tuple(str(label) for label in raw.get("count_labels", ()) or ())
+    if not labels:
+        raise ProfileError("quantity_stepper increment needs labels")
+    if not count_labels or not all("{count}" in label for label in count_labels):
+        raise ProfileError("quantity_stepper count_labels must contain {count}")
+    try:
+        for label in count_labels:
+            label.format(menu="", count=0)
+    except (IndexError, KeyError, ValueError) as exc:
+        raise ProfileError(f"invalid quantity_stepper count label: {exc}") from exc
+    return QuantityStepper(
+        location,
+        Target(
+            key="quantity:increment",
+            labels=labels,
+            roles=tuple(increment.get("roles", ()) or ("ButtonControl", "button")),
+        ),
+        count_labels,
+    )
+
+
+# Lowest fuzzy base-name score that can still matter: modifier bonuses add at
+# most 0.37, and a runner-up within the 0.08 margin of the 0.72 cutoff counts.
+_RESOLVE_FLOOR = 0.72 - 0.08 - 0.37
+
+
+def _ranking(row: Tuple[Any, ...]) -> Tuple[float, int]:
+    # Highest score first; ties keep catalog order, as the stable sort did.
+    return (-row[0], row[1])
+
+
 class KioskProfile:
     """Versioned semantic contract for one black-box kiosk family."""
 
@@ -49,6 +105,7 @@ class KioskProfile:
         self.cart_added_markers = tuple(data.get("cart_added_markers", ()))
         self.confirm_labels = tuple(data.get("confirm_labels", ()))
         self.item_added_markers = tuple(data.get("item_added_markers", ()))
+        self.quantity_stepper = _quantity_stepper(data.get("quantity_stepper"))
         raw_cart_region = data.get("cart_region")
         self.cart_region = (
             tuple(float(value) for value in raw_cart_region)
@@ -61,11 +118,36 @@ class KioskProfile:
             if isinstance(raw_menu_region, list) and len(raw_menu_region) == 4
             else None
         )
+        # Menu resolution index: names, base names and encoded modifiers are
+        # derived once, and base names are matched through character postings.
+        self._menu_tokens = tuple(sorted(self._all_menu_tokens(), key=len, reverse=True))
+        self._menus_by_name: Dict[str, Tuple[int, ...]] = {}
+        self._menus_by_base: Dict[str, Tuple[int, ...]] = {}
+        self._menu_modifiers: List[FrozenSet[Tuple[str, str]]] = []
+        for position, menu in enumerate(self.menu_records):
+            normalized = normalize_text(menu.name)
+            base = self._base_name(menu.name)
+            self._menus_by_name[normalized] = self._menus_by_name.get(normalized, ()) + (position,)
+            self._menus_by_base[base] = self._menus_by_base.get(base, ()) + (position,)
+            self._menu_modifiers.append(
+                frozenset(
+                    (str(group), str(canonical))
+                    for group, choices in self.modifiers.items()
+                    for canonical, details in (choices or {}).items()
+                    if self._contains_token(menu.name, details)
+                )
+            )
+        self._base_matcher = Matcher((base for base in self._menus_by_base if base), normalize_text)
+        self._graph: Optional[TransitionGraph] = None
 
     @classmethod
     def load(cls, path: str, index: Any) -> "KioskProfile":
         with open(path, "r", encoding="utf-8") as handle:
             data = json.load(handle)
+        return cls.from_index(data, index)
+
+    @classmethod
+    def from_index(cls, data: Mapping[str, Any], index: Any) -> "KioskProfile":
         records = [
             MenuRecord(name, category, page, xy)
             for name, (category, page, xy) in index.name_to_entry.items()
@@ -111,7 +193,7 @@ class KioskProfile:
 
     def _base_name(self, name: str) -> str:
         value = normalize_text(name)
-        for token in sorted(self._all_menu_tokens(), key=len, reverse=True):
+        for token in self._menu_tokens:
             value = value.replace(token, "")
         return value
 
@@ -150,6 +232,60 @@ class KioskProfile:
             if normalize_text(token)
         )
 
+    def _rank_menus(
+        self,
+        exact: Sequence[int],
+        requested_base: str,
+        temperature: Optional[str],
+        size: Optional[str],
+    ) -> List[Tuple[float, int]]:
+        """The leading (score, menu position) pairs, ordered as a full scan ranks them.
+
+        The first entry is the best menu, and the second is the runner-up
+        whenever it is within the ambiguity margin. Menus are visited by
+        score bound, best first, until none left can reach the cutoff less
+        the margin or come within the margin of the leader.
+        """
+
+        def adjustment(position: int) -> float:
+            encoded = self._menu_modifiers[position]
+            value = 0.0
+            if temperature:
+                value += 0.25 if ("temperature", temperature) in encoded else -0.20
+            if size:
+                value += 0.12 if ("size", size) in encoded else 0.0
+            return value
+
+        def needed() -> float:
+            return max(0.72 - 0.08, best[0][0] - 0.08 if best else 0.0)
+
+        best = sorted(((1.2 + adjustment(position), position) for position in exact), key=_ranking)
+        del best[2:]
+        if not requested_base:
+            return best
+        largest_bonus = (0.25 if temperature else 0.0) + (0.12 if size else 0.0)
+        pending = []
+        base_floor = max(_RESOLVE_FLOOR, needed() - largest_bonus)
+        for bound, base in self._base_matcher.bounds(requested_base, base_floor):
+            for position in self._menus_by_base[base]:
+                if position not in exact:
+                    pending.append((bound + adjustment(position), position, base))
+        pending.sort(key=_ranking)
+        for bound, position, base in pending:
+            floor = needed()
+            if bound + 1e-9 < floor:
+                break
+            offset = adjustment(position)
+            value = self._base_matcher.score(
+                requested_base, base, max(_RESOLVE_FLOOR, floor - offset - 1e-9)
+            )
+            if not value:
+                continue
+            best.append((value + offset, position))
+            best.sort(key=_ranking)
+            del best[2:]
+        return best
+
     def resolve_order_item(self, item: Mapping[str, Any]) -> ResolvedOrderItem:
         if not isinstance(item, Mapping):
             raise ProfileError("order item must be an object")
@@ -160,56 +296,35 @@ class KioskProfile:
         temperature, temperature_info = self._modifier("temperature", item.get("temperature"))
         size, size_info = self._modifier("size", item.get("size"))
 
-        exact = next(
-            (menu for menu in self.menu_records if normalize_text(menu.name) == normalize_text(requested)),
-            None,
-        )
-        if exact and temperature and not self._contains_token(exact.name, temperature_info):
-            other_temperature_tokens = [
-                details
-                for canonical, details in (self.modifiers.get("temperature", {}) or {}).items()
-                if canonical != temperature
-            ]
-            if any(self._contains_token(exact.name, details) for details in other_temperature_tokens):
+        requested_normalized = normalize_text(requested)
+        exact = self._menus_by_name.get(requested_normalized, ())
+        if exact and temperature:
+            encoded = self._menu_modifiers[exact[0]]
+            if ("temperature", temperature) not in encoded and any(
+                group == "temperature" for group, _ in encoded
+            ):
                 raise ProfileError(
                     f"menu name and temperature conflict: {requested} / {temperature}"
                 )
 
-        requested_normalized = normalize_text(requested)
         requested_base = self._base_name(requested)
-        ranked: List[Tuple[float, MenuRecord]] = []
-        for menu in self.menu_records:
-            menu_normalized = normalize_text(menu.name)
-            menu_base = self._base_name(menu.name)
-            if requested_normalized == menu_normalized:
-                score = 1.2
-            elif requested_base and requested_base == menu_base:
-                score = 1.0
-            else:
-                score = SequenceMatcher(None, requested_base, menu_base).ratio()
-
-            if temperature:
-                score += 0.25 if self._contains_token(menu.name, temperature_info) else -0.20
-            if size:
-                score += 0.12 if self._contains_token(menu.name, size_info) else 0.0
-            ranked.append((score, menu))
-
-        ranked.sort(key=lambda row: row[0], reverse=True)
+        ranked = self._rank_menus(exact, requested_base, temperature, size)
         if not ranked or ranked[0][0] < 0.72:
             raise ProfileError(f"menu not found: {requested}")
         if len(ranked) > 1 and ranked[0][0] - ranked[1][0] < 0.08:
             raise ProfileError(
                 f"menu is ambiguous: {requested} "
-                f"({ranked[0][1].name} / {ranked[1][1].name})"
+                f"({self.menu_records[ranked[0][1]].name} / {self.menu_records[ranked[1][1]].name})"
             )
-        selected = ranked[0][1]
+        selected = self.menu_records[ranked[0][1]]
+        encoded = self._menu_modifiers[ranked[0][1]]
 
         option_targets: List[Target] = []
         for group, canonical, details in (
             ("temperature", temperature, temperature_info),
             ("size", size, size_info),
         ):
-            if not canonical or self._contains_token(selected.name, details):
+            if not canonical or (group, canonical) in encoded:
                 continue
             option_labels = tuple(details.get("option_labels", ()) or ())
             if not option_labels:
@@ -225,6 +340,12 @@ class KioskProfile:
         return ResolvedOrderItem(requested, selected, quantity, tuple(option_targets))
 
     def transition_graph(self) -> TransitionGraph:
+        """The profile's transition graph, built on first use and then shared."""
+        if self._graph is None:
+            self._graph = self._build_transition_graph()
+        return self._graph
+
+    def _build_transition_graph(self) -> TransitionGraph:
         state_markers = self.data.get("states", {}) or {}
         transitions = []
         for raw in self.data.get("transitions", ()) or ():
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+# Order lifecycle checkpoints, in the order they happen. Stamps are
+# ``time.monotonic()`` readings; the hub and the kiosk client run on the same
+# PC, so readings from both processes share one clock.
+STAGES = (
+    "utterance_end",
+    "enqueued",
+    "claimed",
+    "perform_started",
+    "cart_ready",
+    "payment_ready",
+    "completed",
+)
+
+
+def new_correlation_id() -> str:
+    return uuid.uuid4().hex
+
+
+def stage_stamps(raw: Any) -> Dict[str, float]:
+    """Known stages with numeric stamps from an untrusted mapping."""
+    if not isinstance(raw, Mapping):
+        return {}
+    stamps: Dict[str, float] = {}
+    for stage in STAGES:
+        value = raw.get(stage)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            stamps[stage] = float(value)
+    return stamps
+
+
+class UtteranceLog:
+    """Monotonic end time of recent utterances by correlation ID."""
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = max(1, int(capacity))
+        self._ended: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, correlation_id: str, ended_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._ended[correlation_id] = time.monotonic() if ended_at is None else ended_at
+            self._ended.move_to_end(correlation_id)
+            while len(self._ended) > self.capacity:
+                self._ended.popitem(last=False)
+
+    def ended_at(self, correlation_id: Optional[str]) -> Optional[float]:
+        if not correlation_id:
+            return None
+        with self._lock:
+            return self._ended.get(correlation_id)
+
+
+def stage_durations(stamps: Mapping[str, float]) -> Dict[str, float]:
+    """Seconds spent reaching each recorded stage from the previous recorded one.
+
+    ``total`` spans the first to the last stage and ``utterance_to_payment_ready``
+    the customer-visible latency when both ends were recorded. Orders whose
+    stamps run backwards (another boot, another machine) yield nothing.
+    """
+    present = [(stage, stamps[stage]) for stage in STAGES if stage in stamps]
+    if len(present) < 2:
+        return {}
+    durations: Dict[str, float] = {}
+    for (_, previous), (stage, current) in zip(present, present[1:]):
+        if current < previous:
+            return {}
+        durations[stage] = current - previous
+    durations["total"] = present[-1][1] - present[0][1]
+    if "utterance_end" in stamps and "payment_ready" in stamps:
+        durations["utterance_to_payment_ready"] = stamps["payment_ready"] - stamps["utterance_end"]
+    return durations
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Linearly interpolated percentile of non-empty ``values``."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * min(1.0, max(0.0, fraction))
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def latency_report(history: Iterable[Mapping[str, float]]) -> Dict[str, Any]:
+    """Per-stage count, p50 and p95 in milliseconds over orders' stage stamps."""
+    samples: Dict[str, List[float]] = {}
+    orders = 0
+    for stamps in history:
+        durations = stage_durations(stamps)
+        if not durations:
+            continue
+        orders += 1
+        for stage, seconds in durations.items():
+            samples.setdefault(stage, []).append(seconds)
+    order = {stage: position for position, stage in enumerate((*STAGES, "total", "utterance_to_payment_ready"))}
+    return {
+        "orders": orders,
+        "stages": {
+            stage: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 0.5) * 1000, 1),
+                "p95_ms": round(percentile(values, 0.95) * 1000, 1),
+            }
+            for stage, values in sorted(samples.items(), key=lambda item: order[item[0]])
+        },
+    }
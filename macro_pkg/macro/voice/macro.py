@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import os
 import threading
+import time
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Tuple
 
 from .errors import AutomationCancelled, ProfileError
+from .order_plan import OrderPlan, plan_order
+from .tracing import NULL_TRACER, Tracer
 
 if TYPE_CHECKING:
     from .navigator import Navigator
@@ -139,6 +143,9 @@ class OrderMacro:
         cancelled: bool = False,
         awaiting_handoff: bool = False,
         requires_manual_review: bool = False,
+        navigation: Optional[Dict[str, Any]] = None,
+        trace: Optional[Dict[str, Any]] = None,
+        stamps: Optional[Dict[str, float]] = None,
     ) -> Dict[str, Any]:
         success = cart_success and (
             not payment_navigation_attempted or payment_ready
@@ -161,6 +168,10 @@ class OrderMacro:
             "cancelled": cancelled,
             "awaiting_handoff": awaiting_handoff,
             "requires_manual_review": requires_manual_review,
+            "navigation": navigation,
+            "trace": trace,
+            # Monotonic stage stamps; see voice.latency.STAGES.
+            "stamps": stamps or {},
         }
 
     def perform(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -186,6 +197,49 @@ class OrderMacro:
         finally:
             self._execution_lock.release()
 
+    def _plan(self, items: List[Any]) -> Optional[OrderPlan]:
+        """Plan the items by menu screen, or ``None`` when a screen is unknown."""
+        screens = []
+        for item in items:
+            menu = getattr(item, "menu", None)
+            if menu is not None:
+                screens.append((menu.category, int(menu.page)))
+                continue
+            entry = self.nav.idx.name_to_entry.get(getattr(item, "requested_name", ""))
+            if entry is None:
+                return None
+            screens.append((entry[0], int(entry[1])))
+        return plan_order(
+            screens,
+            group=bool(getattr(self.nav.cfg, "order_grouping", False)),
+            backward=bool(getattr(self.nav, "pages_backward", False)),
+        )
+
+    def _start_trace(self) -> Optional[Tracer]:
+        """Attach a fresh tracer to the navigator, or detach tracing when it is off."""
+        use_tracer = getattr(self.nav, "use_tracer", None)
+        if not callable(use_tracer):
+            return None
+        tracer = Tracer() if bool(getattr(self.nav.cfg, "trace_orders", True)) else None
+        use_tracer(tracer or NULL_TRACER)
+        return tracer
+
+    def _finish_trace(self, tracer: Optional[Tracer], items: int) -> Optional[Dict[str, Any]]:
+        if tracer is None:
+            return None
+        self.nav.use_tracer(NULL_TRACER)
+        tracer.close("order", items=items)
+        trace = tracer.summary()
+        trace_dir = str(getattr(self.nav.cfg, "trace_dir", "") or "").strip()
+        if trace_dir:
+            stamp = time.time()
+            name = f"order-{time.strftime('%Y%m%d-%H%M%S', time.localtime(stamp))}-{int(stamp * 1000) % 1000:03d}.json"
+            try:
+                trace["path"] = tracer.write_chrome_trace(os.path.join(trace_dir, name))
+            except OSError as exc:
+                print(f"[WARN] trace 저장 실패: {exc}")
+        return trace
+
     def _execute_item(self, item: Any) -> bool:
         if hasattr(self.nav, "add_resolved_item") and hasattr(item, "menu"):
             return bool(self.nav.add_resolved_item(item))
@@ -194,6 +248,10 @@ class OrderMacro:
     def _perform_locked(
         self, items: List[Dict[str, Any]], total_items: int
     ) -> Dict[str, Any]:
+        stamps = {"perform_started": time.monotonic()}
+        refresh_profile = getattr(self.nav, "refresh_profile", None)
+        if callable(refresh_profile):
+            refresh_profile()
         resolved_items, validation_results = self._validate(items)
         if validation_results:
             return self._summary(
@@ -201,96 +259,118 @@ class OrderMacro:
                 0,
                 validation_results,
                 payment_skip_reason="주문 검증 실패",
+                stamps=stamps,
             )
 
-        results: List[Dict[str, Any]] = []
+        outcomes: Dict[int, Dict[str, Any]] = {}
         total_success = 0
         cancelled = False
         if hasattr(self.nav, "last_uncertain"):
             self.nav.last_uncertain = False
         if hasattr(self.nav, "cart_mutated"):
             self.nav.cart_mutated = False
-        for index, item in enumerate(resolved_items):
-            name = self._resolved_name(item)
-            count = int(item.quantity)
-            try:
-                self.nav.reset_navigation()
-                succeeded = self._execute_item(item)
-                error = None if succeeded else getattr(self.nav, "last_error", None) or "매크로 실행 실패"
-            except AutomationCancelled as exc:
-                succeeded = False
-                error = str(exc)
-                cancelled = True
-                self._automation_cancelled = True
-            except Exception as exc:
-                succeeded = False
-                error = str(exc)
-
-            manual_review = bool(
-                not succeeded and getattr(self.nav, "last_uncertain", False)
-            )
-            results.append(
-                {
+        tracer = self._start_trace()
+        try:
+            plan = self._plan(resolved_items)
+            order = plan.order if plan is not None else tuple(range(len(resolved_items)))
+            transitions_before = getattr(self.nav, "navigation_transitions", None)
+            # The verified category and page carry over from one item to the next.
+            self.nav.reset_navigation()
+            for step, index in enumerate(order):
+                item = resolved_items[index]
+                name = self._resolved_name(item)
+                count = int(item.quantity)
+                try:
+                    succeeded = self._execute_item(item)
+                    error = None if succeeded else getattr(self.nav, "last_error", None) or "매크로 실행 실패"
+                except AutomationCancelled as exc:
+                    succeeded = False
+                    error = str(exc)
+                    cancelled = True
+                    self._automation_cancelled = True
+                except Exception as exc:
+                    succeeded = False
+                    error = str(exc)
+
+                manual_review = bool(
+                    not succeeded and getattr(self.nav, "last_uncertain", False)
+                )
+                outcomes[index] = {
                     "name": name,
                     "success": succeeded,
                     "count": count,
                     "error": error,
                     "requires_manual_review": manual_review,
                 }
-            )
-            self.execution_history.append((name, succeeded))
-            if succeeded:
-                total_success += 1
-                continue
+                self.execution_history.append((name, succeeded))
+                if succeeded:
+                    total_success += 1
+                    continue
 
-            reason = (
-                "운영자가 자동화를 중단하여 실행하지 않음"
-                if cancelled
-                else "앞선 항목 실패로 실행하지 않음"
-            )
-            for pending in resolved_items[index + 1 :]:
-                pending_name = self._resolved_name(pending)
-                results.append(
-                    {
+                reason = (
+                    "운영자가 자동화를 중단하여 실행하지 않음"
+                    if cancelled
+                    else "앞선 항목 실패로 실행하지 않음"
+                )
+                for pending in order[step + 1 :]:
+                    pending_name = self._resolved_name(resolved_items[pending])
+                    outcomes[pending] = {
                         "name": pending_name,
                         "success": False,
-                        "count": int(pending.quantity),
+                        "count": int(resolved_items[pending].quantity),
                         "error": reason,
                     }
+                    self.execution_history.append((pending_name, False))
+                break
+            results = [outcomes[index] for index in sorted(outcomes)]
+            transitions_after = getattr(self.nav, "navigation_transitions", None)
+            navigation = {
+                "planned_order": list(order),
+                "expected_transitions": plan.expected_transitions if plan is not None else None,
+                "actual_transitions": (
+                    transitions_after - transitions_before
+                    if isinstance(transitions_before, int) and isinstance(transitions_after, int)
+                    else None
+                ),
+            }
+
+            cart_success = total_success == total_items
+            if cart_success:
+                stamps["cart_ready"] = time.monotonic()
+            payment_enabled = bool(
+                getattr(
+                    self.nav.cfg,
+                    "allow_payment_navigation",
+                    getattr(self.nav.cfg, "allow_checkout", False),
                 )
-                self.execution_history.append((pending_name, False))
-            break
-
-        cart_success = total_success == total_items
-        payment_enabled = bool(
-            getattr(
-                self.nav.cfg,
-                "allow_payment_navigation",
-                getattr(self.nav.cfg, "allow_checkout", False),
             )
-        )
-        attempted = cart_success and payment_enabled and not cancelled
-        payment_ready = False
-        if cancelled:
-            reason = "운영자가 자동화를 중단함"
-        elif not cart_success:
-            reason = "모든 주문 항목이 성공하지 않음"
-        elif not payment_enabled:
-            reason = "KIOSK_ALLOW_PAYMENT_NAVIGATION이 활성화되지 않음"
-        else:
-            payment_ready = bool(self.nav.navigate_to_payment_ready())
-            reason = None if payment_ready else getattr(self.nav, "last_error", None) or "결제 준비 화면 검증 실패"
-
-        dry_run = bool(getattr(self.nav.cfg, "dry_run", True))
-        requires_manual_review = bool(getattr(self.nav, "last_uncertain", False))
-        # A verified live cart mutation is intentionally not terminal for the
-        # desktop session. The customer or operator must complete/cancel the
-        # handoff and restore the kiosk before another order can be claimed.
-        awaiting_handoff = not dry_run and bool(
-            total_success > 0 or getattr(self.nav, "cart_mutated", False)
-        )
+            attempted = cart_success and payment_enabled and not cancelled
+            payment_ready = False
+            if cancelled:
+                reason = "운영자가 자동화를 중단함"
+            elif not cart_success:
+                reason = "모든 주문 항목이 성공하지 않음"
+            elif not payment_enabled:
+                reason = "KIOSK_ALLOW_PAYMENT_NAVIGATION이 활성화되지 않음"
+            else:
+                payment_ready = bool(self.nav.navigate_to_payment_ready())
+                if payment_ready:
+                    stamps["payment_ready"] = time.monotonic()
+                reason = None if payment_ready else getattr(self.nav, "last_error", None) or "결제 준비 화면 검증 실패"
 
-        self.nav.reset_navigation()
+            dry_run = bool(getattr(self.nav.cfg, "dry_run", True))
+            requires_manual_review = bool(getattr(self.nav, "last_uncertain", False))
+            # A verified live cart mutation is intentionally not terminal for the
+            # desktop session. The customer or operator must complete/cancel the
+            # handoff and restore the kiosk before another order can be claimed.
+            awaiting_handoff = not dry_run and bool(
+                total_success > 0 or getattr(self.nav, "cart_mutated", False)
+            )
+
+            self.nav.reset_navigation()
+        finally:
+            # Detach the tracer even when an exception escapes the order.
+            trace = self._finish_trace(tracer, total_items)
         return self._summary(
             total_items,
             total_success,
@@ -303,6 +383,9 @@ class OrderMacro:
             cancelled=cancelled,
             awaiting_handoff=awaiting_handoff,
             requires_manual_review=requires_manual_review,
+            navigation=navigation,
+            trace=trace,
+            stamps=stamps,
         )
 
     def get_execution_history(self) -> List[Tuple[str, bool]]:
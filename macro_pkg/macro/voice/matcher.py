@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import unicodedata
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+EXACT_SCORE = 1.0
+# Identical once OCR-confusable glyphs are folded together.
+VARIANT_SCORE = 0.95
+
+# Glyph pairs EasyOCR swaps on kiosk fonts, applied after NFD so Hangul
+# vowels are folded per jamo. Keys and values are single code points.
+# Digits are never folded: a kiosk reads quantities and prices.
+CONFUSABLE: Mapping[str, str] = {
+    "i": "l",
+    "|": "l",
+    "!": "l",
+    "ᅤ": "ᅢ",  # ㅒ -> ㅐ
+    "ᅦ": "ᅢ",  # ㅔ -> ㅐ
+    "ᅨ": "ᅢ",  # ㅖ -> ㅐ
+    "ᅰ": "ᅫ",  # ㅞ -> ㅙ
+    "ᅬ": "ᅫ",  # ㅚ -> ㅙ
+}
+FoldTable = Tuple[Tuple[str, str], ...]
+DEFAULT_FOLDS: FoldTable = tuple(CONFUSABLE.items())
+
+
+def _squash(value: str) -> str:
+    return "".join(str(value or "").split()).casefold()
+
+
+@lru_cache(maxsize=8192)
+def fold(text: str, folds: FoldTable = DEFAULT_FOLDS) -> str:
+    """``text`` with the ``folds`` glyph pairs, including Hangul vowels, folded."""
+    if not folds:
+        return text
+    return unicodedata.normalize(
+        "NFC", unicodedata.normalize("NFD", text).translate(str.maketrans(dict(folds)))
+    )
+
+
+def safe_folds(candidates: Iterable[str], folds: FoldTable = DEFAULT_FOLDS) -> FoldTable:
+    """The ``folds`` pairs that never make two distinct candidates equal."""
+    names = set(candidates)
+    return tuple(
+        pair
+        for pair in folds
+        if len({fold(name, (pair,)) for name in names}) == len(names)
+    )
+
+
+def ratio(wanted: str, observed: str, floor: float = 0.0) -> float:
+    """``SequenceMatcher`` ratio, or 0.0 once the quick upper bounds rule out ``floor``."""
+    matcher = SequenceMatcher(None, wanted, observed)
+    if matcher.real_quick_ratio() < floor or matcher.quick_ratio() < floor:
+        return 0.0
+    score = matcher.ratio()
+    return score if score >= floor else 0.0
+
+
+def similarity(
+    wanted: str, observed: str, floor: float = 0.0, folds: FoldTable = DEFAULT_FOLDS
+) -> float:
+    """Tiered score for two normalized texts, on the ``SequenceMatcher`` scale.
+
+    Equal texts score 1.0 and texts equal once ``folds`` are applied at least
+    ``VARIANT_SCORE``; everything else is the plain ``SequenceMatcher``
+    ratio. Scores that cannot reach ``floor`` are reported as 0.0.
+    """
+    if not wanted or not observed:
+        return 0.0
+    if wanted == observed:
+        return EXACT_SCORE
+    if folds and fold(wanted, folds) == fold(observed, folds):
+        return max(VARIANT_SCORE, ratio(wanted, observed))
+    return ratio(wanted, observed, floor)
+
+
+def _ratio_bound(first: int, second: int, shared: int) -> float:
+    """``quick_ratio`` of texts of these lengths sharing ``shared`` characters."""
+    return 2.0 * shared / (first + second)
+
+
+class Matcher:
+    """Best-match lookup over a fixed candidate list.
+
+    Candidates are normalized once. A query is answered from the exact and
+    variant hash maps when possible; otherwise a character postings list
+    bounds every candidate's ``quick_ratio``, and ``SequenceMatcher`` only
+    runs for candidates whose bound still reaches the floor. Only fold pairs
+    that keep every candidate distinct are used (``folds``).
+    """
+
+    def __init__(
+        self, candidates: Iterable[str], normalize: Optional[Callable[[str], str]] = None
+    ):
+        self._normalize = normalize or _squash
+        self.candidates: Tuple[str, ...] = tuple(dict.fromkeys(candidates))
+        self._normalized: List[str] = [self._normalize(name) for name in self.candidates]
+        self.folds = safe_folds(self._normalized)
+        self._positions = {name: position for position, name in enumerate(self.candidates)}
+        self._exact: Dict[str, int] = {}
+        self._variants: Dict[str, int] = {}
+        ambiguous: Set[str] = set()
+        self._counts: List[Counter] = []
+        self._postings: Dict[str, List[int]] = {}
+        for position, normalized in enumerate(self._normalized):
+            self._exact.setdefault(normalized, position)
+            folded = fold(normalized, self.folds)
+            if self._variants.setdefault(folded, position) != position:
+                # Pairs that are safe one at a time can still merge together.
+                ambiguous.add(folded)
+            counts = Counter(normalized)
+            self._counts.append(counts)
+            for character in counts:
+                self._postings.setdefault(character, []).append(position)
+        for folded in ambiguous:
+            del self._variants[folded]
+        self._lengths = sorted({len(normalized) for normalized in self._normalized})
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def _min_shared(self, length: int, floor: float) -> int:
+        """Fewest common characters any candidate needs to reach ``floor``."""
+        fewest = length + 1
+        for other in self._lengths:
+            for common in range(min(length, other, fewest - 1) + 1):
+                if _ratio_bound(length, other, common) + 1e-9 >= floor:
+                    fewest = common
+                    break
+        return fewest
+
+    def variant(self, query: str) -> Optional[str]:
+        """The one candidate equal to ``query`` once ``folds`` are applied."""
+        wanted = self._normalize(query)
+        position = self._variants.get(fold(wanted, self.folds)) if wanted else None
+        return self.candidates[position] if position is not None else None
+
+    def _bounds(self, wanted: str, floor: float, variants: bool) -> List[Tuple[float, int]]:
+        """(score bound, position) of every candidate that may reach ``floor``."""
+        length = len(wanted)
+        needed = self._min_shared(length, floor)
+        if needed == 0:
+            positions: Iterable[int] = range(len(self.candidates))
+        else:
+            # Prefix filter: sharing ``needed`` characters means sharing one of
+            # the ``length - needed + 1`` rarest query characters.
+            rarest = sorted(wanted, key=lambda character: len(self._postings.get(character, ())))
+            positions = {
+                position
+                for character in set(rarest[: max(0, length - needed + 1)])
+                for position in self._postings.get(character, ())
+            }
+        counts = Counter(wanted)
+        variant = self._variants.get(fold(wanted, self.folds)) if variants else None
+        bounds = []
+        for position in positions:
+            available = self._counts[position]
+            common = sum(min(count, available[character]) for character, count in counts.items())
+            bound = _ratio_bound(length, len(self._normalized[position]), common)
+            if position == variant:
+                bound = max(bound, VARIANT_SCORE)
+            if bound + 1e-9 >= floor:
+                bounds.append((bound, position))
+        if variant is not None and variant not in positions and VARIANT_SCORE >= floor:
+            bounds.append((VARIANT_SCORE, variant))
+        return bounds
+
+    def _score(self, wanted: str, position: int, floor: float, variants: bool) -> float:
+        normalized = self._normalized[position]
+        if variants:
+            return similarity(wanted, normalized, floor, self.folds)
+        return ratio(wanted, normalized, floor)
+
+    def best(
+        self, query: str, cutoff: float = 0.0, *, variants: bool = True
+    ) -> Optional[Tuple[str, float]]:
+        """The best candidate scoring at least ``cutoff``, with its score.
+
+        Ties go to the earliest candidate, as a linear scan would. Without
+        ``variants`` the score is the plain ``SequenceMatcher`` ratio.
+        """
+        wanted = self._normalize(query)
+        if not wanted:
+            return None
+        position = self._exact.get(wanted)
+        if position is not None:
+            return self.candidates[position], EXACT_SCORE
+        best_score, best_position = cutoff, -1
+        for bound, position in sorted(
+            self._bounds(wanted, cutoff, variants), key=lambda row: (-row[0], row[1])
+        ):
+            if bound + 1e-9 < best_score:
+                break
+            score = self._score(wanted, position, best_score, variants)
+            if score and (best_position < 0 or score > best_score or position < best_position):
+                best_score, best_position = score, position
+        if best_position < 0:
+            return None
+        return self.candidates[best_position], best_score
+
+    def bounds(self, query: str, floor: float = 0.0) -> List[Tuple[float, str]]:
+        """(score bound, candidate) for every candidate that may reach ``floor``.
+
+        No candidate left out can score ``floor`` or more against ``query``.
+        """
+        wanted = self._normalize(query)
+        if not wanted:
+            return []
+        return [
+            (bound, self.candidates[position])
+            for bound, position in self._bounds(wanted, floor, True)
+        ]
+
+    def score(self, query: str, candidate: str, floor: float = 0.0) -> float:
+        """``similarity`` of ``query`` and one candidate under this matcher's ``folds``."""
+        wanted = self._normalize(query)
+        if not wanted:
+            return 0.0
+        return self._score(wanted, self._positions[candidate], floor, True)
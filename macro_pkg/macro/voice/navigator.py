@@ -1,15 +1,28 @@
 from __future__ import annotations
 
+import re
 import time
-from dataclasses import dataclass
-from typing import Any, Callable, Optional, Sequence, Tuple
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from .config import Config
 from .errors import AutomationCancelled, GroundingError, TransitionVerificationError
-from .grounding import Target, contains_any_text, ground_target, scale_point
+from .grounding import (
+    Target,
+    TargetRanking,
+    contains_any_text,
+    ground_targets,
+    normalize_text,
+    scale_point,
+)
 from .index_loader import MenuIndex
 from .kiosk_profile import KioskProfile, ResolvedOrderItem
 from .perception import HybridScreenObserver, ScreenObservation
+from .profile_bundle import ProfileStore
+from .tracing import NULL_TRACER, traced
+
+# "2/5" style page indicator in a normalized (whitespace-free) text.
+_PAGE_INDICATOR = re.compile(r"(?<!\d)(\d{1,2})/(\d{1,2})(?!\d)")
 
 
 @dataclass(frozen=True)
@@ -22,6 +35,7 @@ class ActionResult:
     error: Optional[str] = None
     acted: bool = False
     uncertain: bool = False
+    elapsed: float = 0.0
 
 
 class Navigator:
@@ -38,12 +52,15 @@ class Navigator:
         *,
         observer: Any = None,
         profile: Optional[KioskProfile] = None,
+        profiles: Optional[ProfileStore] = None,
         pointer: Optional[Callable[[int, int], None]] = None,
         sleeper: Callable[[float], None] = time.sleep,
     ):
         self.idx = index
         self.cfg = cfg
         self.profile = profile or KioskProfile.load(cfg.profile_path, index)
+        self._profiles = profiles
+        self._reported_profile_error: Optional[str] = None
         self._observer = observer
         if (
             not bool(getattr(cfg, "dry_run", True))
@@ -58,14 +75,76 @@ class Navigator:
         self.last_error: Optional[str] = None
         self.last_uncertain = False
         self.cart_mutated = False
+        # Category and page actions performed, for planned-versus-actual reports.
+        self.navigation_transitions = 0
+        # Stable postcondition of the last action; dropped before the next input.
+        self._last_verified: Optional[ScreenObservation] = None
+        self.reused_observations = 0
+        self.tracer: Any = NULL_TRACER
 
     def _screen_observer(self) -> Any:
         if self._observer is None:
             self._observer = HybridScreenObserver(self.cfg)
+            self._bind_tracer(self._observer)
         return self._observer
 
-    def observe(self) -> ScreenObservation:
-        return self._screen_observer().observe()
+    def _bind_tracer(self, observer: Any) -> None:
+        set_tracer = getattr(observer, "set_tracer", None)
+        if callable(set_tracer):
+            set_tracer(self.tracer)
+
+    def use_tracer(self, tracer: Any) -> None:
+        """Record navigation and observation spans on ``tracer`` (``NULL_TRACER`` stops)."""
+        self.tracer = tracer
+        self._bind_tracer(self._observer)
+
+    def observe(
+        self, region: Optional[Tuple[float, float, float, float]] = None
+    ) -> ScreenObservation:
+        """Observe the window, or only ``region`` when the observer can scope it."""
+        observer = self._screen_observer()
+        observe_region = getattr(observer, "observe_region", None)
+        if region is not None and callable(observe_region):
+            return observe_region(region)
+        return observer.observe()
+
+    def _current_observation(
+        self, region: Optional[Tuple[float, float, float, float]] = None
+    ) -> ScreenObservation:
+        """The last verified observation while it is fresh, else a new one of ``region``.
+
+        It is only kept until the next input, so reusing it never hides a
+        change the navigator caused; ``KIOSK_OBSERVATION_REUSE_SEC`` bounds
+        how long an unprompted screen change can go unseen.
+        """
+        cached = self._last_verified
+        if (
+            cached is not None
+            and bool(getattr(self.cfg, "observation_reuse", True))
+            and time.monotonic() - cached.captured_at
+            <= float(getattr(self.cfg, "observation_reuse_max_age_sec", 0.5))
+        ):
+            self.reused_observations += 1
+            return cached
+        return self.observe(region)
+
+    def close(self) -> None:
+        """Release the observer: flush the OCR cache, stop its threads and captures."""
+        observer, self._observer = self._observer, None
+        close = getattr(observer, "close", None)
+        if callable(close):
+            close()
+
+    def warm_up_ocr(self) -> bool:
+        """Start loading the OCR reader in the background; returns False if OCR is off."""
+        starter = getattr(self._screen_observer(), "start_ocr_warmup", None)
+        return bool(starter()) if callable(starter) else False
+
+    def ocr_readiness(self) -> Dict[str, Any]:
+        ocr = getattr(self._screen_observer(), "ocr", None)
+        if ocr is None:
+            return {"state": "disabled", "error": None}
+        return ocr.readiness()
 
     @staticmethod
     def _pyautogui() -> Any:
@@ -80,6 +159,7 @@ class Navigator:
         if self.cfg.dry_run:
             print(f"[DRY] click({x},{y})")
             return True
+        self._last_verified = None
         try:
             if self._pointer is not None:
                 self._pointer(x, y)
@@ -100,22 +180,30 @@ class Navigator:
             print(f"[ERR] {self.last_error}")
             return False
 
-    def _wait_for_postcondition(
+    @staticmethod
+    def _postcondition_met(
+        observation: ScreenObservation,
+        before: ScreenObservation,
+        expected_any: Sequence[str],
+        require_change: bool,
+    ) -> bool:
+        changed = observation.signature != before.signature
+        expected = not expected_any or contains_any_text(observation, expected_any)
+        return expected and (changed or not require_change)
+
+    def _poll_for_postcondition(
         self,
         before: ScreenObservation,
         expected_any: Sequence[str],
         *,
         require_change: bool,
+        deadline: float,
     ) -> ScreenObservation:
-        deadline = time.monotonic() + float(self.cfg.transition_timeout_sec)
-        last = before
         candidate: Optional[ScreenObservation] = None
         while time.monotonic() <= deadline:
             self._sleep(float(self.cfg.transition_poll_sec))
             last = self.observe()
-            changed = last.signature != before.signature
-            expected = not expected_any or contains_any_text(last, expected_any)
-            if expected and (changed or not require_change):
+            if self._postcondition_met(last, before, expected_any, require_change):
                 if candidate is not None and candidate.signature == last.signature:
                     return last
                 candidate = last
@@ -124,13 +212,91 @@ class Navigator:
         expectation = ", ".join(expected_any) if expected_any else "screen state change"
         raise TransitionVerificationError(f"postcondition not observed: {expectation}")
 
+    def _wait_for_postcondition(
+        self,
+        before: ScreenObservation,
+        expected_any: Sequence[str],
+        *,
+        require_change: bool,
+    ) -> ScreenObservation:
+        """Wait until the postcondition holds on two stable readings of the screen.
+
+        With an observer ``probe`` the loop wakes on cheap change signals, runs
+        a full observation only once the screen has settled, and confirms it
+        with a probe: an unchanged fingerprint after a settle interval stands
+        in for the second identical observation. Otherwise full observations
+        are polled every ``transition_poll_sec``.
+
+        A probe can miss a change (a dropped or coalesced UIA event), so a
+        rejected screen is still re-read every ``transition_poll_sec``; a
+        postcondition found that way needs two identical full readings.
+        """
+        deadline = time.monotonic() + float(self.cfg.transition_timeout_sec)
+        observer = self._screen_observer()
+        probe = getattr(observer, "probe", None)
+        token = probe() if callable(probe) else None
+        if token is None:
+            return self._poll_for_postcondition(
+                before, expected_any, require_change=require_change, deadline=deadline
+            )
+        wait = getattr(observer, "wait_for_change", None)
+        settle = float(getattr(self.cfg, "transition_settle_sec", 0.03))
+        poll = float(getattr(self.cfg, "transition_poll_sec", 0.05))
+        candidate: Optional[ScreenObservation] = None
+        rejected = None
+        observed_at = 0.0
+        blind = False
+        while time.monotonic() <= deadline:
+            if callable(wait):
+                wait(token, settle)
+            else:
+                self._sleep(settle)
+            current = probe()
+            if current is None:
+                return self._poll_for_postcondition(
+                    before, expected_any, require_change=require_change, deadline=deadline
+                )
+            if current != token:
+                token, candidate, blind = current, None, False
+                continue
+            if candidate is not None and not blind:
+                return candidate
+            if current == rejected:
+                if time.monotonic() - observed_at < poll:
+                    continue
+                blind = True
+            observation = self.observe()
+            observed_at = time.monotonic()
+            token = probe()
+            if token != current:
+                # The screen moved while it was being read; wait for it to settle.
+                continue
+            if not self._postcondition_met(observation, before, expected_any, require_change):
+                candidate, rejected = None, token
+            elif not blind:
+                candidate = observation
+            elif candidate is not None and candidate.signature == observation.signature:
+                return observation
+            else:
+                candidate = observation
+        expectation = ", ".join(expected_any) if expected_any else "screen state change"
+        raise TransitionVerificationError(f"postcondition not observed: {expectation}")
+
+    @traced("activate", lambda target, **_: {"target": target.key})
     def activate(
         self,
         target: Target,
         *,
         expected_any: Sequence[str] = (),
         require_change: bool = True,
+        observation: Optional[ScreenObservation] = None,
+        ranking: Optional[TargetRanking] = None,
     ) -> ActionResult:
+        """Act on ``target`` and wait for the postcondition.
+
+        ``observation`` and its ``ranking`` for ``target`` let a caller that
+        already grounded the target on the current screen skip both again.
+        """
         if self.cfg.dry_run:
             labels = "/".join(target.labels)
             print(f"[DRY] semantic action {target.key}: {labels}")
@@ -138,66 +304,66 @@ class Navigator:
                 self.click(target.fallback_xy)
             return ActionResult(True, True, "dry-run")
 
+        started = time.monotonic()
         try:
-            before = self.observe()
+            if observation is None:
+                observation, ranking = self._current_observation(), None
+            before = observation
             grounded = None
             acted = False
-            try:
-                grounded = ground_target(
-                    before,
-                    target,
-                    cutoff=float(self.cfg.match_cutoff),
-                    ambiguity_margin=float(self.cfg.ambiguity_margin),
-                )
-            except GroundingError:
-                observe_with_ocr = getattr(self._screen_observer(), "observe_with_ocr", None)
-                if callable(observe_with_ocr):
-                    before = observe_with_ocr()
-                    try:
-                        grounded = ground_target(
-                            before,
-                            target,
-                            cutoff=float(self.cfg.match_cutoff),
-                            ambiguity_margin=float(self.cfg.ambiguity_margin),
-                        )
-                    except GroundingError:
-                        grounded = None
-                if grounded is None and (
-                    not self.cfg.allow_coordinate_fallback or target.fallback_xy is None
-                ):
-                    raise
-
+            with self.tracer.span("grounding"):
+                try:
+                    grounded = (ranking or self._ground(before, (target,))[0]).result()
+                except GroundingError:
+                    observe_with_ocr = getattr(self._screen_observer(), "observe_with_ocr", None)
+                    if callable(observe_with_ocr):
+                        before = observe_with_ocr()
+                        try:
+                            grounded = self._ground(before, (target,))[0].result()
+                        except GroundingError:
+                            grounded = None
+                    if grounded is None and (
+                        not self.cfg.allow_coordinate_fallback or target.fallback_xy is None
+                    ):
+                        raise
+
+            self._last_verified = None
             source = "coordinate"
-            if grounded is not None:
-                source = grounded.element.source
-                invoked = bool(
-                    grounded.element.source == "uia"
-                    and self._screen_observer().invoke(grounded.element)
-                )
-                if not invoked and not self.click(grounded.element.rect.center):
-                    raise RuntimeError("resolved target could not be activated")
-                acted = True
-            else:
-                point = scale_point(
-                    target.fallback_xy,
-                    self.profile.reference_size,
-                    (before.width, before.height),
-                )
-                point = (
-                    point[0] + int(getattr(before, "origin_x", 0)),
-                    point[1] + int(getattr(before, "origin_y", 0)),
+            with self.tracer.span("input"):
+                if grounded is not None:
+                    source = grounded.element.source
+                    invoked = bool(
+                        grounded.element.source == "uia"
+                        and self._screen_observer().invoke(grounded.element)
+                    )
+                    if not invoked and not self.click(grounded.element.rect.center):
+                        raise RuntimeError("resolved target could not be activated")
+                    acted = True
+                else:
+                    point = scale_point(
+                        target.fallback_xy,
+                        self.profile.reference_size,
+                        (before.width, before.height),
+                    )
+                    point = (
+                        point[0] + int(getattr(before, "origin_x", 0)),
+                        point[1] + int(getattr(before, "origin_y", 0)),
+                    )
+                    if not self.click(point):
+                        raise RuntimeError("coordinate fallback failed")
+                    acted = True
+
+            with self.tracer.span("stabilize"):
+                after = self._wait_for_postcondition(
+                    before,
+                    expected_any,
+                    require_change=require_change,
                 )
-                if not self.click(point):
-                    raise RuntimeError("coordinate fallback failed")
-                acted = True
-
-            after = self._wait_for_postcondition(
-                before,
-                expected_any,
-                require_change=require_change,
-            )
+            self._last_verified = after
             self.last_error = None
-            return ActionResult(True, True, source, before, after, acted=True)
+            return ActionResult(
+                True, True, source, before, after, acted=True, elapsed=time.monotonic() - started
+            )
         except AutomationCancelled:
             raise
         except Exception as exc:
@@ -228,22 +394,10 @@ class Navigator:
         observation: ScreenObservation,
         region: Optional[Tuple[float, float, float, float]],
     ) -> Tuple[str, ...]:
-        if region is None:
-            return tuple("".join(text.split()).casefold() for text in observation.texts)
-        left, top, right, bottom = region
-        width, height = max(1, observation.width), max(1, observation.height)
-        origin_x = int(getattr(observation, "origin_x", 0))
-        origin_y = int(getattr(observation, "origin_y", 0))
-        values = []
-        for element in observation.elements:
-            x, y = element.rect.center
-            normalized_x = (x - origin_x) / width
-            normalized_y = (y - origin_y) / height
-            if left <= normalized_x <= right and top <= normalized_y <= bottom:
-                value = "".join(element.text.split()).casefold()
-                if value:
-                    values.append(value)
-        return tuple(values)
+        texts = observation.normalized_texts
+        return tuple(
+            texts[position] for position in observation.positions_in(region) if texts[position]
+        )
 
     def _page_evidence(
         self, observation: ScreenObservation, category: str, page: int
@@ -251,12 +405,11 @@ class Navigator:
         markers = tuple("".join(value.split()).casefold() for value in self._page_markers(category, page))
         if not markers:
             return False
-        visible = self._region_texts(observation, self.profile.menu_region)
-        matched = sum(
-            any(marker == text or marker in text for text in visible) for marker in markers
-        )
+        visible = observation.text_index(self.profile.menu_region)
+        matched = sum(visible.contains(marker) for marker in markers)
         return matched >= min(2, len(markers))
 
+    @traced("go_category", lambda category: {"category": category})
     def go_category(self, category: str) -> bool:
         fallback = self.idx.category_centers.get(category)
         if fallback is None:
@@ -269,7 +422,7 @@ class Navigator:
         )
         if not self.cfg.dry_run:
             try:
-                current = self.observe()
+                current = self._current_observation()
                 if self._page_evidence(current, category, 1):
                     self.current_category = category
                     self.current_page = 1
@@ -277,6 +430,7 @@ class Navigator:
             except Exception as exc:
                 self.last_error = str(exc)
                 return False
+        self.navigation_transitions += 1
         result = self.activate(
             target,
             expected_any=self._page_markers(category, 1),
@@ -292,18 +446,50 @@ class Navigator:
         self.last_error = self.last_error or f"category page was not verified: {category}"
         return False
 
-    def go_page_from_one(self, category: str, target_page: int) -> bool:
-        if target_page <= 1:
-            self.current_page = 1
-            return True
-        for page in range(2, target_page + 1):
-            target = self.profile.target(
-                "next",
-                "다음",
-                fallback_xy=self.idx.next_xy,
+    def _page_count(self, category: str) -> int:
+        return max(
+            (page for menu_category, page, _ in self.idx.name_to_entry.values() if menu_category == category),
+            default=0,
+        )
+
+    @property
+    def pages_backward(self) -> bool:
+        """Whether the kiosk has a calibrated or labelled previous-page control."""
+        return getattr(self.idx, "prev_xy", None) is not None or bool(self.profile.aliases.get("previous"))
+
+    def detect_page(self, observation: ScreenObservation, category: str) -> Optional[int]:
+        """Page of ``category`` on screen, from its menu cards or an ``n/m`` indicator.
+
+        Cards identify the category as well as the page; the indicator alone
+        is only trusted while the navigator is already in ``category``.
+        """
+        pages = self._page_count(category)
+        if not pages:
+            return None
+        guess = self.current_page if self.current_category == category else 1
+        for page in sorted(range(1, pages + 1), key=lambda page: abs(page - guess)):
+            if self._page_evidence(observation, category, page):
+                return page
+        if self.current_category != category:
+            return None
+        for text in observation.normalized_texts:
+            match = _PAGE_INDICATOR.search(text)
+            if match and int(match.group(2)) == pages and 1 <= int(match.group(1)) <= pages:
+                return int(match.group(1))
+        return None
+
+    def _turn_pages(self, category: str, start: int, target_page: int) -> bool:
+        step = 1 if target_page > start else -1
+        if step > 0:
+            control = self.profile.target("next", "다음", fallback_xy=self.idx.next_xy)
+        else:
+            control = self.profile.target(
+                "previous", "이전", fallback_xy=getattr(self.idx, "prev_xy", None)
             )
+        for page in range(start + step, target_page + step, step):
+            self.navigation_transitions += 1
             result = self.activate(
-                target,
+                control,
                 expected_any=self._page_markers(category, page),
                 require_change=not self.cfg.dry_run,
             )
@@ -316,17 +502,61 @@ class Navigator:
             self.current_page = page
         return True
 
-    def _visible(self, observation: ScreenObservation, target: Target) -> bool:
-        try:
-            ground_target(
-                observation,
-                target,
-                cutoff=float(self.cfg.match_cutoff),
-                ambiguity_margin=float(self.cfg.ambiguity_margin),
-            )
+    @traced("go_page_from_one", lambda category, target_page: {"category": category, "page": target_page})
+    def go_page_from_one(self, category: str, target_page: int) -> bool:
+        if target_page <= 1:
+            self.current_page = 1
             return True
-        except GroundingError:
-            return False
+        return self._turn_pages(category, 1, target_page)
+
+    @traced("go_to", lambda category, page, observation=None: {"category": category, "page": page})
+    def go_to(
+        self, category: str, page: int, observation: Optional[ScreenObservation] = None
+    ) -> bool:
+        """Reach ``page`` of ``category`` with the fewest category and page actions.
+
+        Live runs read the current page from a full observation of the screen
+        (``observation`` when the caller already has one; a region crop can
+        cut off the ``n/m`` indicator); pages are then turned in the shorter
+        direction, or the category button restarts from page 1.
+        """
+        start = self.current_page if self.current_category == category else None
+        if not self.cfg.dry_run:
+            try:
+                current = observation or self._current_observation()
+            except Exception as exc:
+                self.last_error = str(exc)
+                return False
+            start = self.detect_page(current, category)
+            if start is not None:
+                self.current_category, self.current_page = category, start
+        if start is None or (start > page and (not self.pages_backward or start - page > page)):
+            if not self.go_category(category):
+                return False
+            start = 1
+        return self._turn_pages(category, start, page)
+
+    def _ground(
+        self, observation: ScreenObservation, targets: Sequence[Target]
+    ) -> List[TargetRanking]:
+        """Rank ``targets`` against ``observation`` in one pass."""
+        return ground_targets(
+            observation,
+            targets,
+            cutoff=float(self.cfg.match_cutoff),
+            ambiguity_margin=float(self.cfg.ambiguity_margin),
+        )
+
+    def _visible(self, observation: ScreenObservation, target: Target) -> bool:
+        return self._ground(observation, (target,))[0].grounded is not None
+
+    def _checkout_target(self) -> Target:
+        return self.profile.target(
+            "checkout",
+            "결제하기",
+            "주문하기",
+            fallback_xy=(self.cfg.checkout_x, self.cfg.checkout_y),
+        )
 
     def _cart_semantic_signature(self, observation: ScreenObservation) -> Tuple[str, ...]:
         if self.profile.cart_region is None:
@@ -344,17 +574,80 @@ class Navigator:
         if before_cart and after_cart and before_cart != after_cart:
             return True
 
-        before_texts = tuple("".join(text.split()).casefold() for text in before.texts)
-        after_texts = tuple("".join(text.split()).casefold() for text in after.texts)
+        before_texts = before.text_index()
+        after_texts = after.text_index()
         for template in self.profile.item_added_markers:
             marker = "".join(template.format(menu=menu_name).split()).casefold()
-            if marker and not any(marker in text for text in before_texts) and any(
-                marker in text for text in after_texts
-            ):
+            if marker and not before_texts.contains(marker) and after_texts.contains(marker):
                 return True
         return False
 
-    def _add_one(self, item: ResolvedOrderItem) -> bool:
+    def _cart_row(
+        self, observation: ScreenObservation, menu_name: str
+    ) -> Optional[Tuple[Tuple[float, float, float, float], str]]:
+        """Region and joined text of the single cart line that starts with ``menu_name``."""
+        region = self.profile.cart_region
+        if region is None:
+            return None
+        name = normalize_text(menu_name)
+        texts = observation.normalized_texts
+        positions = observation.positions_in(region)
+        rows = []
+        for position in positions:
+            if not name or not texts[position].startswith(name):
+                continue
+            rect = observation.elements[position].rect
+            line = sorted(
+                (observation.elements[other].rect.left, texts[other])
+                for other in positions
+                if rect.top <= observation.elements[other].rect.center[1] <= rect.bottom
+            )
+            height = max(1, observation.height)
+            rows.append(
+                (
+                    (
+                        region[0],
+                        (rect.top - observation.origin_y) / height,
+                        region[2],
+                        (rect.bottom - observation.origin_y) / height,
+                    ),
+                    "".join(text for _, text in line),
+                )
+            )
+        return rows[0] if len(rows) == 1 else None
+
+    def _cart_quantity(self, observation: ScreenObservation, menu_name: str) -> Optional[int]:
+        """Count shown on ``menu_name``'s cart line through the stepper's count labels."""
+        stepper = self.profile.quantity_stepper
+        row = self._cart_row(observation, menu_name)
+        if stepper is None or row is None:
+            return None
+        name = normalize_text(menu_name)
+        for label in stepper.count_labels:
+            parts = [re.escape(part.replace("{menu}", name)) for part in normalize_text(label).split("{count}")]
+            match = re.search(r"(?<!\d)(\d{1,3})".join(parts), row[1])
+            if match:
+                return int(match.group(1))
+        return None
+
+    def _quantity_verified(
+        self, before: Optional[int], after: ScreenObservation, menu_name: str, units: int
+    ) -> bool:
+        if self._cart_quantity(after, menu_name) == (before or 0) + units:
+            return True
+        self.last_error = f"cart quantity was not verified: {menu_name} +{units}"
+        print(f"[ERR] {self.last_error}")
+        self.last_uncertain = True
+        return False
+
+    @traced("add_item", lambda item, units=1: {"menu": item.menu.name, "units": units})
+    def _add_one(self, item: ResolvedOrderItem, units: int = 1) -> bool:
+        """Add ``item`` once, raising the count to ``units`` in the modal stepper.
+
+        The menu card, confirm and checkout targets are ranked together on
+        each shared observation, so the visibility check and the activation
+        that follows reuse one ranking pass.
+        """
         menu = item.menu
         menu_target = Target(
             key=f"menu:{menu.name}",
@@ -368,22 +661,30 @@ class Navigator:
             fallback_xy=menu.fallback_xy,
             region=self.profile.menu_region,
         )
+        confirm = Target(
+            key="confirm-item",
+            labels=self.profile.confirm_labels,
+            roles=("ButtonControl", "button"),
+        )
 
+        observed = None
+        rankings: Optional[List[TargetRanking]] = None
         if not self.cfg.dry_run:
+            targets = (menu_target, confirm, self._checkout_target())
             try:
-                already_visible = self._visible(self.observe(), menu_target)
+                observed = self._current_observation()
+                rankings = self._ground(observed, targets)
             except Exception:
-                already_visible = False
-        else:
-            already_visible = False
-
-        if not already_visible:
-            if not self.go_category(menu.category):
-                return False
-            if not self.go_page_from_one(menu.category, menu.page):
-                return False
+                rankings = None
 
-        result = self.activate(menu_target, require_change=True)
+        if rankings is not None and rankings[0].grounded is not None:
+            result = self.activate(
+                menu_target, require_change=True, observation=observed, ranking=rankings[0]
+            )
+        elif not self.go_to(menu.category, menu.page, observed):
+            return False
+        else:
+            result = self.activate(menu_target, require_change=True)
         if not result.success:
             return False
         before_item_action = result.before
@@ -394,20 +695,24 @@ class Navigator:
                 self.last_uncertain = True
                 return False
 
+        for _ in range(units - 1):
+            stepped = self.activate(self.profile.quantity_stepper.increment, require_change=True)
+            if not stepped.success:
+                self.last_uncertain = True
+                return False
+
         if self.cfg.dry_run:
             return True
 
-        current = self.observe()
-        confirm = Target(
-            key="confirm-item",
-            labels=self.profile.confirm_labels,
-            roles=("ButtonControl", "button"),
-        )
-        if confirm.labels and self._visible(current, confirm):
+        current = self._current_observation()
+        rankings = self._ground(current, targets)
+        if confirm.labels and rankings[1].grounded is not None:
             confirmed = self.activate(
                 confirm,
                 expected_any=self.profile.cart_added_markers,
                 require_change=True,
+                observation=current,
+                ranking=rankings[1],
             )
             if not confirmed.success:
                 self.last_uncertain = True
@@ -428,10 +733,49 @@ class Navigator:
             self.last_uncertain = True
             return False
         self.cart_mutated = True
+        if units > 1 and not self._quantity_verified(
+            self._cart_quantity(before_item_action, menu.name), current, menu.name, units
+        ):
+            return False
         return True
 
+    def _raise_in_cart(self, item: ResolvedOrderItem, units: int) -> Optional[bool]:
+        """Press the cart line's stepper ``units`` times; ``None`` if the line is unreadable."""
+        stepper = self.profile.quantity_stepper
+        if self.cfg.dry_run:
+            for _ in range(units):
+                self.activate(stepper.increment, require_change=False)
+            return True
+        current = self._current_observation()
+        row = self._cart_row(current, item.menu.name)
+        count = self._cart_quantity(current, item.menu.name)
+        if row is None or count is None:
+            return None
+        increment = replace(stepper.increment, region=row[0])
+        for _ in range(units):
+            result = self.activate(increment, require_change=True)
+            if not result.success:
+                self.last_uncertain = True
+                return False
+            current = result.after or current
+        return self._quantity_verified(count, current, item.menu.name, units)
+
     def add_resolved_item(self, item: ResolvedOrderItem) -> bool:
-        for _ in range(item.quantity):
+        """Add ``item.quantity`` units, through the profile's stepper when it has one."""
+        stepper = self.profile.quantity_stepper
+        if stepper is not None and item.quantity > 1:
+            if stepper.location == "modal":
+                return self._add_one(item, item.quantity)
+            if not self._add_one(item):
+                return False
+            raised = self._raise_in_cart(item, item.quantity - 1)
+            if raised is not None:
+                return raised
+            print("[WARN] 장바구니 수량 표시를 읽지 못해 한 개씩 추가합니다.")
+            remaining = item.quantity - 1
+        else:
+            remaining = item.quantity
+        for _ in range(remaining):
             if not self._add_one(item):
                 return False
         return True
@@ -450,6 +794,7 @@ class Navigator:
     def add_item_like_position_test(self, name: str, count: int = 1) -> bool:
         return self.add_item(name, count)
 
+    @traced("payment_ready")
     def navigate_to_payment_ready(self) -> bool:
         if not bool(getattr(self.cfg, "allow_payment_navigation", False)):
             self.last_error = "KIOSK_ALLOW_PAYMENT_NAVIGATION is disabled"
@@ -458,18 +803,12 @@ class Navigator:
         if self.cfg.dry_run:
             state = "menu"
         else:
-            observation = self.observe()
+            observation = self._current_observation()
             state = graph.detect_state(observation)
             if state == "payment_ready":
                 return True
             if state is None:
-                checkout = self.profile.target(
-                    "checkout",
-                    "결제하기",
-                    "주문하기",
-                    fallback_xy=(self.cfg.checkout_x, self.cfg.checkout_y),
-                )
-                if not self._visible(observation, checkout):
+                if not self._visible(observation, self._checkout_target()):
                     self.last_error = "current kiosk state is unknown"
                     return False
                 state = "menu"
@@ -495,10 +834,12 @@ class Navigator:
             )
             if not result.success:
                 return False
+            if result.elapsed and bool(getattr(self.cfg, "route_by_latency", True)):
+                graph.record_latency(transition, result.elapsed)
 
         if self.cfg.dry_run:
             return True
-        final = self.observe()
+        final = self._current_observation()
         if graph.detect_state(final) != "payment_ready":
             self.last_error = "payment-ready screen was not verified"
             self.last_uncertain = True
@@ -506,6 +847,24 @@ class Navigator:
         print("[PAY] 결제 준비 화면을 확인했습니다. 실제 결제 입력 없이 정지합니다.")
         return True
 
+    def refresh_profile(self) -> bool:
+        """Adopt a reloaded profile bundle; only call this between orders."""
+        if self._profiles is None:
+            return False
+        bundle = self._profiles.current()
+        error = self._profiles.last_error
+        if error and error != self._reported_profile_error:
+            print(f"[PROFILE] 프로필 다시 불러오기 실패, 이전 프로필 유지: {error}")
+        self._reported_profile_error = error
+        if bundle.profile is self.profile:
+            return False
+        self.idx = bundle.index
+        self.profile = bundle.profile
+        self.reset_navigation()
+        print(f"[PROFILE] 변경된 키오스크 프로필 적용 (generation {self._profiles.generation})")
+        return True
+
     def reset_navigation(self) -> None:
+        self._last_verified = None
         self.current_category = None
         self.current_page = 1
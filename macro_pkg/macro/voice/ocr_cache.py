@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# (text, confidence, (left, top, right, bottom)) relative to the cached crop.
+CachedText = Tuple[str, float, Tuple[int, int, int, int]]
+
+
+def content_key(image: Any) -> str:
+    """Digest the crop's exact pixels.
+
+    A perceptual hash can map ``총 수량 1개`` and ``총 수량 2개`` to the same
+    bits, so cached text is only reused for pixel-identical crops.
+    """
+    height, width = int(image.shape[0]), int(image.shape[1])
+    digest = hashlib.blake2b(image.tobytes(), digest_size=16).hexdigest()
+    return f"{height}x{width}:{digest}"
+
+
+class OCRResultCache:
+    """Bounded LRU map from crop content to recognized text boxes.
+
+    With ``path`` the entries are spilled to a JSON file so repeated kiosk
+    screens stay warm across client restarts. ``namespace`` identifies the
+    recognizer; a file written by another model or language set is ignored.
+    """
+
+    format_version = 1
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        *,
+        path: str = "",
+        namespace: str = "",
+        key: Callable[[Any], str] = content_key,
+        spill_every: int = 32,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.path = str(Path(path).expanduser()) if path else ""
+        self.namespace = namespace
+        self.key = key
+        self.spill_every = max(1, int(spill_every))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[CachedText, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        if self.path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def get(self, key: str) -> Optional[Tuple[CachedText, ...]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, results: List[CachedText]) -> None:
+        with self._lock:
+            self._entries[key] = tuple(results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._unsaved += 1
+            spill = bool(self.path) and self._unsaved >= self.spill_every
+        if spill:
+            self.flush()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(Path(self.path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != self.format_version
+            or data.get("namespace") != self.namespace
+        ):
+            return
+        for key, rows in list(data.get("entries", []))[-self.max_entries :]:
+            try:
+                self._entries[str(key)] = tuple(
+                    (str(text), float(confidence), tuple(int(value) for value in box))
+                    for text, confidence, box in rows
+                )
+            except (TypeError, ValueError):
+                continue
+
+    def flush(self) -> None:
+        """Write the cache atomically; a failed spill never affects recognition."""
+        if not self.path:
+            return
+        with self._lock:
+            payload = {
+                "version": self.format_version,
+                "namespace": self.namespace,
+                "entries": [[key, list(rows)] for key, rows in self._entries.items()],
+            }
+            self._unsaved = 0
+        temporary = f"{self.path}.tmp"
+        try:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            Path(temporary).write_text(
+                json.dumps(payload, ensure_ascii=False, separators=(",", ":")),
+                encoding="utf-8",
+            )
+            os.replace(temporary, self.path)
+        except OSError:
+            pass
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from .perception import ObservedElement, Rect
+
+
+def tile_digest(tile: Any) -> bytes:
+    """Digest one tile's exact pixels.
+
+    A clean tile keeps its previous text, so a perceptual hash that maps
+    ``총 수량 1개`` and ``총 수량 2개`` to the same bits would leave a stale
+    quantity on screen; see ``ocr_cache.content_key``.
+    """
+    height, width = int(tile.shape[0]), int(tile.shape[1])
+    digest = hashlib.blake2b(tile.tobytes(), digest_size=16)
+    digest.update(f"{height}x{width}".encode("ascii"))
+    return digest.digest()
+
+
+def _intersects(first: Rect, second: Rect) -> bool:
+    return (
+        first.left < second.right
+        and second.left < first.right
+        and first.top < second.bottom
+        and second.top < first.bottom
+    )
+
+
+def _union(first: Rect, second: Rect) -> Rect:
+    return Rect(
+        min(first.left, second.left),
+        min(first.top, second.top),
+        max(first.right, second.right),
+        max(first.bottom, second.bottom),
+    )
+
+
+class TileChangeDetector:
+    """Compare per-tile fingerprints of consecutive frames.
+
+    ``update`` returns ``None`` when the whole frame must be recognized (first
+    frame, size change, or too much of the screen changed) and otherwise the
+    list of dirty rectangles in frame coordinates, possibly empty. Tiles are
+    compared by exact pixel digest, so any change marks a tile dirty.
+    """
+
+    def __init__(
+        self,
+        rows: int = 8,
+        cols: int = 4,
+        *,
+        max_dirty_ratio: float = 0.5,
+        hasher: Callable[[Any], Any] = tile_digest,
+    ):
+        self.rows = max(1, int(rows))
+        self.cols = max(1, int(cols))
+        self.max_dirty_ratio = max_dirty_ratio
+        self.hasher = hasher
+        self._shape: Optional[Tuple[int, int]] = None
+        self._hashes: List[Any] = []
+
+    def reset(self) -> None:
+        self._shape = None
+        self._hashes = []
+
+    def tiles(self, width: int, height: int) -> List[Rect]:
+        return [
+            Rect(
+                col * width // self.cols,
+                row * height // self.rows,
+                (col + 1) * width // self.cols,
+                (row + 1) * height // self.rows,
+            )
+            for row in range(self.rows)
+            for col in range(self.cols)
+        ]
+
+    def fingerprint(self, image: Any) -> Tuple[Any, ...]:
+        """Hash every tile of ``image`` without touching the stored state."""
+        height, width = int(image.shape[0]), int(image.shape[1])
+        return tuple(
+            self.hasher(image[tile.top : tile.bottom, tile.left : tile.right])
+            for tile in self.tiles(width, height)
+        )
+
+    def update(self, image: Any) -> Optional[List[Rect]]:
+        height, width = int(image.shape[0]), int(image.shape[1])
+        tiles = self.tiles(width, height)
+        hashes = list(self.fingerprint(image))
+        previous, previous_shape = self._hashes, self._shape
+        self._hashes, self._shape = hashes, (height, width)
+        if previous_shape != (height, width) or len(previous) != len(hashes):
+            return None
+        dirty = [tile for tile, old, new in zip(tiles, previous, hashes) if old != new]
+        if len(dirty) > self.max_dirty_ratio * len(tiles):
+            return None
+        return _merge_rects(dirty)
+
+
+def _merge_rects(rects: Sequence[Rect]) -> List[Rect]:
+    """Merge touching rectangles so text spanning adjacent tiles is read once."""
+    merged: List[Rect] = []
+    for rect in rects:
+        current = rect
+        changed = True
+        while changed:
+            changed = False
+            for other in list(merged):
+                grown = Rect(current.left - 1, current.top - 1, current.right + 1, current.bottom + 1)
+                if _intersects(grown, other):
+                    merged.remove(other)
+                    current = _union(current, other)
+                    changed = True
+        merged.append(current)
+    return merged
+
+
+def recognition_regions(
+    dirty: Sequence[Rect],
+    previous: Sequence[ObservedElement],
+    width: int,
+    height: int,
+    margin: int = 16,
+) -> List[Rect]:
+    """Grow dirty tiles over previous text they touch, then add a margin."""
+    regions: List[Rect] = []
+    for rect in dirty:
+        grown = rect
+        for element in previous:
+            if _intersects(element.rect, rect):
+                grown = _union(grown, element.rect)
+        regions.append(
+            Rect(
+                max(0, grown.left - margin),
+                max(0, grown.top - margin),
+                min(width, grown.right + margin),
+                min(height, grown.bottom + margin),
+            )
+        )
+    return _merge_rects(regions)
+
+
+def merge_tile_results(
+    previous: Sequence[ObservedElement],
+    recognized: Sequence[ObservedElement],
+    dirty: Sequence[Rect],
+) -> List[ObservedElement]:
+    """Keep previous text from clean tiles and new text touching dirty tiles."""
+    kept = [
+        element
+        for element in previous
+        if not any(_intersects(element.rect, rect) for rect in dirty)
+    ]
+    fresh = [
+        element
+        for element in recognized
+        if any(_intersects(element.rect, rect) for rect in dirty)
+    ]
+    return sorted(
+        [*kept, *fresh],
+        key=lambda element: (element.rect.top, element.rect.left, element.text),
+    )
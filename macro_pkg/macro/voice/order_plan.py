@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+# (category, page) of one menu screen.
+Screen = Tuple[str, int]
+
+
+@dataclass(frozen=True)
+class PlannedItem:
+    position: int
+    screen: Screen
+    transitions: int
+
+
+@dataclass(frozen=True)
+class OrderPlan:
+    """Execution order of an order's items and the navigation it should cost."""
+
+    steps: Tuple[PlannedItem, ...]
+
+    @property
+    def order(self) -> Tuple[int, ...]:
+        return tuple(step.position for step in self.steps)
+
+    @property
+    def expected_transitions(self) -> int:
+        return sum(step.transitions for step in self.steps)
+
+
+def screen_moves(current: Optional[Screen], target: Screen, *, backward: bool = False) -> int:
+    """Category and page actions needed to reach ``target`` from ``current``.
+
+    Without a previous-page control an earlier page of the same category is
+    reached again through the category button.
+    """
+    category, page = target
+    if current is None or current[0] != category:
+        return page
+    if current[1] <= page:
+        return page - current[1]
+    return min(current[1] - page, page) if backward else page
+
+
+def plan_order(
+    screens: Sequence[Screen], *, group: bool = True, backward: bool = False
+) -> OrderPlan:
+    """Plan items so each category is entered once and its pages walked forward.
+
+    With ``group`` categories keep their first-mention order and items within
+    a category are sorted by page; without it the spoken order is kept.
+    """
+    order = list(range(len(screens)))
+    if group:
+        rank: Dict[str, int] = {}
+        for position, (category, _) in enumerate(screens):
+            rank.setdefault(category, position)
+        order.sort(key=lambda position: (rank[screens[position][0]], screens[position][1]))
+    steps = []
+    current: Optional[Screen] = None
+    for position in order:
+        moves = screen_moves(current, screens[position], backward=backward)
+        steps.append(PlannedItem(position, screens[position], moves))
+        current = screens[position]
+    return OrderPlan(tuple(steps))
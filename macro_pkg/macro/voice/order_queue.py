@@ -4,6 +4,7 @@ import json
 import os
 import sqlite3
 import threading
+import time
 import uuid
 from contextlib import contextmanager
 from dataclasses import dataclass
@@ -11,6 +12,27 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
+from .config import _env, _env_positive_int
+from .latency import stage_stamps
+
+
+# How often a waiting claim looks for commits from other processes.
+_CROSS_PROCESS_CHECK_SEC = 0.25
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+def queue_options() -> Dict[str, Any]:
+    """Connection pool and durability settings from ``KIOSK_ORDER_DB_*``.
+
+    Invalid values fall back to the defaults rather than stopping startup.
+    """
+    synchronous = _env("KIOSK_ORDER_DB_SYNCHRONOUS", "FULL").strip().upper()
+    return {
+        "pool_size": _env_positive_int("KIOSK_ORDER_DB_POOL", 4),
+        "synchronous": synchronous if synchronous in SYNCHRONOUS_LEVELS else "FULL",
+        "checkpoint_pages": _env_positive_int("KIOSK_ORDER_DB_CHECKPOINT_PAGES", 1000),
+    }
+
 
 def _now() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -22,6 +44,7 @@ class QueuedOrder:
     items: Tuple[Dict[str, Any], ...]
     attempt: int
     status: str
+    correlation_id: str = ""
 
 
 class OrderQueue:
@@ -29,33 +52,140 @@ class OrderQueue:
 
     Claimed orders are never automatically replayed: after a crash their
     physical side effects are unknown and require an operator decision.
+
+    Up to ``pool_size`` connections are kept open and shared between threads,
+    one transaction at a time, so their pragmas and prepared statements are
+    set up once. ``synchronous`` is SQLite's durability level; the WAL is
+    checkpointed every ``checkpoint_pages`` pages (``0`` leaves it to
+    ``checkpoint``) and truncated by ``close``, which releases every file
+    handle so the database can be moved or deleted.
     """
 
-    def __init__(self, path: str):
+    def __init__(
+        self,
+        path: str,
+        *,
+        pool_size: int = 4,
+        synchronous: str = "FULL",
+        checkpoint_pages: int = 1000,
+    ):
         self.path = str(Path(path).expanduser())
+        self.synchronous = str(synchronous).strip().upper()
+        if self.synchronous not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"synchronous must be one of {', '.join(SYNCHRONOUS_LEVELS)}")
+        self.checkpoint_pages = max(0, int(checkpoint_pages))
         Path(self.path).parent.mkdir(parents=True, exist_ok=True)
         self._init_lock = threading.Lock()
+        # Bumped after every committed change that can make an order claimable.
+        self._changed = threading.Condition()
+        self._generation = 0
+        self._slots = threading.BoundedSemaphore(max(1, int(pool_size)))
+        self._pool_lock = threading.Lock()
+        self._idle: List[sqlite3.Connection] = []
+        self._closed = False
+        # One connection per queue that waiting claims read ``data_version`` on.
+        self._watch_lock = threading.Lock()
+        self._watcher: Optional[sqlite3.Connection] = None
         self._initialize()
 
     def _connect(self) -> sqlite3.Connection:
-        connection = sqlite3.connect(self.path, timeout=5.0)
+        connection = sqlite3.connect(
+            self.path, timeout=5.0, check_same_thread=False, cached_statements=64
+        )
         connection.row_factory = sqlite3.Row
-        connection.execute("PRAGMA journal_mode=WAL")
         connection.execute("PRAGMA busy_timeout=5000")
+        connection.execute(f"PRAGMA synchronous={self.synchronous}")
+        connection.execute(f"PRAGMA wal_autocheckpoint={self.checkpoint_pages}")
         return connection
 
+    def _acquire(self) -> sqlite3.Connection:
+        self._slots.acquire()
+        try:
+            with self._pool_lock:
+                if self._closed:
+                    raise RuntimeError(f"order queue is closed: {self.path}")
+                if self._idle:
+                    return self._idle.pop()
+            return self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, connection: sqlite3.Connection, reusable: bool) -> None:
+        with self._pool_lock:
+            reusable = reusable and not self._closed
+            if reusable:
+                self._idle.append(connection)
+        if not reusable:
+            connection.close()
+        self._slots.release()
+
     @contextmanager
-    def _connection(self) -> Iterator[sqlite3.Connection]:
-        """Commit or roll back the transaction, then release the file handle."""
-        connection = self._connect()
+    def _connection(self, *, notify: bool = False) -> Iterator[sqlite3.Connection]:
+        """Commit or roll back the transaction, then return the connection to the pool.
+
+        With ``notify`` a committed transaction wakes claims waiting in this process.
+        """
+        connection = self._acquire()
+        reusable = False
         try:
             with connection:
                 yield connection
+            reusable = True
+        except BaseException as exc:
+            # Other errors were rolled back by ``with connection``; a database
+            # error may have left the connection itself unusable.
+            reusable = not isinstance(exc, sqlite3.Error)
+            raise
         finally:
+            self._release(connection, reusable)
+        if notify:
+            with self._changed:
+                self._generation += 1
+                self._changed.notify_all()
+
+    def checkpoint(self, mode: str = "PASSIVE") -> None:
+        """Copy the WAL back into the database; ``TRUNCATE`` also empties the WAL file."""
+        mode = mode.strip().upper()
+        if mode not in {"PASSIVE", "FULL", "RESTART", "TRUNCATE"}:
+            raise ValueError(f"unknown checkpoint mode: {mode}")
+        with self._connection() as connection:
+            connection.execute(f"PRAGMA wal_checkpoint({mode})")
+
+    def close(self) -> None:
+        """Checkpoint the WAL and close every pooled connection.
+
+        Connections in use are closed as their transaction ends; waiting
+        claims return ``None`` and later calls raise ``RuntimeError``.
+        """
+        if self._closed:
+            return
+        try:
+            self.checkpoint("TRUNCATE")
+        except sqlite3.Error:
+            pass
+        with self._pool_lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        with self._changed:
+            self._changed.notify_all()
+        with self._watch_lock:
+            if self._watcher is not None:
+                idle.append(self._watcher)
+                self._watcher = None
+        for connection in idle:
             connection.close()
 
+    def __enter__(self) -> "OrderQueue":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def _initialize(self) -> None:
         with self._init_lock, self._connection() as connection:
+            # Persistent in the database file, so set once rather than per connection.
+            connection.execute("PRAGMA journal_mode=WAL")
             connection.execute(
                 """
                 CREATE TABLE IF NOT EXISTS orders (
@@ -102,6 +232,13 @@ class OrderQueue:
                     "INSERT INTO orders SELECT * FROM orders_legacy"
                 )
                 connection.execute("DROP TABLE orders_legacy")
+            columns = {
+                str(row["name"]) for row in connection.execute("PRAGMA table_info(orders)")
+            }
+            # Correlation ID and monotonic stage stamps, for latency reports.
+            for column in ("correlation_id", "stamps"):
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE orders ADD COLUMN {column} TEXT")
             connection.execute(
                 "CREATE INDEX IF NOT EXISTS idx_orders_status_created "
                 "ON orders(status, created_at)"
@@ -124,13 +261,18 @@ class OrderQueue:
         items: Sequence[Dict[str, Any]],
         *,
         idempotency_key: Optional[str] = None,
+        correlation_id: Optional[str] = None,
     ) -> Tuple[str, bool, str]:
         normalized = self._validate_items(items)
         order_id = str(idempotency_key or uuid.uuid4()).strip()
         if not order_id or len(order_id) > 200:
             raise ValueError("invalid order id")
+        correlation = str(correlation_id or "").strip() or order_id
+        if len(correlation) > 200:
+            raise ValueError("invalid correlation id")
+        stamps = json.dumps({"enqueued": time.monotonic()}, separators=(",", ":"))
         payload = json.dumps(normalized, ensure_ascii=False, separators=(",", ":"))
-        with self._connection() as connection:
+        with self._connection(notify=True) as connection:
             connection.execute("BEGIN IMMEDIATE")
             existing = connection.execute(
                 "SELECT payload, status FROM orders WHERE order_id = ?", (order_id,)
@@ -141,8 +283,9 @@ class OrderQueue:
                 return order_id, False, str(existing["status"])
             cursor = connection.execute(
                 "INSERT INTO orders "
-                "(order_id, payload, status, created_at) VALUES (?, ?, 'queued', ?)",
-                (order_id, payload, _now()),
+                "(order_id, payload, status, created_at, correlation_id, stamps) "
+                "VALUES (?, ?, 'queued', ?, ?, ?)",
+                (order_id, payload, _now(), correlation, stamps),
             )
             created = cursor.rowcount == 1
             row = connection.execute(
@@ -150,7 +293,47 @@ class OrderQueue:
             ).fetchone()
         return order_id, created, str(row["status"])
 
-    def claim_next(self) -> Optional[QueuedOrder]:
+    def claim_next(self, wait: float = 0.0) -> Optional[QueuedOrder]:
+        """Claim the oldest queued order, waiting up to ``wait`` seconds for one.
+
+        Waiting takes no write lock: commits from this process wake the waiter
+        at once, and commits from other processes are noticed through SQLite's
+        ``data_version`` within ``_CROSS_PROCESS_CHECK_SEC``.
+        """
+        deadline = time.monotonic() + max(0.0, float(wait))
+        waiting = wait > 0
+        while True:
+            with self._changed:
+                generation = self._generation
+            version = self._data_version() if waiting else None
+            if waiting and version is None:
+                return None
+            order = self._claim_once()
+            if order is not None or not waiting:
+                return order
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                with self._changed:
+                    if self._generation == generation and not self._closed:
+                        self._changed.wait(min(remaining, _CROSS_PROCESS_CHECK_SEC))
+                    if self._closed:
+                        return None
+                    woken = self._generation != generation
+                if woken or self._data_version() != version:
+                    break
+
+    def _data_version(self) -> Optional[int]:
+        """``PRAGMA data_version`` on the watcher connection, or ``None`` once closed."""
+        with self._watch_lock:
+            if self._closed:
+                return None
+            if self._watcher is None:
+                self._watcher = self._connect()
+            return int(self._watcher.execute("PRAGMA data_version").fetchone()[0])
+
+    def _claim_once(self) -> Optional[QueuedOrder]:
         with self._connection() as connection:
             connection.execute("BEGIN IMMEDIATE")
             in_flight = connection.execute(
@@ -161,23 +344,53 @@ class OrderQueue:
                 connection.commit()
                 return None
             row = connection.execute(
-                "SELECT order_id, payload, attempts FROM orders "
+                "SELECT order_id, payload, attempts, correlation_id, stamps FROM orders "
                 "WHERE status = 'queued' ORDER BY created_at, rowid LIMIT 1"
             ).fetchone()
             if row is None:
                 connection.commit()
                 return None
+            stamps = self._stamps(row["stamps"])
+            stamps["claimed"] = time.monotonic()
             updated = connection.execute(
-                "UPDATE orders SET status = 'claimed', claimed_at = ?, attempts = attempts + 1 "
-                "WHERE order_id = ? AND status = 'queued'",
-                (_now(), row["order_id"]),
+                "UPDATE orders SET status = 'claimed', claimed_at = ?, attempts = attempts + 1, "
+                "stamps = ? WHERE order_id = ? AND status = 'queued'",
+                (_now(), json.dumps(stamps, separators=(",", ":")), row["order_id"]),
             )
             if updated.rowcount != 1:
                 connection.rollback()
                 return None
             connection.commit()
         items = tuple(json.loads(row["payload"]))
-        return QueuedOrder(str(row["order_id"]), items, int(row["attempts"]) + 1, "claimed")
+        return QueuedOrder(
+            str(row["order_id"]),
+            items,
+            int(row["attempts"]) + 1,
+            "claimed",
+            str(row["correlation_id"] or row["order_id"]),
+        )
+
+    def release_claim(self, order_id: str) -> bool:
+        """Return a claim whose delivery failed to the queue, as if never claimed.
+
+        Only an order still ``claimed`` is released: once the client reported
+        a result, or an operator resolved it, the claim is left alone.
+        """
+        with self._connection(notify=True) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            updated = connection.execute(
+                "UPDATE orders SET status = 'queued', claimed_at = NULL, "
+                "attempts = MAX(0, attempts - 1) WHERE order_id = ? AND status = 'claimed'",
+                (order_id,),
+            )
+        return updated.rowcount == 1
+
+    @staticmethod
+    def _stamps(raw: Optional[str]) -> Dict[str, float]:
+        try:
+            return stage_stamps(json.loads(raw)) if raw else {}
+        except ValueError:
+            return {}
 
     def complete(self, order_id: str, result: Dict[str, Any]) -> str:
         if bool(result.get("requires_manual_review")):
@@ -187,10 +400,10 @@ class OrderQueue:
         else:
             destination = "succeeded" if bool(result.get("success")) else "failed"
         encoded = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
-        with self._connection() as connection:
+        with self._connection(notify=True) as connection:
             connection.execute("BEGIN IMMEDIATE")
             row = connection.execute(
-                "SELECT status FROM orders WHERE order_id = ?", (order_id,)
+                "SELECT status, stamps FROM orders WHERE order_id = ?", (order_id,)
             ).fetchone()
             if row is None:
                 raise KeyError(order_id)
@@ -199,10 +412,13 @@ class OrderQueue:
                 return current
             if current != "claimed":
                 raise ValueError(f"order is not claimed: {order_id}")
+            # The client reports its own stages; the hub's are never overwritten.
+            stamps = {**stage_stamps(result.get("stamps")), **self._stamps(row["stamps"])}
+            stamps["completed"] = time.monotonic()
             connection.execute(
-                "UPDATE orders SET status = ?, completed_at = ?, result = ? "
+                "UPDATE orders SET status = ?, completed_at = ?, result = ?, stamps = ? "
                 "WHERE order_id = ?",
-                (destination, _now(), encoded, order_id),
+                (destination, _now(), encoded, json.dumps(stamps, separators=(",", ":")), order_id),
             )
         return destination
 
@@ -223,11 +439,30 @@ class OrderQueue:
             ).fetchall()
         return [dict(row) for row in rows]
 
+    def stage_history(self, limit: int = 500) -> List[Dict[str, Any]]:
+        """Correlation ID and stage stamps of the most recently completed orders."""
+        safe_limit = max(1, min(int(limit), 10000))
+        with self._connection() as connection:
+            rows = connection.execute(
+                "SELECT order_id, correlation_id, status, stamps FROM orders "
+                "WHERE completed_at IS NOT NULL ORDER BY completed_at DESC LIMIT ?",
+                (safe_limit,),
+            ).fetchall()
+        return [
+            {
+                "order_id": str(row["order_id"]),
+                "correlation_id": str(row["correlation_id"] or row["order_id"]),
+                "status": str(row["status"]),
+                "stamps": self._stamps(row["stamps"]),
+            }
+            for row in rows
+        ]
+
     def resolve_uncertain(self, order_id: str, resolution: str) -> str:
         """Resolve an order only after the physical kiosk state was checked."""
         if resolution not in {"succeeded", "failed", "requeue"}:
             raise ValueError("resolution must be succeeded, failed, or requeue")
-        with self._connection() as connection:
+        with self._connection(notify=True) as connection:
             connection.execute("BEGIN IMMEDIATE")
             row = connection.execute(
                 "SELECT status FROM orders WHERE order_id = ?", (order_id,)
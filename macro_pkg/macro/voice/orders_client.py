@@ -18,11 +18,14 @@ class OrdersClient:
         macro: OrderMacro,
         on_server_stop: Optional[Callable[[], None]] = None,
         http: Any = None,
+        utterances: Any = None,
     ):
         self.cfg = cfg
         self.macro = macro
         self.on_server_stop = on_server_stop
         self._http_client = http
+        # UtteranceLog of the audio client, to stamp when the customer stopped speaking.
+        self.utterances = utterances
         self.thread: Optional[threading.Thread] = None
         self.running = False
         self.overlay = None
@@ -58,6 +61,19 @@ class OrdersClient:
     def _extract_items(self, payload: Any) -> Optional[list]:
         return self._extract_delivery(payload)[1]
 
+    def _correlate(self, payload: Any, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach the delivery's correlation ID and the utterance-end stamp to ``result``."""
+        correlation = (
+            str(payload.get("correlation_id", "") or "").strip() if isinstance(payload, dict) else ""
+        )
+        if not correlation:
+            return result
+        stamps = dict(result.get("stamps") or {})
+        ended = self.utterances.ended_at(correlation) if self.utterances is not None else None
+        if ended is not None:
+            stamps["utterance_end"] = ended
+        return {**result, "correlation_id": correlation, "stamps": stamps}
+
     def _report_result(self, order_id: str, result: Dict[str, Any]) -> bool:
         url = f"{self.cfg.orders_url.rstrip('/')}/{quote(order_id, safe='')}/result"
         retries = max(1, int(getattr(self.cfg, "order_result_retries", 3)))
@@ -91,15 +107,28 @@ class OrdersClient:
         except Exception:
             pass
 
+    def _claim(self, wait: float) -> Any:
+        """Ask the hub for the next order, letting it hold the request ``wait`` seconds."""
+        if not wait:
+            return self._http().get(self.cfg.orders_url, headers=self._headers(), timeout=2)
+        return self._http().get(
+            self.cfg.orders_url,
+            params={"wait": f"{wait:g}"},
+            headers=self._headers(),
+            timeout=wait + 2,
+        )
+
     def _tick(self) -> None:
         while self.running:
             try:
-                response = self._http().get(
-                    self.cfg.orders_url, headers=self._headers(), timeout=2
-                )
+                wait = max(0.0, float(getattr(self.cfg, "orders_wait_sec", 0.0)))
+                started = time.monotonic()
+                response = self._claim(wait)
                 if response.status_code == 204:
                     self._poll_mic_pulse()
-                    time.sleep(self.cfg.orders_poll_interval_sec)
+                    # Pace the retry unless the hub already held the request.
+                    if time.monotonic() - started < max(wait, self.cfg.orders_poll_interval_sec):
+                        time.sleep(self.cfg.orders_poll_interval_sec)
                     continue
                 response.raise_for_status()
                 payload = response.json()
@@ -116,6 +145,7 @@ class OrdersClient:
                         }
                     finally:
                         self._set_processing(False)
+                    result = self._correlate(payload, result)
                     if order_id and not self._report_result(order_id, result):
                         print(
                             "[STOP] 결과 ACK를 확인할 수 없어 중복 실행 방지를 위해 "
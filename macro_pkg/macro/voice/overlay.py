@@ -41,12 +41,12 @@ import time
 import numpy as np
 
 from .config import Config
-from .index_loader import MenuIndex
 from .navigator import Navigator
 from .macro import OrderMacro
 from .audio import AudioStreamer
 from .audio_ws import AudioWSClient
 from .orders_client import OrdersClient
+from .profile_bundle import ProfileStore
 
 
 class MicOverlay:
@@ -84,10 +84,19 @@ class MicOverlay:
 
         # pipeline
         try:
-            self.index = MenuIndex(self.cfg.ui_coords_path, self.cfg.menu_cards_path)
-            self.nav = Navigator(self.index, self.cfg)
+            self.profiles = ProfileStore.from_config(self.cfg)
+            bundle = self.profiles.load()
+            self.index = bundle.index
+            self.nav = Navigator(
+                self.index,
+                self.cfg,
+                profile=bundle.profile,
+                profiles=self.profiles if getattr(self.cfg, "profile_reload", True) else None,
+            )
             self.macro = OrderMacro(self.nav)
             print("[INIT] 메뉴 인덱스 로드 성공")
+            if getattr(self.cfg, "ocr_warmup", False) and self.nav.warm_up_ocr():
+                print("[INIT] OCR 모델 백그라운드 워밍업 시작")
         except Exception as e:
             print(f"[ERR] 메뉴 인덱스 로드 실패: {e}")
             self.index = None
@@ -98,7 +107,12 @@ class MicOverlay:
         self.audio = AudioStreamer(self.cfg, self.frame_q)
         # 주문 실행은 OrdersClient 한 경로로 제한한다. WebSocket은 음성/TTS만 처리한다.
         self.ws = AudioWSClient(self.cfg, self.frame_q, on_server_stop=self.stop_from_server)
-        self.orders = OrdersClient(self.cfg, self.macro, on_server_stop=self.stop_from_server)
+        self.orders = OrdersClient(
+            self.cfg,
+            self.macro,
+            on_server_stop=self.stop_from_server,
+            utterances=self.ws.utterances,
+        )
         
         # 주문 처리 중 마이크 종료 방지
         self.processing_order = False
@@ -588,3 +602,8 @@ class MicOverlay:
             except: pass
             try: self.orders.stop()
             except: pass
+            try:
+                if self.nav is not None:
+                    self.nav.close()
+            except Exception as e:
+                print(f"[ERR] 화면 관찰 종료 오류: {e}")
@@ -3,9 +3,18 @@ from __future__ import annotations
 import hashlib
 import platform
 import re
+import threading
 import time
-from dataclasses import dataclass, field
-from typing import Any, Iterable, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .spatial import GridIndex
+from .tracing import NULL_TRACER
+
+# Two readings of one text closer than this on both axes are the same control.
+SAME_CONTROL_PX = 20
+# Cell size of the per-observation grid over normalized element centers.
+_GRID_CELL = 1 / 16
 
 
 @dataclass(frozen=True)
@@ -36,8 +45,15 @@ class ObservedElement:
     native: Any = field(default=None, compare=False, repr=False)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ScreenObservation:
+    """One immutable reading of the kiosk window.
+
+    Normalized texts and centers, the spatial and text indexes, and the
+    signature are derived once, on first use, and memoized in ``_derived``; every consumer
+    of the same observation shares them.
+    """
+
     elements: Tuple[ObservedElement, ...]
     width: int
     height: int
@@ -45,50 +61,321 @@ class ScreenObservation:
     origin_x: int = 0
     origin_y: int = 0
     captured_at: float = field(default_factory=time.monotonic)
+    # Normalized (left, top, right, bottom) hint for a region-scoped observation.
+    region: Optional[Tuple[float, float, float, float]] = None
+    # Seconds spent per provider ("uia", "ocr") and in total.
+    timings: Dict[str, float] = field(default_factory=dict, compare=False, repr=False)
+    _derived: Dict[Any, Any] = field(
+        default_factory=dict, init=False, compare=False, repr=False
+    )
+
+    @property
+    def normalized_texts(self) -> Tuple[str, ...]:
+        """``_normalize(element.text)`` for every element, in element order."""
+        value = self._derived.get("normalized_texts")
+        if value is None:
+            value = self._derived["normalized_texts"] = tuple(
+                _normalize(element.text) for element in self.elements
+            )
+        return value
+
+    @property
+    def normalized_centers(self) -> Tuple[Tuple[float, float], ...]:
+        """Element centers as fractions of the window, in element order."""
+        value = self._derived.get("normalized_centers")
+        if value is None:
+            width, height = max(1, self.width), max(1, self.height)
+            value = self._derived["normalized_centers"] = tuple(
+                (
+                    (element.rect.center[0] - self.origin_x) / width,
+                    (element.rect.center[1] - self.origin_y) / height,
+                )
+                for element in self.elements
+            )
+        return value
+
+    @property
+    def visible_texts(self) -> Tuple[str, ...]:
+        """Distinct non-empty normalized texts, for substring and marker checks."""
+        value = self._derived.get("visible_texts")
+        if value is None:
+            value = self._derived["visible_texts"] = tuple(
+                dict.fromkeys(text for text in self.normalized_texts if text)
+            )
+        return value
+
+    @property
+    def spatial_index(self) -> GridIndex:
+        """Grid over ``normalized_centers``; positions are element positions."""
+        value = self._derived.get("spatial_index")
+        if value is None:
+            value = self._derived["spatial_index"] = GridIndex.build(
+                self.normalized_centers, _GRID_CELL
+            )
+        return value
+
+    def positions_in(
+        self, region: Optional[Tuple[float, float, float, float]]
+    ) -> Tuple[int, ...]:
+        """Element positions whose normalized centers fall inside ``region``."""
+        if region is None:
+            return tuple(range(len(self.elements)))
+        key = ("positions_in", region)
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived[key] = tuple(self.spatial_index.within(*region))
+        return value
+
+    def text_index(
+        self, region: Optional[Tuple[float, float, float, float]] = None
+    ) -> Any:
+        """Shared ``ObservationIndex`` over all texts, or those inside ``region``."""
+        key = ("text_index", region)
+        value = self._derived.get(key)
+        if value is None:
+            from .text_index import ObservationIndex
+
+            texts = self.normalized_texts
+            if region is not None:
+                inside = set(self.positions_in(region))
+                texts = tuple(
+                    text if position in inside else "" for position, text in enumerate(texts)
+                )
+            value = self._derived[key] = ObservationIndex(texts)
+        return value
 
     @property
     def signature(self) -> str:
-        rows = sorted(
-            (
-                _normalize(element.text),
-                element.role.casefold(),
-                round((element.rect.left - self.origin_x) / max(1, self.width), 3),
-                round((element.rect.top - self.origin_y) / max(1, self.height), 3),
-                element.selected,
-                element.automation_id,
+        value = self._derived.get("signature")
+        if value is None:
+            rows = sorted(
+                (
+                    normalized,
+                    element.role.casefold(),
+                    round((element.rect.left - self.origin_x) / max(1, self.width), 3),
+                    round((element.rect.top - self.origin_y) / max(1, self.height), 3),
+                    element.selected,
+                    element.automation_id,
+                )
+                for element, normalized in zip(self.elements, self.normalized_texts)
+                if normalized
             )
-            for element in self.elements
-            if _normalize(element.text)
-        )
-        return hashlib.sha256(repr((rows, self.visual_hash)).encode("utf-8")).hexdigest()
+            value = self._derived["signature"] = hashlib.sha256(
+                repr((rows, self.visual_hash, self.region)).encode("utf-8")
+            ).hexdigest()
+        return value
 
     @property
     def texts(self) -> Tuple[str, ...]:
-        return tuple(element.text for element in self.elements if element.text.strip())
+        value = self._derived.get("texts")
+        if value is None:
+            value = self._derived["texts"] = tuple(
+                element.text for element in self.elements if element.text.strip()
+            )
+        return value
 
 
 def _normalize(value: str) -> str:
     return "".join(str(value or "").split()).casefold()
 
 
+def same_control(first: ObservedElement, second: ObservedElement) -> bool:
+    """Whether two readings show the same text at (nearly) the same place."""
+    return (
+        _normalize(first.text) == _normalize(second.text)
+        and abs(first.rect.center[0] - second.rect.center[0]) < SAME_CONTROL_PX
+        and abs(first.rect.center[1] - second.rect.center[1]) < SAME_CONTROL_PX
+    )
+
+
+def _overlaps(first: Rect, second: Rect) -> bool:
+    return (
+        first.left < second.right
+        and second.left < first.right
+        and first.top < second.bottom
+        and second.top < first.bottom
+    )
+
+
+def absolute_region(
+    region: Tuple[float, float, float, float],
+    frame: dict,
+    margin: int = 0,
+) -> Rect:
+    """Convert a normalized region to screen pixels inside ``frame``."""
+    left, top, right, bottom = region
+    width, height = int(frame["width"]), int(frame["height"])
+    origin_x, origin_y = int(frame["left"]), int(frame["top"])
+    return Rect(
+        origin_x + max(0, int(left * width) - margin),
+        origin_y + max(0, int(top * height) - margin),
+        origin_x + min(width, int(right * width + 0.999) + margin),
+        origin_y + min(height, int(bottom * height + 0.999) + margin),
+    )
+
+
+def in_region(
+    element: ObservedElement,
+    region: Tuple[float, float, float, float],
+    width: int,
+    height: int,
+    origin_x: int = 0,
+    origin_y: int = 0,
+) -> bool:
+    """Apply the center-inside test ``ground_target`` uses for ``Target.region``."""
+    left, top, right, bottom = region
+    center_x, center_y = element.rect.center
+    normalized_x = (center_x - origin_x) / max(1, width)
+    normalized_y = (center_y - origin_y) / max(1, height)
+    return left <= normalized_x <= right and top <= normalized_y <= bottom
+
+
+RuntimeId = Tuple[int, ...]
+
+_TREE_SCOPE_ELEMENT = 1
+_TREE_SCOPE_CHILDREN = 2
+_TREE_SCOPE_SUBTREE = 7
+# UIA property IDs whose changes can alter an ObservedElement.
+_TRACKED_PROPERTY_IDS = (
+    30001,  # BoundingRectangle
+    30005,  # Name
+    30010,  # IsEnabled
+    30022,  # IsOffscreen
+    30079,  # SelectionItemIsSelected
+)
+
+
+_SELECTION_ITEM_IS_SELECTED = 30079
+_BATCH_PROPERTY_IDS = (
+    30000,  # RuntimeId
+    30001,  # BoundingRectangle
+    30003,  # ControlType
+    30005,  # Name
+    30010,  # IsEnabled
+    30011,  # AutomationId
+    30022,  # IsOffscreen
+    _SELECTION_ITEM_IS_SELECTED,
+)
+# Names match uiautomation's ControlTypeName so profiles see one vocabulary.
+_CONTROL_TYPE_NAMES = {
+    50000 + index: f"{name}Control"
+    for index, name in enumerate(
+        (
+            "Button", "Calendar", "CheckBox", "ComboBox", "Edit", "Hyperlink",
+            "Image", "ListItem", "List", "Menu", "MenuBar", "MenuItem",
+            "ProgressBar", "RadioButton", "ScrollBar", "Slider", "Spinner",
+            "StatusBar", "Tab", "TabItem", "Text", "ToolBar", "ToolTip", "Tree",
+            "TreeItem", "Custom", "Group", "Thumb", "DataGrid", "DataItem",
+            "Document", "SplitButton", "Window", "Pane", "Header", "HeaderItem",
+            "Table", "TitleBar", "Separator", "SemanticZoom", "AppBar",
+        )
+    )
+}
+_SELECTABLE_ROLES = frozenset({"RadioButtonControl", "ListItemControl", "TabItemControl"})
+
+
+def _batch_scope(max_depth: int) -> int:
+    """Narrowest UIA ``TreeScope`` that still covers ``max_depth`` levels."""
+    if max_depth <= 0:
+        return _TREE_SCOPE_ELEMENT
+    if max_depth == 1:
+        return _TREE_SCOPE_ELEMENT | _TREE_SCOPE_CHILDREN
+    return _TREE_SCOPE_SUBTREE
+
+
+class _BatchedControl:
+    """Wrap a cached UIA element only when it is actually invoked."""
+
+    def __init__(self, automation: Any, element: Any):
+        self._automation = automation
+        self._element = element
+
+    def GetInvokePattern(self) -> Any:
+        control = self._automation.Control.CreateControlFromElement(self._element)
+        return control.GetInvokePattern()
+
+
+@dataclass
+class _CachedControl:
+    """One control from the previous UIA walk, keyed by its runtime ID."""
+
+    role: str
+    automation_id: str
+    rect: Optional[Rect]
+    element: Optional[ObservedElement]
+    depth: int
+    parent: Optional[RuntimeId]
+    child_count: int = 0
+    children: List[RuntimeId] = field(default_factory=list)
+    cacheable: bool = True
+
+
+class OCRCancelled(RuntimeError):
+    """A speculative OCR pass was abandoned before it finished."""
+
+
 class UIAutomationProvider:
     """Read and invoke controls exposed by Windows UI Automation.
 
     The import stays lazy so deterministic tests and OCR-only operation remain
     platform independent.
+
+    Walk results are cached by runtime ID. Control type and AutomationId never
+    change for one runtime ID, so they are read once. Whole subtrees are reused
+    only while UIA change events are subscribed, no event has marked them dirty,
+    their rectangle and child count still match, and the cache is younger than
+    ``cache_max_age_sec``. Without change events every observation re-reads the
+    mutable properties of every control.
+
+    With ``batch_properties`` every property the observation needs is declared
+    in one UIA cache request, the bounded subtree is fetched in a single round
+    trip, and elements are materialized from the cached values. The batched
+    result is reused under the same conditions as a cached subtree, so a clean
+    window costs no round trip at all.
+
+    ``observe(region)`` skips every subtree whose bounding rectangle lies
+    outside ``region``; such walks never make cached subtrees reusable.
     """
 
-    def __init__(self, window_title: str = "", max_depth: int = 10):
+    def __init__(
+        self,
+        window_title: str = "",
+        max_depth: int = 10,
+        *,
+        tree_cache: bool = True,
+        cache_max_age_sec: float = 2.0,
+        batch_properties: bool = True,
+    ):
         self.window_title = window_title.strip()
         self.max_depth = max_depth
         self.window_handle: Optional[int] = None
         self.last_root_rect: Optional[Rect] = None
+        self.tree_cache = tree_cache
+        self.cache_max_age_sec = cache_max_age_sec
+        self.change_events_active = False
+        self.last_walk_stats: Dict[str, int] = {}
+        self._cache: Dict[RuntimeId, _CachedControl] = {}
+        self._cache_built_at = 0.0
+        self._changes_lock = threading.Lock()
+        self._changed = threading.Condition(self._changes_lock)
+        self.change_sequence = 0
+        self._dirty: Set[RuntimeId] = set()
+        self._all_dirty = True
+        self._events_handle: Optional[int] = None
+        self._event_handler: Any = None
+        self._event_root: Any = None
+        self.batch_properties = batch_properties
+        self._batch_request: Any = None
+        self._batched: Optional[List[ObservedElement]] = None
 
     def bind_window(self, window_handle: Any) -> None:
         try:
-            self.window_handle = int(window_handle)
+            handle = int(window_handle)
         except (TypeError, ValueError) as exc:
             raise RuntimeError("invalid target window handle") from exc
+        if handle != self.window_handle:
+            self.invalidate()
+        self.window_handle = handle
 
     def _root(self, automation: Any) -> Any:
         if self.window_handle is not None:
@@ -145,32 +432,246 @@ class UIAutomationProvider:
             and root_rect.top <= center_y <= root_rect.bottom
         )
 
-    def observe(self) -> List[ObservedElement]:
+    @staticmethod
+    def _runtime_id(control: Any) -> Optional[RuntimeId]:
+        try:
+            value = tuple(int(part) for part in control.GetRuntimeId() or ())
+        except Exception:
+            return None
+        return value or None
+
+    def invalidate(self) -> None:
+        """Force the next observation to re-read the whole tree."""
+        with self._changes_lock:
+            self._all_dirty = True
+            self._dirty.clear()
+
+    def mark_changed(self, runtime_id: Optional[Sequence[int]]) -> None:
+        """Record a UIA structure/property change reported for one control."""
+        try:
+            key = tuple(int(part) for part in runtime_id or ())
+        except (TypeError, ValueError):
+            key = ()
+        with self._changed:
+            if key:
+                self._dirty.add(key)
+            else:
+                self._all_dirty = True
+            self.change_sequence += 1
+            self._changed.notify_all()
+
+    def wait_for_change(self, sequence: int, timeout: float) -> bool:
+        """Block until a change event arrives after ``sequence`` or ``timeout`` passes."""
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self.change_sequence != sequence, timeout=max(0.0, timeout)
+            )
+
+    def _register_change_events(self, automation: Any, root: Any) -> bool:
+        """Subscribe to changes under the bound window; ``False`` keeps full walks."""
+        try:
+            import ctypes
+
+            import comtypes  # type: ignore
+
+            client = automation._AutomationClient.instance()
+            core = client.UIAutomationCore
+            provider = self
+
+            def sender_id(sender: Any) -> Optional[RuntimeId]:
+                try:
+                    return tuple(int(part) for part in sender.GetRuntimeId() or ())
+                except Exception:
+                    return None
+
+            class _ChangeHandler(comtypes.COMObject):  # type: ignore[misc]
+                _com_interfaces_ = [
+                    core.IUIAutomationStructureChangedEventHandler,
+                    core.IUIAutomationPropertyChangedEventHandler,
+                ]
+
+                def HandleStructureChangedEvent(self, sender, change_type, runtime_id):
+                    provider.mark_changed(sender_id(sender))
+                    return 0
+
+                def HandlePropertyChangedEvent(self, sender, property_id, new_value):
+                    provider.mark_changed(sender_id(sender))
+                    return 0
+
+            handler = _ChangeHandler()
+            properties = (ctypes.c_int * len(_TRACKED_PROPERTY_IDS))(*_TRACKED_PROPERTY_IDS)
+            client.IUIAutomation.AddStructureChangedEventHandler(
+                root.Element, _TREE_SCOPE_SUBTREE, None, handler
+            )
+            client.IUIAutomation.AddPropertyChangedEventHandlerNativeArray(
+                root.Element,
+                _TREE_SCOPE_SUBTREE,
+                None,
+                handler,
+                properties,
+                len(_TRACKED_PROPERTY_IDS),
+            )
+        except Exception:
+            return False
+        self._event_handler = handler
+        self._event_root = root.Element
+        return True
+
+    def _unregister_change_events(self, automation: Any) -> None:
+        """Drop the handler registered for the previously bound window."""
+        handler, element = self._event_handler, self._event_root
+        self._event_handler = self._event_root = None
+        self.change_events_active = False
+        if handler is None:
+            return
+        try:
+            client = automation._AutomationClient.instance()
+            client.IUIAutomation.RemoveStructureChangedEventHandler(element, handler)
+            client.IUIAutomation.RemovePropertyChangedEventHandler(element, handler)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        if self._event_handler is None:
+            return
+        import uiautomation as automation  # type: ignore
+
+        self._unregister_change_events(automation)
+        self._events_handle = None
+
+    def _expand_dirty(self, dirty: Set[RuntimeId]) -> Optional[Set[RuntimeId]]:
+        """Add every cached ancestor so the walk can descend to changed controls."""
+        expanded: Set[RuntimeId] = set()
+        for key in dirty:
+            if key not in self._cache:
+                return None
+            current: Optional[RuntimeId] = key
+            while current is not None and current not in expanded:
+                expanded.add(current)
+                entry = self._cache.get(current)
+                current = entry.parent if entry is not None else None
+        return expanded
+
+    def _reusable(self, key: RuntimeId) -> bool:
+        pending = [key]
+        while pending:
+            entry = self._cache.get(pending.pop())
+            if entry is None or not entry.cacheable:
+                return False
+            pending.extend(entry.children)
+        return True
+
+    def _reuse_subtree(
+        self,
+        key: RuntimeId,
+        parent: Optional[RuntimeId],
+        fresh: Dict[RuntimeId, _CachedControl],
+        found: List[ObservedElement],
+    ) -> int:
+        # ``children`` is stored in visit order, so pushing it reversed keeps
+        # the element order identical to a full walk.
+        reused = 0
+        pending: List[Tuple[RuntimeId, Optional[RuntimeId]]] = [(key, parent)]
+        while pending:
+            current, current_parent = pending.pop()
+            entry = self._cache[current]
+            entry.parent = current_parent
+            fresh[current] = entry
+            reused += 1
+            if entry.element is not None and self._inside_root(
+                entry.element.rect, self.last_root_rect
+            ):
+                found.append(entry.element)
+            pending.extend((child, current) for child in reversed(entry.children))
+        return reused
+
+    def observe(self, region: Optional[Rect] = None) -> List[ObservedElement]:
         if platform.system() != "Windows":
             return []
         import uiautomation as automation  # type: ignore
 
         root = self._root(automation)
-        self.last_root_rect = self._rect(getattr(root, "BoundingRectangle", None))
+        if self.tree_cache and self._events_handle != self.window_handle:
+            # Events also feed ``change_sequence``, the cheap settle signal.
+            self._unregister_change_events(automation)
+            self.change_events_active = self._register_change_events(automation, root)
+            self._events_handle = self.window_handle
+            self.invalidate()
+        if self.batch_properties:
+            try:
+                request = self._cache_request(automation)
+            except Exception:
+                # Older UIA clients without cache requests keep the walk.
+                self.batch_properties = False
+            else:
+                return self.observe_batched(root, request, automation, region=region)
+        return self.observe_root(root, region=region)
+
+    def _cache_request(self, automation: Any) -> Any:
+        if self._batch_request is None:
+            client = automation._AutomationClient.instance()
+            request = client.IUIAutomation.CreateCacheRequest()
+            for property_id in _BATCH_PROPERTY_IDS:
+                request.AddProperty(property_id)
+            request.TreeScope = _batch_scope(self.max_depth)
+            self._batch_request = request
+        return self._batch_request
+
+    def observe_batched(
+        self,
+        root: Any,
+        request: Any,
+        automation: Any = None,
+        *,
+        region: Optional[Rect] = None,
+    ) -> List[ObservedElement]:
+        """Fetch the bounded subtree in one cache request and read it locally.
+
+        UIA cache requests have no depth limit: beyond one level the whole
+        subtree is fetched in the single round trip and ``max_depth`` only
+        bounds the local walk. Elements whose cached properties cannot be
+        read are skipped, as in ``observe_root``.
+
+        The round trip costs the same with or without ``region``, so the
+        whole window is always cached and ``region`` only filters that
+        result: full and region observations share one cache entry.
+        """
+        now = time.monotonic()
+        with self._changes_lock:
+            clean = not self._all_dirty and not self._dirty
+            self._dirty, self._all_dirty = set(), False
+        if (
+            clean
+            and self.tree_cache
+            and self.change_events_active
+            and self._batched is not None
+            and now - self._cache_built_at <= self.cache_max_age_sec
+        ):
+            found = self._in_region(self._batched, region)
+            self.last_walk_stats = {"read": 0, "reused": len(found), "probed": 0, "skipped": 0}
+            return found
+        cached_root = getattr(root, "Element", root).BuildUpdatedCache(request)
+        self.last_root_rect = self._rect(cached_root.CachedBoundingRectangle)
         found: List[ObservedElement] = []
-        stack: List[Tuple[Any, int]] = [(root, 0)]
+        stack: List[Tuple[Any, int]] = [(cached_root, 0)]
         while stack:
-            control, depth = stack.pop()
+            element, depth = stack.pop()
             try:
-                text = str(getattr(control, "Name", "") or "").strip()
-                role = str(getattr(control, "ControlTypeName", "") or "unknown")
-                rect = self._rect(getattr(control, "BoundingRectangle", None))
+                rect = self._rect(element.CachedBoundingRectangle)
+                text = str(element.CachedName or "").strip()
                 if (
                     text
                     and rect
-                    and self._visible_and_enabled(control)
+                    and not bool(element.CachedIsOffscreen)
+                    and bool(element.CachedIsEnabled)
                     and self._inside_root(rect, self.last_root_rect)
                 ):
+                    role = _CONTROL_TYPE_NAMES.get(int(element.CachedControlType), "unknown")
                     selected = None
-                    try:
-                        selected = bool(control.GetSelectionItemPattern().IsSelected)
-                    except Exception:
-                        pass
+                    if role in _SELECTABLE_ROLES:
+                        value = element.GetCachedPropertyValue(_SELECTION_ITEM_IS_SELECTED)
+                        # Controls without the pattern report UIA's "not supported" sentinel.
+                        selected = value if isinstance(value, bool) else None
                     found.append(
                         ObservedElement(
                             text=text,
@@ -178,15 +679,136 @@ class UIAutomationProvider:
                             role=role,
                             source="uia",
                             confidence=1.0,
-                            automation_id=str(getattr(control, "AutomationId", "") or ""),
+                            automation_id=str(element.CachedAutomationId or ""),
                             selected=selected,
-                            native=control,
+                            native=_BatchedControl(automation, element),
                         )
                     )
                 if depth < self.max_depth:
-                    stack.extend((child, depth + 1) for child in control.GetChildren())
+                    children = element.GetCachedChildren()
+                    count = int(getattr(children, "Length", 0) or 0) if children else 0
+                    stack.extend(
+                        (children.GetElement(index), depth + 1) for index in range(count)
+                    )
+            except Exception:
+                # A stale element fails alone, not the whole observation.
+                continue
+        if self.tree_cache:
+            self._batched = found
+            self._cache_built_at = now
+        self.last_walk_stats = {"read": len(found), "reused": 0, "probed": 0, "skipped": 0}
+        return self._in_region(found, region)
+
+    @staticmethod
+    def _in_region(
+        elements: List[ObservedElement], region: Optional[Rect]
+    ) -> List[ObservedElement]:
+        if region is None:
+            return list(elements)
+        return [element for element in elements if _overlaps(element.rect, region)]
+
+    def observe_root(self, root: Any, region: Optional[Rect] = None) -> List[ObservedElement]:
+        """Walk one UIA root, reusing cached subtrees that are known to be clean."""
+        self.last_root_rect = self._rect(getattr(root, "BoundingRectangle", None))
+        now = time.monotonic()
+        with self._changes_lock:
+            dirty, self._dirty = self._dirty, set()
+            all_dirty, self._all_dirty = self._all_dirty, False
+        expanded = None if all_dirty else self._expand_dirty(dirty)
+        reuse_subtrees = bool(
+            self.tree_cache
+            and self.change_events_active
+            and expanded is not None
+            and now - self._cache_built_at <= self.cache_max_age_sec
+        )
+        if not reuse_subtrees:
+            self._cache_built_at = now
+        previous = self._cache if self.tree_cache else {}
+        fresh: Dict[RuntimeId, _CachedControl] = {}
+        stats = {"read": 0, "reused": 0, "probed": 0, "skipped": 0}
+        found: List[ObservedElement] = []
+        stack: List[Tuple[Any, int, Optional[RuntimeId]]] = [(root, 0, None)]
+        while stack:
+            control, depth, parent = stack.pop()
+            parent_entry = fresh.get(parent) if parent is not None else None
+            try:
+                if depth and region is not None:
+                    bounds = self._rect(getattr(control, "BoundingRectangle", None))
+                    if bounds is not None and not _overlaps(bounds, region):
+                        stats["skipped"] += 1
+                        # The parent's cached children would miss this subtree.
+                        if parent_entry is not None:
+                            parent_entry.cacheable = False
+                        continue
+                key = self._runtime_id(control) if self.tree_cache else None
+                cached = previous.get(key) if key is not None else None
+                if (
+                    reuse_subtrees
+                    and cached is not None
+                    and cached.depth == depth
+                    and key not in (expanded or ())
+                    and self._reusable(key)
+                ):
+                    stats["probed"] += 1
+                    rect = self._rect(getattr(control, "BoundingRectangle", None))
+                    count = len(control.GetChildren()) if depth < self.max_depth else 0
+                    if rect == cached.rect and count == cached.child_count:
+                        stats["reused"] += self._reuse_subtree(key, parent, fresh, found)
+                        if parent_entry is not None:
+                            parent_entry.children.append(key)
+                        continue
+
+                stats["read"] += 1
+                text = str(getattr(control, "Name", "") or "").strip()
+                if cached is not None:
+                    role, automation_id = cached.role, cached.automation_id
+                else:
+                    role = str(getattr(control, "ControlTypeName", "") or "unknown")
+                    automation_id = str(getattr(control, "AutomationId", "") or "")
+                rect = self._rect(getattr(control, "BoundingRectangle", None))
+                element = None
+                if text and rect and self._visible_and_enabled(control):
+                    selected = None
+                    if role in _SELECTABLE_ROLES:
+                        try:
+                            selected = bool(control.GetSelectionItemPattern().IsSelected)
+                        except Exception:
+                            pass
+                    element = ObservedElement(
+                        text=text,
+                        rect=rect,
+                        role=role,
+                        source="uia",
+                        confidence=1.0,
+                        automation_id=automation_id,
+                        selected=selected,
+                        native=control,
+                    )
+                    if self._inside_root(rect, self.last_root_rect):
+                        found.append(element)
+                children = list(control.GetChildren()) if depth < self.max_depth else []
+                if key is not None:
+                    fresh[key] = _CachedControl(
+                        role,
+                        automation_id,
+                        rect,
+                        element,
+                        depth,
+                        parent,
+                        child_count=len(children),
+                    )
+                    if parent_entry is not None:
+                        parent_entry.children.append(key)
+                elif parent_entry is not None:
+                    parent_entry.cacheable = False
+                stack.extend((child, depth + 1, key) for child in children)
             except Exception:
+                if parent_entry is not None:
+                    parent_entry.cacheable = False
                 continue
+        if self.tree_cache:
+            self._cache = fresh
+        self.last_walk_stats = stats
         return found
 
     @staticmethod
@@ -203,69 +825,260 @@ class UIAutomationProvider:
 
 
 class OCRProvider:
-    """Capture the configured monitor and locate visible text with EasyOCR."""
+    """Capture the configured monitor and locate visible text with EasyOCR.
+
+    With ``tile_diff`` consecutive frames are compared tile by tile and only
+    the changed tiles, grown over the text they touch, are recognized again;
+    text from unchanged tiles is carried over from the previous frame. Every
+    recognized region is also looked up in a content-addressed result cache,
+    so screens that were seen before resolve without running the recognizer.
+
+    The EasyOCR reader is loaded lazily on the first fallback unless
+    ``start_warmup`` loads it and runs one dummy inference ahead of time.
+    """
 
     def __init__(
         self,
         monitor_index: int = 1,
         model_dir: str = "",
         allow_download: bool = False,
+        *,
+        tile_diff: bool = True,
+        tile_rows: int = 8,
+        tile_cols: int = 4,
+        capture: Any = None,
+        cache_entries: int = 256,
+        cache_path: str = "",
+        torch_threads: int = 0,
     ):
         self.monitor_index = monitor_index
+        self.capture = capture
+        self.result_cache: Any = None
+        if cache_entries > 0:
+            from .ocr_cache import OCRResultCache
+
+            self.result_cache = OCRResultCache(
+                cache_entries,
+                path=cache_path,
+                namespace=f"easyocr:ko,en:{model_dir}",
+            )
+        self.last_timings: Dict[str, float] = {}
         self.model_dir = model_dir
         self.allow_download = allow_download
+        self.torch_threads = max(0, int(torch_threads))
         self._reader: Any = None
+        self._reader_lock = threading.Lock()
+        self.warmup_state = "cold"
+        self.warmup_error: Optional[str] = None
+        self.warmup_timings: Dict[str, float] = {}
+        self.tiles: Any = None
+        if tile_diff:
+            from .ocr_tiles import TileChangeDetector
 
-    def _reader_instance(self) -> Any:
-        if self._reader is None:
-            import easyocr  # type: ignore
+            self.tiles = TileChangeDetector(tile_rows, tile_cols)
+        self.last_dirty_regions: Optional[List[Rect]] = None
+        self._previous: List[ObservedElement] = []
+        self.tracer: Any = NULL_TRACER
 
-            options = {"gpu": False, "download_enabled": self.allow_download}
-            if self.model_dir:
-                options["model_storage_directory"] = self.model_dir
-            self._reader = easyocr.Reader(["ko", "en"], **options)
-        return self._reader
+    def _create_reader(self) -> Any:
+        if self.torch_threads > 0:
+            try:
+                import torch  # type: ignore
 
-    def observe(
-        self, region: Optional[dict] = None
-    ) -> Tuple[List[ObservedElement], int, int, str, int, int]:
-        import mss  # type: ignore
+                # Keep OCR from starving the audio callback thread on small CPUs.
+                torch.set_num_threads(self.torch_threads)
+            except Exception:
+                pass
+        import easyocr  # type: ignore
+
+        options = {"gpu": False, "download_enabled": self.allow_download}
+        if self.model_dir:
+            options["model_storage_directory"] = self.model_dir
+        return easyocr.Reader(["ko", "en"], **options)
+
+    def _reader_instance(self) -> Any:
+        with self._reader_lock:
+            if self._reader is None:
+                started = time.perf_counter()
+                self._reader = self._create_reader()
+                self.warmup_timings["load"] = time.perf_counter() - started
+            return self._reader
+
+    @staticmethod
+    def _warmup_image() -> Any:
         import numpy as np  # type: ignore
 
-        with mss.mss() as capture:
-            if region is None:
-                if self.monitor_index >= len(capture.monitors):
-                    raise RuntimeError(f"monitor index is unavailable: {self.monitor_index}")
-                monitor = capture.monitors[self.monitor_index]
-            else:
-                monitor = region
-            shot = capture.grab(monitor)
-            image = np.asarray(shot)[:, :, :3]
-            sample = image[::32, ::32].mean(axis=2)
-            # Average-hash style fingerprint ignores minor color/noise changes
-            # while still detecting layout, modal, and selection transitions.
-            visual_hash = hashlib.sha256((sample > sample.mean()).tobytes()).hexdigest()
-        offset_x, offset_y = int(monitor["left"]), int(monitor["top"])
-        elements: List[ObservedElement] = []
+        return np.full((64, 256, 3), 255, dtype=np.uint8)
+
+    def warm_up(self) -> bool:
+        """Load the reader and run one dummy inference; never raises."""
+        self.warmup_state = "loading"
+        try:
+            reader = self._reader_instance()
+            started = time.perf_counter()
+            reader.readtext(self._warmup_image())
+            self.warmup_timings["first_inference"] = time.perf_counter() - started
+        except Exception as exc:
+            self.warmup_error = str(exc)
+            self.warmup_state = "failed"
+            return False
+        self.warmup_error = None
+        self.warmup_state = "ready"
+        return True
+
+    def start_warmup(self) -> threading.Thread:
+        """Warm the reader on a daemon thread so startup is not blocked."""
+        thread = threading.Thread(target=self.warm_up, name="ocr-warmup", daemon=True)
+        self.warmup_state = "loading"
+        thread.start()
+        return thread
+
+    def readiness(self) -> Dict[str, Any]:
+        return {
+            "state": self.warmup_state,
+            "error": self.warmup_error,
+            **{f"{stage}_sec": value for stage, value in self.warmup_timings.items()},
+        }
+
+    def _readtext(self, image: Any) -> List[Tuple[str, float, Tuple[int, int, int, int]]]:
+        rows = []
         for box, text, confidence in self._reader_instance().readtext(image):
             if not str(text).strip() or float(confidence) < 0.30:
                 continue
             xs = [int(point[0]) for point in box]
             ys = [int(point[1]) for point in box]
-            elements.append(
-                ObservedElement(
-                    text=str(text).strip(),
+            rows.append(
+                (str(text).strip(), float(confidence), (min(xs), min(ys), max(xs), max(ys)))
+            )
+        return rows
+
+    def _read_region(self, image: Any, left: int = 0, top: int = 0) -> List[ObservedElement]:
+        rows = None
+        key = None
+        if self.result_cache is not None:
+            key = self.result_cache.key(image)
+            rows = self.result_cache.get(key)
+        if rows is None:
+            rows = self._readtext(image)
+            if key is not None:
+                self.result_cache.put(key, rows)
+        return [
+            ObservedElement(
+                text=text,
+                rect=Rect(
+                    box[0] + left,
+                    box[1] + top,
+                    box[2] + left,
+                    box[3] + top,
+                ),
+                role="text",
+                source="ocr",
+                confidence=confidence,
+            )
+            for text, confidence, box in rows
+        ]
+
+    def close(self) -> None:
+        if self.result_cache is not None:
+            self.result_cache.flush()
+
+    def recognize(
+        self,
+        image: Any,
+        *,
+        track: bool = True,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> List[ObservedElement]:
+        """Recognize one frame; element rectangles are frame-relative.
+
+        ``track=False`` reads a one-off crop without disturbing the tile state
+        kept for full frames. ``cancelled`` is checked before each region is
+        read; a cancelled pass raises ``OCRCancelled`` and forgets the tile
+        state, so the next frame is read in full.
+        """
+
+        def check(started: bool) -> None:
+            if cancelled is not None and cancelled():
+                if started and self.tiles is not None:
+                    self.tiles.reset()
+                raise OCRCancelled("speculative OCR was cancelled")
+
+        check(False)
+        if not track:
+            return self._read_region(image)
+        dirty = self.tiles.update(image) if self.tiles is not None else None
+        self.last_dirty_regions = dirty
+        if dirty is None:
+            elements = self._read_region(image)
+        elif not dirty:
+            elements = list(self._previous)
+        else:
+            from .ocr_tiles import merge_tile_results, recognition_regions
+
+            height, width = int(image.shape[0]), int(image.shape[1])
+            recognized: List[ObservedElement] = []
+            for region in recognition_regions(dirty, self._previous, width, height):
+                check(True)
+                recognized.extend(
+                    self._read_region(
+                        image[region.top : region.bottom, region.left : region.right],
+                        region.left,
+                        region.top,
+                    )
+                )
+            elements = merge_tile_results(self._previous, recognized, dirty)
+        self._previous = elements
+        return list(elements)
+
+    def fingerprint(self, image: Any) -> Tuple[Any, ...]:
+        """Per-tile hashes of ``image``, as sensitive as the tile diff itself."""
+        tiles = self.tiles
+        if tiles is None:
+            from .ocr_tiles import TileChangeDetector
+
+            tiles = TileChangeDetector()
+        return tiles.fingerprint(image)
+
+    @staticmethod
+    def visual_hash(image: Any) -> str:
+        sample = image[::32, ::32].mean(axis=2)
+        # Average-hash style fingerprint ignores minor color/noise changes
+        # while still detecting layout, modal, and selection transitions.
+        return hashlib.sha256((sample > sample.mean()).tobytes()).hexdigest()
+
+    def observe(
+        self,
+        region: Optional[dict] = None,
+        *,
+        crop: bool = False,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> Tuple[List[ObservedElement], int, int, str, int, int]:
+        if self.capture is None:
+            from .capture import CaptureSession
+
+            self.capture = CaptureSession(monitor_index=self.monitor_index)
+        with self.tracer.span("capture"):
+            image, monitor = self.capture.grab(region)
+            visual_hash = self.visual_hash(image)
+        offset_x, offset_y = int(monitor["left"]), int(monitor["top"])
+        started = time.perf_counter()
+        with self.tracer.span("recognize", crop=crop):
+            elements = [
+                replace(
+                    element,
                     rect=Rect(
-                        min(xs) + offset_x,
-                        min(ys) + offset_y,
-                        max(xs) + offset_x,
-                        max(ys) + offset_y,
+                        element.rect.left + offset_x,
+                        element.rect.top + offset_y,
+                        element.rect.right + offset_x,
+                        element.rect.bottom + offset_y,
                     ),
-                    role="text",
-                    source="ocr",
-                    confidence=float(confidence),
                 )
-            )
+                for element in self.recognize(image, track=not crop, cancelled=cancelled)
+            ]
+        self.last_timings = {
+            **self.capture.last_timings,
+            "recognize": time.perf_counter() - started,
+        }
         return (
             elements,
             int(monitor["width"]),
@@ -276,15 +1089,66 @@ class OCRProvider:
         )
 
 
+def _initialize_com() -> None:
+    """Pool threads must join a COM apartment before they call into UIA."""
+    if platform.system() != "Windows":
+        return
+    try:
+        import comtypes  # type: ignore
+
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+    except Exception:
+        pass
+
+
 class HybridScreenObserver:
-    """Combine UI Automation semantics with an OCR fallback for black-box kiosks."""
+    """Combine UI Automation semantics with an OCR fallback for black-box kiosks.
+
+    ``observe(region)`` scopes an observation to a normalized region such as
+    ``menu_region`` or ``cart_region``: OCR reads only that crop, the UIA
+    walk skips subtrees outside it (a batched read filters its whole-window
+    cache instead), and only elements whose centers fall inside are
+    returned. The window geometry is kept so normalized coordinates match.
+
+    UIA is sufficient when it returns at least ``uia_min_elements``
+    elements; a thinner tree (say, only the title bar of a canvas-drawn
+    kiosk) is merged with OCR, as are UIA failures and forced OCR.
+
+    With ``observe_parallel`` UIA runs on a small pool and OCR is started
+    speculatively when UIA exceeds its latency budget or comes back thin.
+    When UIA turns out sufficient the speculative pass is cancelled. The
+    cancellation is checked before OCR starts and between tile-diff regions;
+    a full-frame recognition that has already started runs to completion.
+    """
+
+    # Pixels added around a region crop so text straddling its edge is read whole.
+    region_margin = 16
 
     def __init__(self, cfg: Any):
+        from .capture import CaptureSession
+
         self.window_title = str(getattr(cfg, "kiosk_window_title", "")).strip()
         self._window_handle: Any = None
         self._force_ocr = False
+        # Providers (and OCR region) behind the last full observation, for ``probe``.
+        self._probe_sources: Tuple[str, ...] = ()
+        self._probe_region: Optional[dict] = None
+        self.parallel = bool(getattr(cfg, "observe_parallel", False))
+        self.uia_latency_budget_sec = float(getattr(cfg, "uia_latency_budget_sec", 0.15))
+        self.uia_min_elements = int(getattr(cfg, "uia_min_elements", 3))
+        self._executor: Any = None
+        self._ocr_lock = threading.Lock()
+        self.tracer: Any = NULL_TRACER
+        self.capture = CaptureSession(
+            self.window_title, int(getattr(cfg, "monitor_index", 1))
+        )
         self.uia = (
-            UIAutomationProvider(getattr(cfg, "kiosk_window_title", ""))
+            UIAutomationProvider(
+                getattr(cfg, "kiosk_window_title", ""),
+                tree_cache=bool(getattr(cfg, "uia_tree_cache", True)),
+                batch_properties=bool(getattr(cfg, "uia_batch_properties", True)),
+                cache_max_age_sec=float(getattr(cfg, "uia_cache_max_age_sec", 2.0)),
+            )
             if getattr(cfg, "uia_enabled", True)
             else None
         )
@@ -293,100 +1157,215 @@ class HybridScreenObserver:
                 monitor_index=int(getattr(cfg, "monitor_index", 1)),
                 model_dir=str(getattr(cfg, "ocr_model_dir", "")),
                 allow_download=bool(getattr(cfg, "ocr_allow_download", False)),
+                tile_diff=bool(getattr(cfg, "ocr_tile_diff", True)),
+                capture=self.capture,
+                cache_entries=int(getattr(cfg, "ocr_cache_entries", 256)),
+                cache_path=str(getattr(cfg, "ocr_cache_path", "")),
+                torch_threads=int(getattr(cfg, "ocr_threads", 0)),
             )
             if getattr(cfg, "ocr_enabled", True)
             else None
         )
 
+    def set_tracer(self, tracer: Any) -> None:
+        """Record observation spans, including OCR capture and recognition, on ``tracer``."""
+        self.tracer = tracer
+        if self.ocr is not None:
+            self.ocr.tracer = tracer
+
     def _target_region(self) -> Optional[dict]:
-        if not self.window_title or platform.system() != "Windows":
-            return None
-        import pygetwindow  # type: ignore
-
-        windows = [
-            window
-            for window in pygetwindow.getAllWindows()
-            if getattr(window, "width", 0) > 0
-            and getattr(window, "height", 0) > 0
-            and self.window_title.casefold() in str(getattr(window, "title", "")).casefold()
-        ]
-        exact = [
-            window
-            for window in windows
-            if str(getattr(window, "title", "")).strip().casefold()
-            == self.window_title.casefold()
-        ]
-        candidates = exact or windows
-        if len(candidates) != 1:
-            raise RuntimeError(
-                f"target window must match exactly once: {self.window_title} "
-                f"(found {len(candidates)})"
-            )
-        window = candidates[0]
-        if bool(getattr(window, "isMinimized", False)):
-            raise RuntimeError("target kiosk window is minimized")
-        handle = getattr(window, "_hWnd", str(getattr(window, "title", "")))
-        if self._window_handle is None:
-            self._window_handle = handle
-        elif handle != self._window_handle:
-            raise RuntimeError("target kiosk window identity changed")
-        return {
-            "left": int(window.left),
-            "top": int(window.top),
-            "width": int(window.width),
-            "height": int(window.height),
-        }
+        region = self.capture.target_region()
+        self._window_handle = self.capture.window_handle
+        return region
+
+    def start_ocr_warmup(self) -> bool:
+        if self.ocr is None:
+            return False
+        self.ocr.start_warmup()
+        return True
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.capture.close()
+        if self.uia is not None:
+            self.uia.close()
+        if self.ocr is not None:
+            self.ocr.close()
+
     @staticmethod
     def _deduplicate(elements: Iterable[ObservedElement]) -> Tuple[ObservedElement, ...]:
         kept: List[ObservedElement] = []
+        kept_texts: List[str] = []
+        grid = GridIndex(SAME_CONTROL_PX)
         for candidate in sorted(
             elements,
             key=lambda item: (item.source != "uia", -item.confidence),
         ):
             normalized = _normalize(candidate.text)
-            duplicate = any(
-                _normalize(existing.text) == normalized
-                and abs(existing.rect.center[0] - candidate.rect.center[0]) < 20
-                and abs(existing.rect.center[1] - candidate.rect.center[1]) < 20
-                for existing in kept
-            )
-            if not duplicate:
-                kept.append(candidate)
+            x, y = candidate.rect.center
+            if any(
+                kept_texts[position] == normalized
+                for position in grid.near(x, y, SAME_CONTROL_PX, SAME_CONTROL_PX)
+            ):
+                continue
+            grid.add(x, y)
+            kept.append(candidate)
+            kept_texts.append(normalized)
         return tuple(kept)
 
-    def observe(self) -> ScreenObservation:
+    def _observe_uia(
+        self,
+        target_region: Optional[dict],
+        region: Optional[Tuple[float, float, float, float]],
+    ) -> List[ObservedElement]:
+        if self._window_handle is not None:
+            self.uia.bind_window(self._window_handle)
+        if region is not None and target_region is not None:
+            return self.uia.observe(absolute_region(region, target_region, self.region_margin))
+        return self.uia.observe()
+
+    def _observe_ocr(
+        self,
+        target_region: Optional[dict],
+        region: Optional[Tuple[float, float, float, float]],
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> Tuple[List[ObservedElement], int, int, str, int, int]:
+        with self._ocr_lock:
+            if region is None:
+                return self.ocr.observe(target_region, cancelled=cancelled)
+            frame = target_region or self.capture.monitor_region()
+            crop = absolute_region(region, frame, self.region_margin)
+            elements, _, _, visual_hash, _, _ = self.ocr.observe(
+                {
+                    "left": crop.left,
+                    "top": crop.top,
+                    "width": crop.right - crop.left,
+                    "height": crop.bottom - crop.top,
+                },
+                crop=True,
+                cancelled=cancelled,
+            )
+        return (
+            elements,
+            int(frame["width"]),
+            int(frame["height"]),
+            visual_hash,
+            int(frame["left"]),
+            int(frame["top"]),
+        )
+
+    def _timed(self, name: str, call: Callable[[], Any], timings: Dict[str, float]) -> Any:
+        started = time.perf_counter()
+        try:
+            with self.tracer.span(name):
+                return call()
+        finally:
+            timings[name] = time.perf_counter() - started
+
+    def _uia_sufficient(self, outcome: Any) -> bool:
+        return isinstance(outcome, list) and len(outcome) >= max(1, self.uia_min_elements)
+
+    def _pool(self) -> Any:
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._executor = ThreadPoolExecutor(
+                max_workers=2,
+                thread_name_prefix="observe",
+                initializer=_initialize_com,
+            )
+        return self._executor
+
+    def _run_providers(
+        self,
+        target_region: Optional[dict],
+        region: Optional[Tuple[float, float, float, float]],
+        timings: Dict[str, float],
+    ) -> Tuple[Any, Any]:
+        """Return ``(uia, ocr)`` outcomes: a result, an exception, or ``None`` if skipped."""
+
+        def outcome(call: Callable[[], Any]) -> Any:
+            try:
+                return call()
+            except Exception as exc:
+                return exc
+
+        def run_uia() -> Any:
+            return self._timed("uia", lambda: self._observe_uia(target_region, region), timings)
+
+        cancel = threading.Event()
+
+        def run_ocr() -> Any:
+            return self._timed(
+                "ocr", lambda: self._observe_ocr(target_region, region, cancel.is_set), timings
+            )
+
+        if not (self.parallel and self.uia is not None and self.ocr is not None):
+            uia = outcome(run_uia) if self.uia is not None else None
+            needs_ocr = self._force_ocr or not self._uia_sufficient(uia)
+            ocr = outcome(run_ocr) if self.ocr is not None and needs_ocr else None
+            return uia, ocr
+
+        from concurrent.futures import wait
+
+        pool = self._pool()
+        uia_future = pool.submit(run_uia)
+        ocr_future = pool.submit(run_ocr) if self._force_ocr else None
+        if ocr_future is None:
+            # Hedge: start OCR once UIA runs over budget or comes back thin.
+            done, _ = wait([uia_future], timeout=self.uia_latency_budget_sec)
+            if not done or not self._uia_sufficient(outcome(uia_future.result)):
+                ocr_future = pool.submit(run_ocr)
+        uia = outcome(uia_future.result)
+        if ocr_future is None:
+            return uia, None
+        if not self._force_ocr and self._uia_sufficient(uia):
+            # UIA turned out sufficient; dropping the speculative OCR keeps the
+            # provider mix, and so the signature, a function of what UIA saw.
+            cancel.set()
+            ocr_future.cancel()
+            return uia, None
+        return uia, outcome(ocr_future.result)
+
+    def observe(
+        self, region: Optional[Tuple[float, float, float, float]] = None
+    ) -> ScreenObservation:
+        with self.tracer.span("observe", region=region):
+            return self._observe(region)
+
+    def _observe(
+        self, region: Optional[Tuple[float, float, float, float]]
+    ) -> ScreenObservation:
+        started = time.perf_counter()
         elements: List[ObservedElement] = []
         width = height = 0
         origin_x = origin_y = 0
+        visual_hash = ""
         errors: List[str] = []
+        sources: List[str] = []
+        timings: Dict[str, float] = {}
         try:
             target_region = self._target_region()
         except Exception as exc:
             raise RuntimeError(f"target window binding failed: {exc}") from exc
-        if self.uia is not None:
-            try:
-                if self._window_handle is not None:
-                    self.uia.bind_window(self._window_handle)
-                elements.extend(self.uia.observe())
-                if target_region is None and self.uia.last_root_rect is not None:
-                    rect = self.uia.last_root_rect
-                    origin_x, origin_y = rect.left, rect.top
-                    width, height = rect.right - rect.left, rect.bottom - rect.top
-            except Exception as exc:
-                errors.append(f"UIA: {exc}")
-        if self.ocr is not None and (self._force_ocr or not elements):
-            try:
-                (
-                    ocr_elements,
-                    width,
-                    height,
-                    visual_hash,
-                    origin_x,
-                    origin_y,
-                ) = self.ocr.observe(target_region)
-                elements.extend(ocr_elements)
-            except Exception as exc:
-                errors.append(f"OCR: {exc}")
+        uia, ocr = self._run_providers(target_region, region, timings)
+        if isinstance(uia, Exception):
+            errors.append(f"UIA: {uia}")
+        elif uia is not None:
+            elements.extend(uia)
+            sources.append("uia")
+            if target_region is None and self.uia.last_root_rect is not None:
+                rect = self.uia.last_root_rect
+                origin_x, origin_y = rect.left, rect.top
+                width, height = rect.right - rect.left, rect.bottom - rect.top
+        if isinstance(ocr, Exception):
+            errors.append(f"OCR: {ocr}")
+        elif ocr is not None:
+            ocr_elements, width, height, visual_hash, origin_x, origin_y = ocr
+            elements.extend(ocr_elements)
+            sources.append("ocr")
         if not elements:
             detail = "; ".join(errors) or "all perception providers are disabled"
             raise RuntimeError(f"screen observation failed: {detail}")
@@ -399,15 +1378,56 @@ class HybridScreenObserver:
             right = max((item.rect.right for item in elements), default=1)
             bottom = max((item.rect.bottom for item in elements), default=1)
             width, height = right - origin_x, bottom - origin_y
+        if region is not None:
+            elements = [
+                element
+                for element in elements
+                if in_region(element, region, width, height, origin_x, origin_y)
+            ]
+        else:
+            self._probe_sources = tuple(sources)
+            self._probe_region = target_region
+        timings["total"] = time.perf_counter() - started
         return ScreenObservation(
             self._deduplicate(elements),
             width,
             height,
-            visual_hash=locals().get("visual_hash", ""),
+            visual_hash=visual_hash,
             origin_x=origin_x,
             origin_y=origin_y,
+            region=tuple(region) if region is not None else None,
+            timings=dict(timings),
         )
 
+    def observe_region(self, region: Tuple[float, float, float, float]) -> ScreenObservation:
+        return self.observe(region)
+
+    def probe(self) -> Optional[Tuple[Any, ...]]:
+        """Cheap fingerprint of everything the last full observation read.
+
+        UIA contributes its change-event sequence and OCR the per-tile hashes
+        of a fresh grab, so an unchanged fingerprint means a full observation
+        would read the same elements. ``None`` means no cheap signal exists.
+        """
+        if not self._probe_sources:
+            return None
+        token: List[Any] = []
+        if "uia" in self._probe_sources:
+            if not self.uia.change_events_active:
+                return None
+            token.append(self.uia.change_sequence)
+        if "ocr" in self._probe_sources:
+            image, _ = self.capture.grab(self._probe_region)
+            token.append(self.ocr.fingerprint(image))
+        return tuple(token)
+
+    def wait_for_change(self, token: Optional[Tuple[Any, ...]], timeout: float) -> None:
+        """Sleep up to ``timeout``; a UIA-only probe wakes on the next change event."""
+        if token and self._probe_sources == ("uia",):
+            self.uia.wait_for_change(token[0], timeout)
+        else:
+            time.sleep(timeout)
+
     def observe_with_ocr(self) -> ScreenObservation:
         """Enable the OCR fallback after UIA could not resolve a target."""
         self._force_ocr = True
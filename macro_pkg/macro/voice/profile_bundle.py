@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Tuple
+
+from .errors import ProfileError
+from .grounding import normalize_text
+from .index_loader import MenuIndex
+from .kiosk_profile import KioskProfile
+from .transition_graph import TransitionGraph
+
+FORMAT_VERSION = 2
+_MAGIC = b"KIOSKPB\x00"
+# magic, format version, header length; the JSON header and JSON payload follow.
+_PREFIX = struct.Struct(">8sHI")
+
+# (path, size, mtime_ns, sha256) of one source file when it was compiled.
+SourceStamp = Tuple[str, int, int, str]
+
+
+@dataclass(frozen=True)
+class ProfileBundle:
+    """Profile, menu index and transition graph compiled from one set of sources."""
+
+    profile: KioskProfile
+    index: MenuIndex
+    graph: TransitionGraph
+    sources: Tuple[SourceStamp, ...]
+    # Validated profile, menu cards and UI coords the indexes were built from.
+    data: Tuple[Any, Any, Any] = field(default=(None, None, None), compare=False, repr=False)
+
+
+def _is_point(value: Any) -> bool:
+    return (
+        isinstance(value, Mapping)
+        and isinstance(value.get("x"), (int, float))
+        and isinstance(value.get("y"), (int, float))
+    )
+
+
+def _is_region(value: Any) -> bool:
+    if not isinstance(value, list) or len(value) != 4:
+        return False
+    if not all(isinstance(part, (int, float)) for part in value):
+        return False
+    left, top, right, bottom = value
+    return 0.0 <= left < right <= 1.0 and 0.0 <= top < bottom <= 1.0
+
+
+def validate_sources(profile: Any, cards: Any, ui: Any) -> List[str]:
+    """Every inconsistency between the profile, menu cards and UI coords."""
+    problems: List[str] = []
+    if not isinstance(ui, Mapping):
+        return ["ui coords must be an object"]
+    categories = set()
+    for raw in ui.get("categories", ()) or ():
+        if not isinstance(raw, Mapping) or not str(raw.get("name", "")).strip():
+            problems.append("ui category without a name")
+            continue
+        if not _is_point(raw.get("center")):
+            problems.append(f"ui category has no center: {raw['name']}")
+        categories.add(raw["name"])
+    buttons = ui.get("nav_buttons", {}) or {}
+    for button in ("prev", "next"):
+        if not _is_point((buttons.get(button) or {}).get("center")):
+            problems.append(f"ui nav button has no center: {button}")
+
+    if not isinstance(cards, list) or not cards:
+        problems.append("menu cards must be a non-empty list")
+        cards = []
+    seen = {}
+    for position, raw in enumerate(cards):
+        if not isinstance(raw, Mapping) or not str(raw.get("name", "")).strip():
+            problems.append(f"menu card {position} has no name")
+            continue
+        name = str(raw["name"])
+        if raw.get("category") not in categories:
+            problems.append(f"menu card category is not a ui category: {name} / {raw.get('category')}")
+        page = raw.get("page")
+        if isinstance(page, bool) or not isinstance(page, int) or page < 1:
+            problems.append(f"menu card page must be a positive integer: {name}")
+        if not _is_point(raw.get("center")):
+            problems.append(f"menu card has no center: {name}")
+        normalized = normalize_text(name)
+        if normalized in seen:
+            problems.append(f"menu cards share a name: {seen[normalized]} / {name}")
+        seen.setdefault(normalized, name)
+
+    if not isinstance(profile, Mapping):
+        return [*problems, "kiosk profile must be an object"]
+    if profile.get("schema_version") != 2:
+        problems.append(f"unsupported kiosk profile schema: {profile.get('schema_version')}")
+    states = profile.get("states", {}) or {}
+    if not isinstance(states, Mapping):
+        problems.append("profile states must be an object")
+        states = {}
+    for state, markers in states.items():
+        if not isinstance(markers, list) or not any(normalize_text(marker) for marker in markers):
+            problems.append(f"profile state has no markers: {state}")
+    for state in profile.get("state_priority", ()) or ():
+        if state not in states:
+            problems.append(f"state_priority names an unknown state: {state}")
+    for position, raw in enumerate(profile.get("transitions", ()) or ()):
+        if not isinstance(raw, Mapping):
+            problems.append(f"profile transition {position} must be an object")
+            continue
+        for end in ("source", "destination"):
+            if raw.get(end) not in states:
+                problems.append(f"transition {position} {end} is not a state: {raw.get(end)}")
+        labels = (raw.get("target", {}) or {}).get("labels", ()) or ()
+        if not any(normalize_text(label) for label in labels):
+            problems.append(f"transition {position} target has no labels")
+    for key in ("menu_region", "cart_region"):
+        if profile.get(key) is not None and not _is_region(profile[key]):
+            problems.append(f"profile {key} must be [left, top, right, bottom] within 0..1")
+    return problems
+
+
+def _read_source(path: str) -> Tuple[Any, SourceStamp]:
+    # Stat before reading: a write in between leaves a stale stamp, which
+    # only causes one more reload.
+    try:
+        stat = os.stat(path)
+        data = Path(path).read_bytes()
+    except OSError as exc:
+        raise ProfileError(f"cannot read {path}: {exc}") from exc
+    try:
+        parsed = json.loads(data.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise ProfileError(f"invalid JSON in {path}: {exc}") from exc
+    return parsed, (str(path), stat.st_size, stat.st_mtime_ns, hashlib.sha256(data).hexdigest())
+
+
+def compile_bundle(profile_path: str, menu_cards_path: str, ui_coords_path: str) -> ProfileBundle:
+    """Validate the three sources together and build every derived index."""
+    (profile, profile_stamp), (cards, cards_stamp), (ui, ui_stamp) = (
+        _read_source(path) for path in (profile_path, menu_cards_path, ui_coords_path)
+    )
+    return _build(profile, cards, ui, (profile_stamp, cards_stamp, ui_stamp))
+
+
+def _build(profile: Any, cards: Any, ui: Any, sources: Tuple[SourceStamp, ...]) -> ProfileBundle:
+    problems = validate_sources(profile, cards, ui)
+    if problems:
+        raise ProfileError("invalid kiosk profile sources: " + "; ".join(problems))
+    index = MenuIndex.from_data(ui, cards)
+    compiled = KioskProfile.from_index(profile, index)
+    return ProfileBundle(compiled, index, compiled.transition_graph(), sources, (profile, cards, ui))
+
+
+def write_bundle(bundle: ProfileBundle, path: str) -> str:
+    """Write the artifact atomically and return its payload checksum."""
+    profile, cards, ui = bundle.data
+    payload = json.dumps(
+        {"profile": profile, "menu_cards": cards, "ui_coords": ui},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    checksum = hashlib.sha256(payload).hexdigest()
+    header = json.dumps(
+        {"sha256": checksum, "sources": [list(stamp) for stamp in bundle.sources]},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temporary = f"{path}.tmp"
+    Path(temporary).write_bytes(_PREFIX.pack(_MAGIC, FORMAT_VERSION, len(header)) + header + payload)
+    os.replace(temporary, path)
+    return checksum
+
+
+def read_bundle(path: str) -> ProfileBundle:
+    """Load an artifact with a single read, verifying version and checksum.
+
+    The payload is plain JSON of the validated sources; it is validated again
+    and the menu index, matcher and transition graph are rebuilt from it, so
+    the artifact is no more trusted than the source files themselves.
+    """
+    blob = Path(path).read_bytes()
+    if len(blob) < _PREFIX.size:
+        raise ProfileError(f"profile artifact is truncated: {path}")
+    magic, version, length = _PREFIX.unpack_from(blob)
+    if magic != _MAGIC or version != FORMAT_VERSION:
+        raise ProfileError(f"unsupported profile artifact: {path}")
+    try:
+        header = json.loads(blob[_PREFIX.size : _PREFIX.size + length].decode("utf-8"))
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise ProfileError(f"profile artifact header is corrupt: {path}") from exc
+    payload = blob[_PREFIX.size + length :]
+    if hashlib.sha256(payload).hexdigest() != header.get("sha256"):
+        raise ProfileError(f"profile artifact checksum mismatch: {path}")
+    try:
+        data = json.loads(payload.decode("utf-8"))
+        sources = tuple(
+            (str(name), int(size), int(mtime_ns), str(digest))
+            for name, size, mtime_ns, digest in header["sources"]
+        )
+    except (KeyError, TypeError, UnicodeDecodeError, ValueError) as exc:
+        raise ProfileError(f"profile artifact cannot be loaded: {path}") from exc
+    if not isinstance(data, Mapping):
+        raise ProfileError(f"profile artifact has no bundle: {path}")
+    return _build(data.get("profile"), data.get("menu_cards"), data.get("ui_coords"), sources)
+
+
+def sources_changed(sources: Sequence[SourceStamp]) -> bool:
+    """Whether any source differs from its stamp; a bare touch does not count."""
+    for path, size, mtime_ns, digest in sources:
+        try:
+            stat = os.stat(path)
+            if (stat.st_size, stat.st_mtime_ns) == (size, mtime_ns):
+                continue
+            if hashlib.sha256(Path(path).read_bytes()).hexdigest() != digest:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+class ProfileStore:
+    """The current compiled profile, recompiled when its sources change.
+
+    With ``artifact_path`` a matching artifact is loaded instead of
+    compiling, and every compile refreshes it. Sources are re-checked at
+    most every ``check_interval`` seconds; a reload that fails validation
+    keeps serving the previous bundle and records ``last_error``. A failed
+    artifact write only records ``artifact_error``.
+    """
+
+    def __init__(
+        self,
+        profile_path: str,
+        menu_cards_path: str,
+        ui_coords_path: str,
+        *,
+        artifact_path: str = "",
+        check_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.paths = (str(profile_path), str(menu_cards_path), str(ui_coords_path))
+        self.artifact_path = str(Path(artifact_path).expanduser()) if artifact_path else ""
+        self.check_interval = max(0.0, float(check_interval))
+        self.generation = 0
+        self.last_error: Optional[str] = None
+        self.artifact_error: Optional[str] = None
+        self._clock = clock
+        self._bundle: Optional[ProfileBundle] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg: Any) -> "ProfileStore":
+        return cls(
+            cfg.profile_path,
+            cfg.menu_cards_path,
+            cfg.ui_coords_path,
+            artifact_path=getattr(cfg, "profile_artifact_path", ""),
+            check_interval=getattr(cfg, "profile_check_interval_sec", 1.0),
+        )
+
+    def _compile(self) -> ProfileBundle:
+        bundle = compile_bundle(*self.paths)
+        if self.artifact_path:
+            try:
+                write_bundle(bundle, self.artifact_path)
+            except OSError as exc:
+                self.artifact_error = f"profile artifact not written: {exc}"
+            else:
+                self.artifact_error = None
+        return bundle
+
+    def _adopt(self, bundle: ProfileBundle) -> ProfileBundle:
+        self._bundle = bundle
+        self.generation += 1
+        self._checked_at = self._clock()
+        return bundle
+
+    def load(self) -> ProfileBundle:
+        """The bundle, loading the artifact or compiling the sources on first use."""
+        with self._lock:
+            if self._bundle is not None:
+                return self._bundle
+            if self.artifact_path:
+                try:
+                    bundle = read_bundle(self.artifact_path)
+                except (OSError, ProfileError):
+                    bundle = None
+                if (
+                    bundle is not None
+                    and tuple(stamp[0] for stamp in bundle.sources) == self.paths
+                    and not sources_changed(bundle.sources)
+                ):
+                    return self._adopt(bundle)
+            return self._adopt(self._compile())
+
+    def current(self) -> ProfileBundle:
+        """The bundle to use now, recompiled first if a source has changed."""
+        bundle = self.load()
+        with self._lock:
+            now = self._clock()
+            if now - self._checked_at < self.check_interval:
+                return self._bundle
+            self._checked_at = now
+            if not sources_changed(self._bundle.sources):
+                return self._bundle
+            try:
+                bundle = self._compile()
+            except ProfileError as exc:
+                self.last_error = str(exc)
+                return self._bundle
+            self.last_error = None
+            return self._adopt(bundle)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class GridIndex:
+    """Uniform grid over 2-D points for rectangle and neighbour queries.
+
+    Points keep the position they were added at. With ``cell`` at least as
+    large as the neighbour distance, ``near`` only inspects the 3x3 block of
+    cells around the query point.
+    """
+
+    def __init__(self, cell: float):
+        if cell <= 0:
+            raise ValueError("grid cell size must be positive")
+        self.cell = float(cell)
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._points: List[Tuple[float, float]] = []
+
+    @classmethod
+    def build(cls, points: Iterable[Tuple[float, float]], cell: float) -> "GridIndex":
+        grid = cls(cell)
+        for x, y in points:
+            grid.add(x, y)
+        return grid
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _key(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.cell), math.floor(y / self.cell))
+
+    def add(self, x: float, y: float) -> int:
+        position = len(self._points)
+        self._points.append((x, y))
+        self._cells.setdefault(self._key(x, y), []).append(position)
+        return position
+
+    def within(self, left: float, top: float, right: float, bottom: float) -> List[int]:
+        """Positions of points inside the closed rectangle, in insertion order."""
+        first_column, first_row = self._key(left, top)
+        last_column, last_row = self._key(right, bottom)
+        spanned = (last_column - first_column + 1) * (last_row - first_row + 1)
+        if spanned > len(self._cells):
+            cells = [
+                positions
+                for (column, row), positions in self._cells.items()
+                if first_column <= column <= last_column and first_row <= row <= last_row
+            ]
+        else:
+            cells = [
+                self._cells[(column, row)]
+                for column in range(first_column, last_column + 1)
+                for row in range(first_row, last_row + 1)
+                if (column, row) in self._cells
+            ]
+        found = []
+        for positions in cells:
+            for position in positions:
+                x, y = self._points[position]
+                if left <= x <= right and top <= y <= bottom:
+                    found.append(position)
+        found.sort()
+        return found
+
+    def near(self, x: float, y: float, dx: float, dy: float) -> Iterator[int]:
+        """Positions of points strictly closer than ``dx`` and ``dy`` on each axis."""
+        first_column, first_row = self._key(x - dx, y - dy)
+        last_column, last_row = self._key(x + dx, y + dy)
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                for position in self._cells.get((column, row), ()):
+                    px, py = self._points[position]
+                    if abs(px - x) < dx and abs(py - y) < dy:
+                        yield position
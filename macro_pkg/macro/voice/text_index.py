@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+# Normalized texts contain no whitespace, so no pattern can span two texts.
+_SEPARATOR = "\n"
+# Below this many patterns one C-level scan per pattern beats a Python-level
+# automaton pass over the whole haystack.
+_AUTOMATON_MIN_PATTERNS = 48
+
+
+class PatternSet:
+    """Aho-Corasick automaton over a fixed tuple of normalized patterns.
+
+    Compile once per marker set (see ``compile_patterns``); ``search`` then
+    finds every pattern present in a text in a single pass.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = tuple(dict.fromkeys(pattern for pattern in patterns if pattern))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+        for pattern in self.patterns:
+            state = 0
+            for character in pattern:
+                following = self._goto[state].get(character)
+                if following is None:
+                    following = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                    self._goto[state][character] = following
+                state = following
+            self._output[state] += (pattern,)
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for character, following in self._goto[state].items():
+                pending.append(following)
+                fallback = self._fail[state]
+                while fallback and character not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(character, 0)
+                self._fail[following] = target if target != following else 0
+                self._output[following] += self._output[self._fail[following]]
+
+    def search(self, text: str) -> FrozenSet[str]:
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for character in text:
+            while state and character not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(character, 0)
+            if output[state]:
+                found.update(output[state])
+        return frozenset(found)
+
+
+@lru_cache(maxsize=64)
+def compile_patterns(patterns: Tuple[str, ...]) -> PatternSet:
+    return PatternSet(patterns)
+
+
+class ObservationIndex:
+    """Text lookups over one observation's normalized texts.
+
+    Exact matches come from a hash map and substring queries from a single
+    joined haystack; answers are memoized per pattern, so state detection,
+    page evidence, and marker checks on the same observation share them.
+    """
+
+    def __init__(self, texts: Iterable[str]):
+        self.exact: Dict[str, Tuple[int, ...]] = {}
+        ordered: List[str] = []
+        for position, text in enumerate(texts):
+            if not text:
+                continue
+            if text not in self.exact:
+                ordered.append(text)
+            self.exact[text] = self.exact.get(text, ()) + (position,)
+        self._haystack = _SEPARATOR.join(ordered)
+        self._contains: Dict[str, bool] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.exact)
+
+    def positions(self, text: str) -> Tuple[int, ...]:
+        """Element positions whose normalized text equals ``text``."""
+        return self.exact.get(text, ())
+
+    def contains(self, pattern: str) -> bool:
+        """Whether ``pattern`` equals or occurs inside any normalized text."""
+        found = self._contains.get(pattern)
+        if found is None:
+            if not pattern:
+                found = bool(self.exact)
+            else:
+                found = pattern in self.exact or (
+                    _SEPARATOR not in pattern and pattern in self._haystack
+                )
+            self._contains[pattern] = found
+        return found
+
+    def contains_any(self, patterns: Iterable[str]) -> bool:
+        return any(self.contains(pattern) for pattern in patterns)
+
+    def present(self, patterns: Sequence[str]) -> FrozenSet[str]:
+        """Subset of ``patterns`` that occur in the observation."""
+        patterns = tuple(patterns)
+        if len(patterns) < _AUTOMATON_MIN_PATTERNS:
+            return frozenset(pattern for pattern in patterns if self.contains(pattern))
+        found = compile_patterns(patterns).search(self._haystack)
+        for pattern in patterns:
+            self._contains[pattern] = pattern in found or (not pattern and bool(self.exact))
+        return frozenset(pattern for pattern in patterns if self._contains[pattern])
+
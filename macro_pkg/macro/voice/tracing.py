@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    start: float
+    duration: float
+    thread: int
+    depth: int
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+class Tracer:
+    """Nested timing spans for one order, exportable as Chrome trace events.
+
+    Spans nest per thread, so observer pool threads record alongside the
+    navigator. Times are seconds from the tracer's creation.
+    """
+
+    enabled = True
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.origin = clock()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        depth = self._depth()
+        self._local.depth = depth + 1
+        started = self._clock()
+        try:
+            yield
+        finally:
+            ended = self._clock()
+            self._local.depth = depth
+            self.record(name, started, ended - started, depth=depth, **args)
+
+    def record(self, name: str, started: float, duration: float, *, depth: Optional[int] = None, **args: Any) -> None:
+        """Add a span measured elsewhere; ``started`` is on the tracer's clock."""
+        span = Span(
+            name,
+            started - self.origin,
+            max(0.0, duration),
+            threading.get_ident(),
+            self._depth() if depth is None else depth,
+            args,
+        )
+        with self._lock:
+            self.spans.append(span)
+
+    def close(self, name: str, **args: Any) -> None:
+        """Record ``name`` as the root span, from the tracer's creation until now."""
+        self.record(name, self.origin, self._clock() - self.origin, depth=0, **args)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Trace-event JSON for chrome://tracing or Perfetto."""
+        pid = os.getpid()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: (span.start, span.depth))
+        return {
+            "traceEvents": [
+                {
+                    "name": span.name,
+                    "cat": "kiosk",
+                    "ph": "X",
+                    "ts": round(span.start * 1e6, 1),
+                    "dur": round(span.duration * 1e6, 1),
+                    "pid": pid,
+                    "tid": span.thread,
+                    "args": {key: str(value) for key, value in span.args.items()},
+                }
+                for span in spans
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write_chrome_trace(self, path: str) -> str:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(self.chrome_trace(), ensure_ascii=False), encoding="utf-8")
+        return str(target)
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, total and slowest duration per span name, slowest total first."""
+        totals: Dict[str, List[float]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            row = totals.setdefault(span.name, [0, 0.0, 0.0])
+            row[0] += 1
+            row[1] += span.duration
+            row[2] = max(row[2], span.duration)
+        elapsed = max((span.start + span.duration for span in spans), default=0.0)
+        return {
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "spans": {
+                name: {"count": count, "total_ms": round(total * 1000, 1), "max_ms": round(longest * 1000, 1)}
+                for name, (count, total, longest) in sorted(
+                    totals.items(), key=lambda item: -item[1][1]
+                )
+            },
+        }
+
+
+class NullTracer:
+    """Tracer stand-in that records nothing."""
+
+    enabled = False
+    _span = nullcontext()
+
+    def span(self, name: str, **args: Any) -> Any:
+        return self._span
+
+    def record(self, name: str, started: float, duration: float, **args: Any) -> None:
+        return None
+
+
+NULL_TRACER = NullTracer()
+
+
+def traced(name: str, describe: Optional[Callable[..., Dict[str, Any]]] = None) -> Callable[[Any], Any]:
+    """Record each call of a method as a span on its owner's ``tracer``.
+
+    ``describe`` receives the call's arguments and returns the span's args.
+    """
+
+    def decorate(method: Any) -> Any:
+        @functools.wraps(method)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            tracer = getattr(self, "tracer", NULL_TRACER)
+            details = describe(*args, **kwargs) if describe is not None and tracer.enabled else {}
+            with tracer.span(name, **details):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
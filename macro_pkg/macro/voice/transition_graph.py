@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from collections import deque
+import heapq
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
-from .grounding import Target, contains_any_text
+from .grounding import Target, normalize_text
 from .perception import ScreenObservation
 
+# Weight of the newest measurement in a transition's smoothed latency.
+_LATENCY_SMOOTHING = 0.3
+
 
 @dataclass(frozen=True)
 class Transition:
@@ -28,16 +31,38 @@ class TransitionGraph:
         self.state_markers = {
             name: tuple(markers) for name, markers in state_markers.items()
         }
+        self._normalized_markers = {
+            name: tuple(normalize_text(marker) for marker in markers)
+            for name, markers in self.state_markers.items()
+        }
+        # Every marker of every state, queried against an observation in one call.
+        self._all_markers = tuple(
+            dict.fromkeys(
+                marker
+                for markers in self._normalized_markers.values()
+                for marker in markers
+                if marker
+            )
+        )
         self.transitions = tuple(transitions)
         self.state_priority = {
             state: len(state_priority) - index
             for index, state in enumerate(state_priority)
         }
+        self._outgoing: Dict[str, Tuple[int, ...]] = {}
+        self._positions: Dict[Transition, int] = {}
+        for position, transition in enumerate(self.transitions):
+            self._outgoing[transition.source] = self._outgoing.get(transition.source, ()) + (position,)
+            self._positions.setdefault(transition, position)
+        # Smoothed seconds from action to verified postcondition, per transition.
+        self._latency: Dict[int, float] = {}
+        self._routes: Optional[Dict[Tuple[str, str], Tuple[Transition, ...]]] = None
 
     def detect_state(self, observation: ScreenObservation) -> Optional[str]:
         scores = []
-        for state, markers in self.state_markers.items():
-            score = sum(contains_any_text(observation, (marker,)) for marker in markers)
+        present = observation.text_index().present(self._all_markers)
+        for state, markers in self._normalized_markers.items():
+            score = sum(marker in present for marker in markers)
             if score:
                 scores.append(
                     (
@@ -50,19 +75,62 @@ class TransitionGraph:
         scores.sort(reverse=True)
         return scores[0][3] if scores else None
 
+    def record_latency(self, transition: Transition, seconds: float) -> None:
+        """Fold one measured duration of ``transition`` into its route weight."""
+        position = self._positions.get(transition)
+        if position is None or seconds < 0:
+            return
+        previous = self._latency.get(position)
+        self._latency[position] = (
+            seconds if previous is None else previous + _LATENCY_SMOOTHING * (seconds - previous)
+        )
+        self._routes = None
+
+    def latency(self, transition: Transition) -> Optional[float]:
+        position = self._positions.get(transition)
+        return None if position is None else self._latency.get(position)
+
+    def _compile_routes(self) -> Dict[Tuple[str, str], Tuple[Transition, ...]]:
+        """Cheapest route between every pair of states.
+
+        An edge costs its measured latency; unmeasured edges cost the mean of
+        the measured ones, so without measurements the fewest hops win. Ties
+        prefer fewer hops, then earlier transitions.
+        """
+        measured = list(self._latency.values())
+        default = sum(measured) / len(measured) if measured else 1.0
+        weights = [self._latency.get(position, default) for position in range(len(self.transitions))]
+        states = {*self.state_markers}
+        for transition in self.transitions:
+            states.update((transition.source, transition.destination))
+        routes: Dict[Tuple[str, str], Tuple[Transition, ...]] = {}
+        for source in states:
+            pending: List[Tuple[float, int, Tuple[int, ...], str]] = [(0.0, 0, (), source)]
+            settled = set()
+            while pending:
+                cost, hops, path, state = heapq.heappop(pending)
+                if state in settled:
+                    continue
+                settled.add(state)
+                if path:
+                    routes[(source, state)] = tuple(self.transitions[position] for position in path)
+                for position in self._outgoing.get(state, ()):
+                    destination = self.transitions[position].destination
+                    if destination not in settled:
+                        heapq.heappush(
+                            pending,
+                            (cost + weights[position], hops + 1, (*path, position), destination),
+                        )
+        self._routes = routes
+        return routes
+
     def path(self, source: str, destination: str) -> List[Transition]:
         if source == destination:
             return []
-        queue = deque([(source, [])])
-        visited = {source}
-        while queue:
-            state, path = queue.popleft()
-            for transition in self.transitions:
-                if transition.source != state or transition.destination in visited:
-                    continue
-                next_path = [*path, transition]
-                if transition.destination == destination:
-                    return next_path
-                visited.add(transition.destination)
-                queue.append((transition.destination, next_path))
-        raise ValueError(f"no transition path: {source} -> {destination}")
+        routes = self._routes
+        if routes is None:
+            routes = self._compile_routes()
+        route = routes.get((source, destination))
+        if route is None:
+            raise ValueError(f"no transition path: {source} -> {destination}")
+        return list(route)
@@ -8,7 +8,12 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "macro_pkg" / "macro"))
 
 from voice.errors import GroundingError  # noqa: E402
-from voice.grounding import Target, ground_target, scale_point  # noqa: E402
+from voice.grounding import (  # noqa: E402
+    Target,
+    ground_target,
+    ground_targets,
+    scale_point,
+)
 from voice.perception import (  # noqa: E402
     HybridScreenObserver,
     ObservedElement,
@@ -88,6 +93,44 @@ class GroundingTest(unittest.TestCase):
 
         self.assertEqual(result.element, button)
 
+    def test_batch_grounding_matches_single_target_decisions(self):
+        elements = (
+            ObservedElement("결제하기", Rect(10, 10, 110, 60), role="ButtonControl", source="uia"),
+            ObservedElement("확인", Rect(10, 100, 80, 140), source="uia"),
+            ObservedElement("확인", Rect(600, 100, 670, 140), source="uia"),
+            ObservedElement("아이스 아메리카노", Rect(10, 300, 300, 340), source="ocr", confidence=0.8),
+        )
+        screen = observation(*elements)
+        targets = (
+            Target("checkout", ("결제하기",), roles=("ButtonControl",)),
+            Target("confirm", ("확인",)),
+            Target("menu", ("아이스 아메리카노",), region=(0.0, 0.1, 0.5, 0.3)),
+            Target("missing", ("포장",)),
+        )
+
+        rankings = ground_targets(screen, targets)
+
+        self.assertEqual(rankings[0].result().element, elements[0])
+        self.assertIn("ambiguous", rankings[1].error)
+        self.assertEqual(rankings[2].result().element, elements[3])
+        self.assertIsNone(rankings[3].grounded)
+        for target, ranking in zip(targets, rankings):
+            if ranking.grounded is None:
+                with self.assertRaises(GroundingError):
+                    ground_target(screen, target)
+            else:
+                self.assertEqual(ground_target(screen, target), ranking.grounded)
+
+    def test_memoized_ranking_uses_elements_of_the_current_frame(self):
+        first = ObservedElement("결제하기", Rect(10, 10, 110, 60), source="uia", native="old")
+        again = ObservedElement("결제하기", Rect(10, 10, 110, 60), source="uia", native="new")
+        target = Target("checkout", ("결제하기",))
+
+        ground_target(observation(first), target)
+        result = ground_target(observation(again), target)
+
+        self.assertEqual(result.element.native, "new")
+
     def test_coordinate_fallback_scales_to_current_viewport(self):
         self.assertEqual(scale_point((540, 960), (1080, 1920), (2160, 3840)), (1080, 1920))
 
@@ -111,6 +154,27 @@ class GroundingTest(unittest.TestCase):
         self.assertEqual(graph.detect_state(screen), "menu")
         self.assertEqual([step.target.key for step in graph.path("menu", "payment")], ["checkout", "card"])
 
+    def test_transition_graph_prefers_the_fastest_measured_route(self):
+        direct = Transition("menu", "payment", Target("pay", ("바로 결제",)), ("카드를 넣어주세요",))
+        checkout = Transition("menu", "method", Target("checkout", ("결제",)), ("카드",))
+        card = Transition("method", "payment", Target("card", ("카드",)), ("카드를 넣어주세요",))
+        graph = TransitionGraph({"menu": ("커피",)}, [checkout, card, direct])
+
+        self.assertEqual(graph.path("menu", "payment"), [direct])
+        routes = graph._routes
+        self.assertEqual(graph.path("method", "payment"), [card])
+        self.assertIs(graph._routes, routes)
+
+        for seconds in (2.0, 2.4, 2.2):
+            graph.record_latency(direct, seconds)
+        graph.record_latency(checkout, 0.3)
+        graph.record_latency(card, 0.5)
+
+        self.assertEqual(graph.path("menu", "payment"), [checkout, card])
+        self.assertAlmostEqual(graph.latency(direct), 2.0 + 0.3 * 0.4 + 0.3 * (2.2 - 2.12))
+        with self.assertRaisesRegex(ValueError, "no transition path"):
+            graph.path("payment", "menu")
+
     def test_short_payment_method_label_does_not_satisfy_ready_marker(self):
         graph = TransitionGraph(
             {"payment_method": ("카드",), "payment_ready": ("카드를 넣어주세요",)},
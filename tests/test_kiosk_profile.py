@@ -1,3 +1,4 @@
+import random
 import sys
 import unittest
 from pathlib import Path
@@ -7,8 +8,68 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "macro_pkg" / "macro"))
 
 from voice.errors import ProfileError  # noqa: E402
+from voice.grounding import normalize_text  # noqa: E402
 from voice.index_loader import MenuIndex  # noqa: E402
-from voice.kiosk_profile import KioskProfile  # noqa: E402
+from voice.kiosk_profile import _RESOLVE_FLOOR, KioskProfile, MenuRecord  # noqa: E402
+from voice.matcher import similarity  # noqa: E402
+
+
+def scanned_resolution(profile, name, temperature=None, size=None):
+    """Score every menu record, as resolution did before it was indexed."""
+    temperature, temperature_info = profile._modifier("temperature", temperature)
+    size, size_info = profile._modifier("size", size)
+    exact = next(
+        (menu for menu in profile.menu_records if normalize_text(menu.name) == normalize_text(name)),
+        None,
+    )
+    if exact and temperature and not profile._contains_token(exact.name, temperature_info):
+        others = [
+            details
+            for canonical, details in profile.modifiers["temperature"].items()
+            if canonical != temperature
+        ]
+        if any(profile._contains_token(exact.name, details) for details in others):
+            return "conflict"
+    requested_base = profile._base_name(name)
+    ranked = []
+    for menu in profile.menu_records:
+        if normalize_text(name) == normalize_text(menu.name):
+            score = 1.2
+        elif requested_base and requested_base == profile._base_name(menu.name):
+            score = 1.0
+        else:
+            score = similarity(
+                requested_base,
+                profile._base_name(menu.name),
+                _RESOLVE_FLOOR,
+                profile._base_matcher.folds,
+            )
+        if temperature:
+            score += 0.25 if profile._contains_token(menu.name, temperature_info) else -0.20
+        if size:
+            score += 0.12 if profile._contains_token(menu.name, size_info) else 0.0
+        ranked.append((score, menu))
+    ranked.sort(key=lambda row: row[0], reverse=True)
+    if ranked[0][0] < 0.72:
+        return "not found"
+    if ranked[0][0] - ranked[1][0] < 0.08:
+        return f"ambiguous: {ranked[0][1].name} / {ranked[1][1].name}"
+    return ranked[0][1].name
+
+
+def indexed_resolution(profile, name, temperature=None, size=None):
+    try:
+        item = profile.resolve_order_item({"name": name, "temperature": temperature, "size": size})
+    except ProfileError as exc:
+        message = str(exc)
+        if message.startswith("menu is ambiguous"):
+            return "ambiguous: " + message.split("(", 1)[1].rstrip(")")
+        if message.startswith("menu not found"):
+            return "not found"
+        if message.startswith("menu name and temperature conflict"):
+            return "conflict"
+        raise
+    return item.menu.name
 
 
 class KioskProfileTest(unittest.TestCase):
@@ -64,6 +125,61 @@ class KioskProfileTest(unittest.TestCase):
                 {"menuName": "아이스 아메리카노", "temperature": "HOT"}
             )
 
+    def test_indexed_resolution_matches_a_full_scan(self):
+        generator = random.Random(3)
+        names = [menu.name for menu in self.profile.menu_records]
+        queries = []
+        for name in names:
+            squashed = normalize_text(name)
+            queries.append(name)
+            position = generator.randrange(len(squashed))
+            queries.append(squashed[:position] + squashed[position + 1 :])
+            queries.append(squashed[:position] + generator.choice(names)[0] + squashed[position + 1 :])
+        for query in queries:
+            for temperature, size in ((None, None), ("ICE", None), ("HOT", "LARGE")):
+                expected = scanned_resolution(self.profile, query, temperature, size)
+                self.assertEqual(
+                    indexed_resolution(self.profile, query, temperature, size),
+                    expected,
+                    (query, temperature, size),
+                )
+
+    def test_index_scales_to_a_large_catalog(self):
+        records = [
+            MenuRecord(f"{chr(0xAC00 + 28 * copy)}{menu.name}", menu.category, menu.page, menu.fallback_xy)
+            for copy in range(40)
+            for menu in self.profile.menu_records
+        ]
+        profile = KioskProfile(self.profile.data, records)
+
+        item = profile.resolve_order_item({"name": records[-1].name, "quantity": 1})
+
+        self.assertEqual(item.menu, records[-1])
+        self.assertEqual(
+            indexed_resolution(profile, records[-1].name[:-1]),
+            scanned_resolution(profile, records[-1].name[:-1]),
+        )
+
+    def test_quantity_stepper_contract_is_optional_and_validated(self):
+        self.assertIsNone(self.profile.quantity_stepper)
+        stepper = {
+            "location": "modal",
+            "increment": {"labels": ["+", "수량 추가"]},
+            "count_labels": ["수량 {count}"],
+        }
+        profile = KioskProfile({**self.profile.data, "quantity_stepper": stepper}, [])
+
+        self.assertEqual(profile.quantity_stepper.location, "modal")
+        self.assertEqual(profile.quantity_stepper.increment.labels, ("+", "수량 추가"))
+        for broken in (
+            {**stepper, "location": "popup"},
+            {**stepper, "increment": {}},
+            {**stepper, "count_labels": ["수량"]},
+            {**stepper, "count_labels": ["{count} {unit}"]},
+        ):
+            with self.assertRaises(ProfileError):
+                KioskProfile({**self.profile.data, "quantity_stepper": broken}, [])
+
 
 if __name__ == "__main__":
     unittest.main()
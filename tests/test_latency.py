@@ -0,0 +1,46 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "macro_pkg" / "macro"))
+
+from voice.latency import UtteranceLog, latency_report, percentile, stage_durations  # noqa: E402
+
+
+class LatencyTest(unittest.TestCase):
+    def test_durations_skip_missing_stages_and_reject_other_clocks(self):
+        stamps = {"utterance_end": 10.0, "enqueued": 10.8, "claimed": 11.0, "payment_ready": 14.0, "completed": 14.5}
+
+        durations = stage_durations(stamps)
+
+        self.assertAlmostEqual(durations["enqueued"], 0.8)
+        self.assertAlmostEqual(durations["payment_ready"], 3.0)
+        self.assertAlmostEqual(durations["total"], 4.5)
+        self.assertAlmostEqual(durations["utterance_to_payment_ready"], 4.0)
+        self.assertEqual(stage_durations({"enqueued": 5.0, "claimed": 1.0}), {})
+
+    def test_report_gives_per_stage_percentiles_over_history(self):
+        history = [{"enqueued": 0.0, "claimed": seconds / 1000} for seconds in range(1, 101)]
+        history.append({"claimed": 1.0})
+
+        report = latency_report(history)
+
+        self.assertEqual(report["orders"], 100)
+        self.assertEqual(report["stages"]["claimed"], {"count": 100, "p50_ms": 50.5, "p95_ms": 95.0})
+        self.assertEqual(list(report["stages"]), ["claimed", "total"])
+        self.assertEqual(percentile([3.0], 0.95), 3.0)
+
+    def test_utterance_log_keeps_only_recent_utterances(self):
+        log = UtteranceLog(capacity=2)
+        for position, utterance in enumerate(("a", "b", "c")):
+            log.record(utterance, float(position))
+
+        self.assertIsNone(log.ended_at("a"))
+        self.assertEqual(log.ended_at("c"), 2.0)
+        self.assertIsNone(log.ended_at(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import random
+import sys
+import unittest
+from difflib import SequenceMatcher
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "macro_pkg" / "macro"))
+
+from voice import matcher  # noqa: E402
+from voice.matcher import Matcher, similarity  # noqa: E402
+
+
+class SimilarityTest(unittest.TestCase):
+    def test_tiers_score_exact_then_ocr_variants_then_edits(self):
+        self.assertEqual(similarity("카페라떼", "카페라떼"), 1.0)
+        self.assertEqual(similarity("아메리카노i", "아메리카노l"), matcher.VARIANT_SCORE)
+        self.assertEqual(similarity("새우버거", "세우버거"), matcher.VARIANT_SCORE)
+        self.assertLess(similarity("카페라떼", "카페모카"), 0.72)
+
+    def test_digits_are_never_folded(self):
+        for wanted, observed in (("총수량1개", "총수량l개"), ("2잔", "z잔"), ("500원", "soo원")):
+            self.assertAlmostEqual(
+                similarity(wanted, observed), SequenceMatcher(None, wanted, observed).ratio()
+            )
+
+    def test_other_texts_score_the_sequence_matcher_ratio(self):
+        generator = random.Random(11)
+        alphabet = "라떼테레카케아이스 ab"
+        for _ in range(500):
+            first = "".join(generator.choice(alphabet) for _ in range(generator.randint(1, 9)))
+            second = "".join(generator.choice(alphabet) for _ in range(generator.randint(1, 9)))
+            if matcher.fold(first) == matcher.fold(second):
+                continue
+            expected = SequenceMatcher(None, first, second).ratio()
+            floor = generator.choice((0.0, 0.5, 0.72))
+            self.assertEqual(
+                similarity(first, second, floor),
+                expected if expected >= floor else 0.0,
+                (first, second, floor),
+            )
+
+    def test_fold_pairs_that_separate_candidates_are_dropped(self):
+        index = Matcher(["레몬에이드", "레몬애이드", "새우버거"])
+
+        self.assertNotIn(("ᅦ", "ᅢ"), index.folds)
+        self.assertIn(("ᅤ", "ᅢ"), index.folds)
+        self.assertEqual(index.variant("섀우버거"), "새우버거")
+        self.assertIsNone(index.variant("세우버거"))
+        self.assertEqual(index.variant("레몬얘이드"), "레몬애이드")
+        self.assertLess(index.score("레몬에이드", "레몬애이드"), matcher.VARIANT_SCORE)
+
+
+class MatcherTest(unittest.TestCase):
+    def test_best_agrees_with_a_linear_scan(self):
+        generator = random.Random(5)
+        syllables = "아메리카노라떼테모바닐스무디"
+        for _ in range(100):
+            names = [
+                "".join(generator.choice(syllables) for _ in range(generator.randint(2, 6)))
+                for _ in range(generator.randint(1, 30))
+            ]
+            index = Matcher(names)
+            query = "".join(generator.choice(syllables) for _ in range(generator.randint(1, 6)))
+            cutoff = generator.choice((0.0, 0.5, 0.72))
+            scanned = None
+            for name in index.candidates:
+                score = similarity(query, name, folds=index.folds)
+                if score and score >= cutoff and (scanned is None or score > scanned[1]):
+                    scanned = (name, score)
+            self.assertEqual(index.best(query, cutoff), scanned, (names, query, cutoff))
+
+    def test_bounds_never_drop_a_candidate_that_reaches_the_floor(self):
+        generator = random.Random(9)
+        syllables = "아메리카노라떼테모바닐스무디"
+        for _ in range(100):
+            names = [
+                "".join(generator.choice(syllables) for _ in range(generator.randint(1, 7)))
+                for _ in range(generator.randint(1, 40))
+            ]
+            index = Matcher(names)
+            query = generator.choice(
+                ["".join(generator.choice(syllables) for _ in range(generator.randint(1, 7)))] + names
+            )
+            floor = generator.choice((0.1, 0.27, 0.5, 0.64, 0.8))
+            bounds = dict((name, bound) for bound, name in index.bounds(query, floor))
+            for name in index.candidates:
+                score = similarity(query, name, floor, index.folds)
+                if score:
+                    self.assertIn(name, bounds, (names, query, floor))
+                    self.assertGreaterEqual(bounds[name] + 1e-9, score)
+                    self.assertEqual(index.score(query, name, floor), score)
+
+    def test_exact_and_variant_lookups_skip_edit_distance(self):
+        index = Matcher(["아이스 아메리카노", "새우 버거"])
+        index._folded = None  # any edit-distance path would now fail
+
+        self.assertEqual(index.best("아이스아메리카노"), ("아이스 아메리카노", 1.0))
+        self.assertEqual(index.best("세우버거"), ("새우 버거", matcher.VARIANT_SCORE))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,6 @@
+import difflib
 import json
+import random
 import sys
 import tempfile
 import unittest
@@ -11,6 +13,25 @@ sys.path.insert(0, str(ROOT / "macro_pkg" / "macro"))
 from voice.index_loader import MenuIndex  # noqa: E402
 
 
+SETTINGS = ROOT / "macro_pkg" / "settingPack"
+
+
+def difflib_menu_best(index, spoken, cutoff):
+    """``find_menu_best`` as it was before the tiered matcher."""
+    if spoken in index.name_to_entry:
+        return spoken
+    cand = difflib.get_close_matches(spoken, index.menu_names, n=1, cutoff=cutoff)
+    if cand:
+        return cand[0]
+    norm = index._normalize(spoken)
+    best, best_score = None, 0.0
+    for name in index.menu_names:
+        score = difflib.SequenceMatcher(None, norm, index._normalize(name)).ratio()
+        if score > best_score:
+            best, best_score = name, score
+    return best if best and best_score >= cutoff else None
+
+
 class MenuIndexTest(unittest.TestCase):
     def setUp(self):
         self.temp_dir = tempfile.TemporaryDirectory()
@@ -67,6 +88,50 @@ class MenuIndexTest(unittest.TestCase):
             ("아이스 아메리카노", "커피", 1, (300, 400)),
         )
 
+    def test_near_miss_syllable_matches_and_unrelated_name_does_not(self):
+        index = MenuIndex(str(self.ui_path), str(self.menu_path))
+
+        self.assertEqual(index.find_menu_best("아이스 아메리가노")[0], "아이스 아메리카노")
+        self.assertIsNone(index.find_menu_best("딸기 스무디"))
+
+
+class BundledMenuIndexTest(unittest.TestCase):
+    def test_decisions_match_difflib_except_for_ocr_variants(self):
+        index = MenuIndex(
+            str(SETTINGS / "kiosk_ui_coords_easyocr.json"), str(SETTINGS / "menu_cards.json")
+        )
+        generator = random.Random(3)
+        syllables = "가나다라마바사아자차카타파하곂떼레메이스노"
+        queries = ["곂닐라 라떼", "아이스아메리카노 2", "카페 라떼 1잔"]
+        for name in index.menu_names:
+            position = generator.randrange(len(name))
+            queries.extend(
+                (
+                    name.replace(" ", ""),
+                    name[:position] + name[position + 1 :],
+                    name[:position] + generator.choice(syllables) + name[position + 1 :],
+                    name.replace("에", "애", 1).replace("케", "캐", 1),
+                    name + " 1",
+                    "".join(generator.choice(syllables) for _ in range(len(name))),
+                )
+            )
+
+        variants = 0
+        for query in queries:
+            for cutoff in (0.72, 0.82):
+                expected = difflib_menu_best(index, query, cutoff)
+                found = index.find_menu_best(query, cutoff)
+                actual = found[0] if found else None
+                if expected is None and actual is not None:
+                    self.assertEqual(actual, index.matcher.variant(query), (query, cutoff))
+                    variants += 1
+                    continue
+                self.assertEqual(actual, expected, (query, cutoff))
+        self.assertEqual(
+            index.find_menu_best("곂닐라 라떼", 0.82)[0], difflib_menu_best(index, "곂닐라 라떼", 0.82)
+        )
+        self.assertLess(variants, len(queries))
+
 
 if __name__ == "__main__":
     unittest.main()
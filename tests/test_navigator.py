@@ -1,16 +1,22 @@
 import sys
+import time
 import unittest
+from dataclasses import replace
 from pathlib import Path
 from types import SimpleNamespace
+from unittest import mock
 
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "macro_pkg" / "macro"))
 
+from voice import grounding  # noqa: E402
 from voice.grounding import Target  # noqa: E402
+from voice import kiosk_profile  # noqa: E402
 from voice.kiosk_profile import KioskProfile, MenuRecord, ResolvedOrderItem  # noqa: E402
 from voice.navigator import Navigator  # noqa: E402
 from voice.perception import ObservedElement, Rect, ScreenObservation  # noqa: E402
+from voice.tracing import NULL_TRACER, Tracer  # noqa: E402
 
 
 def screen(texts, *, source="ocr", visual_hash="state"):
@@ -38,6 +44,37 @@ class ReplayObserver:
         return self.invoke_result
 
 
+class ProbingObserver(ReplayObserver):
+    """Replay observer that also offers the cheap change probe."""
+
+    def __init__(self, observations, probes, invoke=False):
+        super().__init__(observations, invoke)
+        self.probes = list(probes)
+        self.probe_index = 0
+        self.waits = 0
+
+    def probe(self):
+        value = self.probes[min(self.probe_index, len(self.probes) - 1)]
+        self.probe_index += 1
+        return value
+
+    def wait_for_change(self, token, timeout):
+        self.waits += 1
+
+
+class TracedObserver(ReplayObserver):
+    def __init__(self, observations, invoke=True):
+        super().__init__(observations, invoke)
+        self.tracer = NULL_TRACER
+
+    def set_tracer(self, tracer):
+        self.tracer = tracer
+
+    def observe(self):
+        with self.tracer.span("observe"):
+            return super().observe()
+
+
 def profile():
     return KioskProfile(
         {
@@ -161,6 +198,35 @@ class NavigatorTest(unittest.TestCase):
         self.assertEqual(replay.invoked, ["결제하기"])
         self.assertEqual(pointer, [])
 
+    def test_navigator_records_action_phases_inside_the_payment_route(self):
+        menu = screen(["커피", "결제하기"], source="uia", visual_hash="menu")
+        ready = screen(["결제 방법 선택", "카드 결제"], source="uia", visual_hash="ready")
+        observer = TracedObserver([menu, menu, ready, ready, ready])
+        nav = Navigator(
+            SimpleNamespace(category_centers={}, name_to_entry={}),
+            config(),
+            observer=observer,
+            profile=profile(),
+            sleeper=lambda _: None,
+        )
+        tracer = Tracer()
+        nav.use_tracer(tracer)
+
+        self.assertTrue(nav.navigate_to_payment_ready())
+        nav.use_tracer(NULL_TRACER)
+        self.assertIs(observer.tracer, NULL_TRACER)
+
+        spans = {span.name: span for span in tracer.spans}
+        self.assertLessEqual(
+            {"payment_ready", "activate", "grounding", "input", "stabilize", "observe"}, set(spans)
+        )
+        route, action = spans["payment_ready"], spans["activate"]
+        self.assertEqual(action.args, {"target": "checkout"})
+        self.assertLessEqual(route.start, action.start)
+        self.assertLessEqual(action.start + action.duration, route.start + route.duration)
+        for phase in ("grounding", "input", "stabilize"):
+            self.assertEqual(spans[phase].depth, action.depth + 1)
+
     @staticmethod
     def _item_screen(cart_text, visual_hash):
         return ScreenObservation(
@@ -231,6 +297,195 @@ class NavigatorTest(unittest.TestCase):
 
         self.assertTrue(nav.add_resolved_item(item))
 
+    def test_item_addition_reads_pages_from_full_observations(self):
+        before = self._item_screen("총 수량 0개", "before")
+        after = self._item_screen("총 수량 1개", "after")
+        replay = ReplayObserver([before, before, after, after, after], invoke=False)
+        regions = []
+        replay.observe_region = lambda region: regions.append(region) or replay.observe()
+        nav = Navigator(
+            SimpleNamespace(category_centers={"커피": (10, 10)}, name_to_entry={}),
+            config(),
+            observer=replay,
+            profile=profile(),
+            pointer=lambda _x, _y: None,
+            sleeper=lambda _: None,
+        )
+        item = ResolvedOrderItem(
+            "아메리카노",
+            MenuRecord("아이스 아메리카노", "커피", 1, (50, 100)),
+            1,
+        )
+
+        self.assertTrue(nav.add_resolved_item(item))
+        # A menu-region crop could cut off the page indicator go_to reads.
+        self.assertEqual(regions, [])
+
+    def test_item_targets_are_ranked_once_per_shared_observation(self):
+        before = self._item_screen("총 수량 0개", "before")
+        modal = ScreenObservation(
+            before.elements
+            + (ObservedElement("담기", Rect(60, 200, 140, 240), source="uia", role="ButtonControl"),),
+            200,
+            300,
+            visual_hash="modal",
+        )
+        after = self._item_screen("장바구니 1개", "after")
+        replay = ReplayObserver([before, modal, modal, after, after], invoke=True)
+        nav = Navigator(
+            SimpleNamespace(category_centers={"커피": (10, 10)}, name_to_entry={}),
+            config(),
+            observer=replay,
+            profile=profile(),
+            pointer=lambda _x, _y: None,
+            sleeper=lambda _: None,
+        )
+        item = ResolvedOrderItem(
+            "아메리카노",
+            MenuRecord("아이스 아메리카노", "커피", 1, (50, 100)),
+            1,
+        )
+        passes = []
+        rank_targets = grounding._rank_targets
+
+        def counting_rank(observation, targets, floor=0.0):
+            passes.append((observation, [target.key for target in targets]))
+            return rank_targets(observation, targets, floor)
+
+        grounding._memo.clear()
+        with mock.patch.object(grounding, "_rank_targets", counting_rank):
+            self.assertTrue(nav.add_resolved_item(item))
+
+        self.assertEqual(replay.invoked, ["아이스 아메리카노", "담기"])
+        targets = ["menu:아이스 아메리카노", "confirm-item", "checkout"]
+        self.assertEqual(len(passes), 2)
+        self.assertIs(passes[0][0], before)
+        self.assertIs(passes[1][0], modal)
+        self.assertEqual([keys for _, keys in passes], [targets, targets])
+
+    @staticmethod
+    def _stepper_screen(count, visual_hash):
+        screen = NavigatorTest._item_screen(f"총 수량 {count}개", visual_hash)
+        if not count:
+            return screen
+        line = (
+            ObservedElement("아이스 아메리카노", Rect(110, 150, 160, 170), source="uia", role="TextControl"),
+            ObservedElement("-", Rect(162, 150, 170, 170), source="uia", role="ButtonControl"),
+            ObservedElement(str(count), Rect(172, 150, 180, 170), source="uia", role="TextControl"),
+            ObservedElement("+", Rect(182, 150, 195, 170), source="uia", role="ButtonControl"),
+        )
+        return ScreenObservation(screen.elements + line, 200, 300, visual_hash=visual_hash)
+
+    def test_cart_stepper_adds_once_then_increments_and_reads_the_count(self):
+        before = self._stepper_screen(0, "before")
+        one, two, three = (self._stepper_screen(count, str(count)) for count in (1, 2, 3))
+        replay = ReplayObserver([before, before, one, one, two, two, three, three], invoke=False)
+        pointer = []
+        stepped = profile()
+        stepped.quantity_stepper = kiosk_profile._quantity_stepper(
+            {"location": "cart", "increment": {"labels": ["+"]}, "count_labels": ["{menu}-{count}+"]}
+        )
+        nav = Navigator(
+            SimpleNamespace(category_centers={"커피": (10, 10)}, name_to_entry={}),
+            config(),
+            observer=replay,
+            profile=stepped,
+            pointer=lambda x, y: pointer.append((x, y)),
+            sleeper=lambda _: None,
+        )
+        item = ResolvedOrderItem(
+            "아메리카노",
+            MenuRecord("아이스 아메리카노", "커피", 1, (50, 100)),
+            3,
+        )
+
+        self.assertTrue(nav.add_resolved_item(item))
+        self.assertEqual(pointer, [(50, 95), (188, 160), (188, 160)])
+        self.assertEqual(nav._cart_quantity(three, "아이스 아메리카노"), 3)
+        self.assertEqual(replay.index, 8)
+
+        doubled = self._stepper_screen(4, "4")
+        nav._observer = ReplayObserver([before, before, one, one, two, two, doubled, doubled], invoke=False)
+        nav.reset_navigation()
+        self.assertFalse(nav.add_resolved_item(item))
+        self.assertIn("cart quantity", nav.last_error)
+        self.assertTrue(nav.last_uncertain)
+
+    def test_close_releases_the_observer_once(self):
+        observer = SimpleNamespace(closed=0)
+        observer.close = lambda: setattr(observer, "closed", observer.closed + 1)
+        nav = Navigator(
+            SimpleNamespace(category_centers={}, name_to_entry={}),
+            config(),
+            observer=observer,
+            profile=profile(),
+        )
+
+        nav.close()
+        nav.close()
+
+        self.assertEqual(observer.closed, 1)
+
+    def test_cart_row_band_is_relative_to_the_window_origin(self):
+        stepped = profile()
+        stepped.quantity_stepper = kiosk_profile._quantity_stepper(
+            {"location": "cart", "increment": {"labels": ["+"]}, "count_labels": ["{menu}-{count}+"]}
+        )
+        nav = Navigator(
+            SimpleNamespace(category_centers={}, name_to_entry={}),
+            config(),
+            observer=object(),
+            profile=stepped,
+        )
+        at_top = self._stepper_screen(2, "2")
+        moved = ScreenObservation(
+            tuple(
+                replace(
+                    element,
+                    rect=Rect(
+                        element.rect.left + 300,
+                        element.rect.top + 400,
+                        element.rect.right + 300,
+                        element.rect.bottom + 400,
+                    ),
+                )
+                for element in at_top.elements
+            ),
+            200,
+            300,
+            visual_hash="2",
+            origin_x=300,
+            origin_y=400,
+        )
+
+        region, text = nav._cart_row(moved, "아이스 아메리카노")
+        self.assertEqual((region, text), nav._cart_row(at_top, "아이스 아메리카노"))
+        self.assertAlmostEqual(region[1], 0.5)
+        self.assertEqual(nav._cart_quantity(moved, "아이스 아메리카노"), 2)
+
+    def test_next_action_starts_from_the_last_verified_observation_while_fresh(self):
+        menu, option, cart = (screen([text], visual_hash=text) for text in ("담기", "옵션", "장바구니"))
+        replay = ReplayObserver([menu, option, option, cart, cart], invoke=False)
+        nav = Navigator(
+            SimpleNamespace(category_centers={}, name_to_entry={}),
+            config(),
+            observer=replay,
+            profile=profile(),
+            pointer=lambda _x, _y: None,
+            sleeper=lambda _: None,
+        )
+
+        self.assertTrue(nav.activate(Target("add", ("담기",)), expected_any=("옵션",)).success)
+        result = nav.activate(Target("option", ("옵션",)), expected_any=("장바구니",))
+
+        self.assertTrue(result.success)
+        self.assertIs(result.before, option)
+        self.assertEqual((replay.index, nav.reused_observations), (5, 1))
+
+        nav._last_verified = ScreenObservation(cart.elements, 200, 300, captured_at=time.monotonic() - 5)
+        self.assertIs(nav._current_observation(), cart)
+        self.assertEqual(replay.index, 6)
+
     def test_unpinned_live_runtime_is_rejected_before_observation(self):
         with self.assertRaises(ValueError):
             Navigator(
@@ -275,6 +530,130 @@ class NavigatorTest(unittest.TestCase):
         self.assertFalse(nav.go_page_from_one("커피", 2))
         self.assertEqual(nav.current_page, 1)
 
+    def test_go_to_continues_from_the_current_page_of_the_same_category(self):
+        index = SimpleNamespace(
+            category_centers={"커피": (10, 10), "음료": (20, 10)},
+            name_to_entry={},
+            next_xy=(50, 250),
+        )
+        nav = Navigator(index, config(dry_run=True), profile=profile(), sleeper=lambda _: None)
+
+        moves = []
+        for category, page in (("커피", 3), ("커피", 3), ("커피", 4), ("커피", 2), ("음료", 1)):
+            before = nav.navigation_transitions
+            self.assertTrue(nav.go_to(category, page))
+            moves.append(nav.navigation_transitions - before)
+
+        self.assertEqual(moves, [3, 0, 1, 2, 1])
+        self.assertEqual((nav.current_category, nav.current_page), ("음료", 1))
+
+
+    def test_go_to_turns_back_when_previous_is_shorter_than_the_category_restart(self):
+        index = SimpleNamespace(
+            category_centers={"커피": (10, 10)},
+            name_to_entry={},
+            next_xy=(50, 250),
+            prev_xy=(10, 250),
+        )
+        nav = Navigator(index, config(dry_run=True), profile=profile(), sleeper=lambda _: None)
+        self.assertTrue(nav.go_to("커피", 5))
+
+        moves = []
+        for page in (4, 1, 3):
+            before = nav.navigation_transitions
+            self.assertTrue(nav.go_to("커피", page))
+            moves.append(nav.navigation_transitions - before)
+
+        self.assertEqual(moves, [1, 1, 2])
+
+    def test_current_page_is_read_from_cards_or_the_page_indicator(self):
+        index = SimpleNamespace(
+            category_centers={"커피": (10, 10)},
+            name_to_entry={
+                "아메리카노": ("커피", 1, (20, 100)),
+                "카페라떼": ("커피", 1, (60, 100)),
+                "바닐라라떼": ("커피", 2, (20, 100)),
+                "카페모카": ("커피", 2, (60, 100)),
+                "콜드브루": ("커피", 3, (20, 100)),
+            },
+            next_xy=(50, 250),
+        )
+        nav = Navigator(index, config(), observer=ReplayObserver([]), profile=profile())
+
+        def wide(texts):
+            return ScreenObservation(screen(texts).elements, 1000, 300)
+
+        self.assertEqual(nav.detect_page(wide(["바닐라라떼", "카페모카"]), "커피"), 2)
+        self.assertIsNone(nav.detect_page(wide(["신메뉴", "3 / 3"]), "커피"))
+        nav.current_category = "커피"
+        self.assertEqual(nav.detect_page(wide(["신메뉴", "3 / 3"]), "커피"), 3)
+        self.assertIsNone(nav.detect_page(wide(["신메뉴", "2 / 7"]), "커피"))
+
+
+class EventDrivenWaitTest(unittest.TestCase):
+    def navigator(self, observer, **overrides):
+        return Navigator(
+            SimpleNamespace(category_centers={}, name_to_entry={}),
+            config(**{"transition_timeout_sec": 1.0, **overrides}),
+            observer=observer,
+            profile=profile(),
+            pointer=lambda _x, _y: None,
+            sleeper=lambda _: self.fail("probing observers must not poll"),
+        )
+
+    def test_settled_transition_needs_one_full_observation(self):
+        before = screen(["담기"], visual_hash="before")
+        after = screen(["장바구니"], visual_hash="after")
+        observer = ProbingObserver([before, after], ["moving", "settled"])
+
+        result = self.navigator(observer).activate(
+            Target("add", ("담기",)), expected_any=("장바구니",)
+        )
+
+        self.assertTrue(result.success)
+        self.assertIs(result.after, after)
+        self.assertEqual(observer.index, 2)
+
+    def test_change_after_the_candidate_requires_a_new_stable_reading(self):
+        before = screen(["담기"], visual_hash="before")
+        interim = screen(["장바구니 1"], visual_hash="interim")
+        final = screen(["장바구니 2"], visual_hash="final")
+        observer = ProbingObserver([before, interim, final], ["a", "a", "a", "b"])
+
+        result = self.navigator(observer).activate(
+            Target("add", ("담기",)), expected_any=("장바구니",)
+        )
+
+        self.assertTrue(result.success)
+        self.assertIs(result.after, final)
+
+    def test_unchanged_screen_is_not_reobserved_before_the_poll_interval(self):
+        unchanged = screen(["담기"], visual_hash="same")
+        observer = ProbingObserver([unchanged], ["same"])
+
+        result = self.navigator(
+            observer, transition_timeout_sec=0.01, transition_poll_sec=1.0
+        ).activate(
+            Target("add", ("담기",))
+        )
+
+        self.assertFalse(result.success)
+        self.assertIn("postcondition", result.error)
+        self.assertEqual(observer.index, 2)
+
+    def test_change_missed_by_the_probe_is_found_by_the_fallback_reading(self):
+        before = screen(["담기"], visual_hash="before")
+        after = screen(["장바구니"], visual_hash="after")
+        observer = ProbingObserver([before, before, after, after], ["no-event"])
+
+        result = self.navigator(observer).activate(
+            Target("add", ("담기",)), expected_any=("장바구니",)
+        )
+
+        self.assertTrue(result.success)
+        self.assertIs(result.after, after)
+        self.assertEqual(observer.index, 4)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -23,6 +23,7 @@ class FakeNavigator:
             name_to_entry={
                 "아메리카노": ("커피", 1, (100, 200)),
                 "레몬에이드": ("음료", 2, (300, 400)),
+                "카페라떼": ("커피", 2, (300, 200)),
             }
         )
         self.cfg = SimpleNamespace(
@@ -140,6 +141,9 @@ class OrderMacroTest(unittest.TestCase):
         self.assertTrue(result["awaiting_handoff"])
         self.assertFalse(result["requires_manual_review"])
         self.assertEqual(navigator.payment_calls, 1)
+        stamps = result["stamps"]
+        self.assertEqual(list(stamps), ["perform_started", "cart_ready", "payment_ready"])
+        self.assertLessEqual(stamps["perform_started"], stamps["payment_ready"])
 
     def test_unverified_payment_screen_fails_the_requested_full_flow(self):
         navigator = FakeNavigator(
@@ -229,6 +233,33 @@ class OrderMacroTest(unittest.TestCase):
         self.assertTrue(retry["cancelled"])
         self.assertEqual(navigator.item_calls, [("아메리카노", 1)])
 
+    def test_grouping_is_opt_in_and_results_stay_in_spoken_order(self):
+        navigator = FakeNavigator()
+        navigator.cfg.order_grouping = True
+        order = [
+            {"name": "카페라떼", "count": 1},
+            {"name": "레몬에이드", "count": 1},
+            {"name": "아메리카노", "count": 2},
+        ]
+
+        result = OrderMacro(navigator).perform(order)
+
+        self.assertEqual(
+            navigator.item_calls, [("아메리카노", 2), ("카페라떼", 1), ("레몬에이드", 1)]
+        )
+        self.assertEqual([row["name"] for row in result["results"]], ["카페라떼", "레몬에이드", "아메리카노"])
+        self.assertEqual(result["navigation"]["planned_order"], [2, 0, 1])
+        self.assertEqual(result["navigation"]["expected_transitions"], 4)
+        self.assertIsNone(result["navigation"]["actual_transitions"])
+
+        navigator = FakeNavigator()
+        navigator.navigation_transitions = 0
+        result = OrderMacro(navigator).perform(order)
+
+        self.assertEqual([name for name, _ in navigator.item_calls], ["카페라떼", "레몬에이드", "아메리카노"])
+        self.assertEqual(result["navigation"]["expected_transitions"], 5)
+        self.assertEqual(result["navigation"]["actual_transitions"], 0)
+
     def test_overlapping_order_is_rejected_without_actions(self):
         navigator = FakeNavigator()
         macro = OrderMacro(navigator)
@@ -1,22 +1,31 @@
+import sqlite3
 import sys
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
+from unittest import mock
 
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "macro_pkg" / "macro"))
 
-from voice.order_queue import OrderQueue  # noqa: E402
+from voice.order_queue import OrderQueue, queue_options  # noqa: E402
 
 
 class OrderQueueTest(unittest.TestCase):
     def setUp(self):
         self.directory = tempfile.TemporaryDirectory()
-        self.queue = OrderQueue(str(Path(self.directory.name) / "orders.sqlite3"))
+        # Cleanups run last-in first-out, so every queue opened later is
+        # closed before the directory is removed; Windows keeps open files.
+        self.addCleanup(self.directory.cleanup)
+        self.queue = self.open(str(Path(self.directory.name) / "orders.sqlite3"))
 
-    def tearDown(self):
-        self.directory.cleanup()
+    def open(self, path, **options):
+        queue = OrderQueue(path, **options)
+        self.addCleanup(queue.close)
+        return queue
 
     def test_fifo_claim_and_result_are_durable(self):
         first, _, _ = self.queue.enqueue([{"name": "A"}], idempotency_key="one")
@@ -29,6 +38,18 @@ class OrderQueueTest(unittest.TestCase):
         self.assertEqual(self.queue.status(first), "succeeded")
         self.assertEqual(self.queue.claim_next().order_id, "two")
 
+    def test_undelivered_claim_returns_to_the_queue(self):
+        self.queue.enqueue([{"name": "A"}], idempotency_key="one")
+        self.queue.claim_next()
+
+        self.assertTrue(self.queue.release_claim("one"))
+        self.assertEqual(self.queue.status("one"), "queued")
+        self.assertEqual(self.queue.claim_next().attempt, 1)
+
+        self.queue.complete("one", {"success": True})
+        self.assertFalse(self.queue.release_claim("one"))
+        self.assertEqual(self.queue.status("one"), "succeeded")
+
     def test_idempotency_key_does_not_replace_existing_order(self):
         first = self.queue.enqueue([{"name": "A"}], idempotency_key="same")
         second = self.queue.enqueue([{"name": "A"}], idempotency_key="same")
@@ -63,7 +84,7 @@ class OrderQueueTest(unittest.TestCase):
         self.queue.enqueue([{"name": "B"}], idempotency_key="second")
 
         self.assertEqual(self.queue.claim_next().order_id, "first")
-        self.assertIsNone(OrderQueue(self.queue.path).claim_next())
+        self.assertIsNone(self.open(self.queue.path).claim_next())
         self.assertEqual(self.queue.status("second"), "queued")
 
     def test_side_effect_uncertainty_is_persisted_and_blocks_next_claim(self):
@@ -96,6 +117,150 @@ class OrderQueueTest(unittest.TestCase):
         )
         self.assertEqual(self.queue.claim_next().order_id, "second")
 
+    def test_correlation_id_and_stage_stamps_follow_the_order(self):
+        self.queue.enqueue([{"name": "A"}], idempotency_key="first", correlation_id="utterance-1")
+        self.queue.enqueue([{"name": "B"}], idempotency_key="second")
+
+        claimed = self.queue.claim_next()
+        self.assertEqual(claimed.correlation_id, "utterance-1")
+        self.queue.complete(
+            "first",
+            {"success": True, "stamps": {"perform_started": 1e12, "claimed": -1.0, "unknown": 1.0}},
+        )
+        self.assertEqual(self.queue.claim_next().correlation_id, "second")
+
+        history = self.queue.stage_history()
+        self.assertEqual([row["correlation_id"] for row in history], ["utterance-1"])
+        stamps = history[0]["stamps"]
+        self.assertEqual(list(stamps), ["enqueued", "claimed", "perform_started", "completed"])
+        self.assertLessEqual(stamps["enqueued"], stamps["claimed"])
+        self.assertLessEqual(stamps["claimed"], stamps["completed"])
+
+    def test_existing_database_gains_latency_columns(self):
+        path = str(Path(self.directory.name) / "legacy.sqlite3")
+        connection = sqlite3.connect(path)
+        with connection:
+            connection.execute(
+                "CREATE TABLE orders (order_id TEXT PRIMARY KEY, payload TEXT NOT NULL, "
+                "status TEXT NOT NULL CHECK(status IN ('queued', 'claimed', 'awaiting_handoff', "
+                "'succeeded', 'failed', 'uncertain')), attempts INTEGER NOT NULL DEFAULT 0, "
+                "created_at TEXT NOT NULL, claimed_at TEXT, completed_at TEXT, result TEXT)"
+            )
+            connection.execute(
+                "INSERT INTO orders (order_id, payload, status, created_at) "
+                "VALUES ('old', '[{\"name\": \"A\"}]', 'queued', '2026-01-01')"
+            )
+        connection.close()
+
+        claimed = self.open(path).claim_next()
+        self.assertEqual((claimed.order_id, claimed.correlation_id), ("old", "old"))
+
+    def test_waiting_claim_returns_as_soon_as_an_order_arrives(self):
+        for writer, key in ((self.queue, "same-process"), (self.open(self.queue.path), "other-process")):
+            timer = threading.Timer(0.05, writer.enqueue, ([{"name": "A"}],), {"idempotency_key": key})
+            started = time.monotonic()
+            timer.start()
+            claimed = self.queue.claim_next(wait=5.0)
+            timer.join()
+
+            self.assertEqual(claimed.order_id, key)
+            self.assertLess(time.monotonic() - started, 2.0)
+            self.queue.complete(key, {"success": True})
+
+    def test_waiting_claim_times_out_while_an_order_is_in_flight(self):
+        self.queue.enqueue([{"name": "A"}], idempotency_key="first")
+        self.queue.enqueue([{"name": "B"}], idempotency_key="second")
+        self.queue.claim_next()
+
+        started = time.monotonic()
+        self.assertIsNone(self.queue.claim_next(wait=0.1))
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+
+        threading.Timer(0.05, self.queue.complete, ("first", {"success": True})).start()
+        self.assertEqual(self.queue.claim_next(wait=5.0).order_id, "second")
+
+    def test_waiting_claims_share_one_watcher_and_close_wakes_them(self):
+        self.assertIsNone(self.queue.claim_next(wait=0.01))
+        watcher = self.queue._watcher
+        self.assertIsNone(self.queue.claim_next(wait=0.01))
+        self.assertIs(self.queue._watcher, watcher)
+
+        claimed = []
+        waiter = threading.Thread(target=lambda: claimed.append(self.queue.claim_next(wait=30.0)))
+        waiter.start()
+        time.sleep(0.05)
+        started = time.monotonic()
+        self.queue.close()
+        waiter.join(5.0)
+
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(claimed, [None])
+        self.assertLess(time.monotonic() - started, 1.0)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            watcher.execute("SELECT 1")
+
+    def test_connections_are_pooled_and_released_by_close(self):
+        opened = []
+        original = OrderQueue._connect
+
+        def counting_connect(queue):
+            connection = original(queue)
+            opened.append(connection)
+            return connection
+
+        with mock.patch.object(OrderQueue, "_connect", counting_connect):
+            queue = self.open(str(Path(self.directory.name) / "pooled.sqlite3"), synchronous="normal")
+            for key in ("a", "b", "c"):
+                queue.enqueue([{"name": key}], idempotency_key=key)
+            queue.claim_next()
+            queue.list_orders()
+
+        self.assertEqual(len(opened), 1)
+        self.assertEqual(opened[0].execute("PRAGMA synchronous").fetchone()[0], 1)
+        queue.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            opened[0].execute("SELECT 1")
+        wal = Path(queue.path + "-wal")
+        self.assertTrue(not wal.exists() or wal.stat().st_size == 0)
+        with self.assertRaisesRegex(RuntimeError, "closed"):
+            queue.status("a")
+        self.assertEqual(self.open(queue.path).status("b"), "queued")
+
+    def test_pool_is_shared_by_threads_within_its_bound(self):
+        queue = self.open(str(Path(self.directory.name) / "threads.sqlite3"), pool_size=2)
+        errors = []
+
+        def enqueue(key):
+            try:
+                queue.enqueue([{"name": key}], idempotency_key=key)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=enqueue, args=(f"order-{n}",)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(queue.list_orders()), 8)
+        self.assertLessEqual(len(queue._idle), 2)
+        with self.assertRaises(ValueError):
+            OrderQueue(queue.path, synchronous="sometimes")
+
+    def test_invalid_environment_options_fall_back_to_defaults(self):
+        environment = {
+            "KIOSK_ORDER_DB_POOL": "many",
+            "KIOSK_ORDER_DB_SYNCHRONOUS": "sometimes",
+            "KIOSK_ORDER_DB_CHECKPOINT_PAGES": "-5",
+        }
+        with mock.patch.dict("os.environ", environment):
+            options = queue_options()
+
+        self.assertEqual(options, {"pool_size": 4, "synchronous": "FULL", "checkpoint_pages": 1000})
+        with mock.patch.dict("os.environ", {"KIOSK_ORDER_DB_SYNCHRONOUS": " normal "}):
+            self.assertEqual(queue_options()["synchronous"], "NORMAL")
+
 
 if __name__ == "__main__":
     unittest.main()
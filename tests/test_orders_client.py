@@ -7,6 +7,7 @@ from types import SimpleNamespace
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "macro_pkg" / "macro"))
 
+from voice.latency import UtteranceLog  # noqa: E402
 from voice.orders_client import OrdersClient  # noqa: E402
 
 
@@ -107,6 +108,47 @@ class OrdersClientTest(unittest.TestCase):
         self.assertEqual(http.order_gets, 1)
         self.assertEqual(len(http.posts), 1)
 
+    def test_result_carries_correlation_id_and_utterance_end(self):
+        utterances = UtteranceLog()
+        utterances.record("utterance-1", 5.0)
+        client = OrdersClient(SimpleNamespace(), SimpleNamespace(), utterances=utterances)
+
+        result = client._correlate(
+            {"order_id": "a", "correlation_id": "utterance-1"},
+            {"success": True, "stamps": {"perform_started": 6.0}},
+        )
+
+        self.assertEqual(result["correlation_id"], "utterance-1")
+        self.assertEqual(result["stamps"], {"perform_started": 6.0, "utterance_end": 5.0})
+        self.assertEqual(client._correlate({"order_id": "a"}, {"success": True}), {"success": True})
+
+    def test_claims_long_poll_the_hub_without_client_side_sleeping(self):
+        class LongPollHTTP(FakeHTTP):
+            def __init__(self):
+                super().__init__()
+                self.claims = []
+
+            def get(self, url, headers, timeout, params=None):
+                if url.endswith("/api/mic-pulse"):
+                    return FakeResponse(status_code=204)
+                self.claims.append((params, timeout))
+                client.running = len(self.claims) < 2
+                return FakeResponse(status_code=204)
+
+        http = LongPollHTTP()
+        cfg = SimpleNamespace(
+            orders_url="http://127.0.0.1:9999/api/orders",
+            orders_token="test-token",
+            orders_poll_interval_sec=0,
+            orders_wait_sec=2.5,
+        )
+        client = OrdersClient(cfg, SimpleNamespace(), http=http)
+        client.running = True
+
+        client._tick()
+
+        self.assertEqual(http.claims, [({"wait": "2.5"}, 4.5), ({"wait": "2.5"}, 4.5)])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,11 @@
 import sys
 import os
+import socket
+import tempfile
+import threading
+import time
 import unittest
+from http.server import ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import patch
 
@@ -8,7 +13,17 @@ from unittest.mock import patch
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "macro_pkg" / "macro"))
 
-from ordersHub import idempotency_key, is_authorized, validate_hub_security  # noqa: E402
+import ordersHub  # noqa: E402
+from ordersHub import (  # noqa: E402
+    OrdersHandler,
+    claim_wait,
+    client_disconnected,
+    correlation_id,
+    idempotency_key,
+    is_authorized,
+    validate_hub_security,
+)
+from voice.order_queue import OrderQueue  # noqa: E402
 
 
 class OrdersHubTest(unittest.TestCase):
@@ -32,6 +47,65 @@ class OrdersHubTest(unittest.TestCase):
             idempotency_key({"sessionId": "session", "items": [{"name": "A"}]})
         )
 
+    def test_correlation_id_prefers_header_then_backend_payload(self):
+        payload = {"utteranceId": "utterance", "items": [{"name": "A"}]}
+
+        self.assertEqual(correlation_id(payload, " header "), "header")
+        self.assertEqual(correlation_id(payload), "utterance")
+        self.assertEqual(correlation_id({**payload, "correlationId": "explicit"}), "explicit")
+        self.assertIsNone(correlation_id([{"name": "A"}]))
+
+    def test_claim_wait_is_optional_capped_and_validated(self):
+        self.assertEqual(claim_wait("", 30.0), 0.0)
+        self.assertEqual(claim_wait("wait=2.5", 30.0), 2.5)
+        self.assertEqual(claim_wait("wait=600", 30.0), 30.0)
+        for query in ("wait=-1", "wait=nan", "wait=soon"):
+            with self.assertRaises(ValueError):
+                claim_wait(query, 30.0)
+
+    def test_client_disconnect_is_seen_without_consuming_the_request(self):
+        hub, client = socket.socketpair()
+        self.addCleanup(hub.close)
+        self.assertFalse(client_disconnected(hub))
+        client.close()
+        self.assertTrue(client_disconnected(hub))
+
+    def test_claim_for_a_client_that_gave_up_returns_to_the_queue(self):
+        token = "t" * 32
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        orders = OrderQueue(str(Path(directory.name) / "orders.sqlite3"))
+        self.addCleanup(orders.close)
+        released = threading.Event()
+        release_claim = orders.release_claim
+
+        def releasing(order_id):
+            try:
+                return release_claim(order_id)
+            finally:
+                released.set()
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), OrdersHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        with patch.object(ordersHub, "_queue", orders), patch.object(
+            orders, "release_claim", releasing
+        ), patch.dict(os.environ, {"KIOSK_ORDER_TOKEN": token}):
+            client = socket.create_connection(server.server_address)
+            client.sendall(
+                (
+                    "GET /api/orders?wait=5 HTTP/1.1\r\n"
+                    f"Host: hub\r\nX-Macro-Token: {token}\r\n\r\n"
+                ).encode("ascii")
+            )
+            time.sleep(0.1)
+            client.close()
+            orders.enqueue([{"name": "A"}], idempotency_key="late")
+            self.assertTrue(released.wait(5.0))
+
+        self.assertEqual(orders.status("late"), "queued")
+
     def test_live_hub_requires_a_long_installation_token(self):
         with patch.dict(
             os.environ,
@@ -0,0 +1,935 @@
+import sys
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "macro_pkg" / "macro"))
+
+from voice.capture import CaptureSession  # noqa: E402
+from voice.ocr_cache import OCRResultCache  # noqa: E402
+from voice.ocr_tiles import TileChangeDetector  # noqa: E402
+from voice.perception import (  # noqa: E402
+    HybridScreenObserver,
+    OCRCancelled,
+    OCRProvider,
+    ObservedElement,
+    Rect,
+    ScreenObservation,
+    UIAutomationProvider,
+    _batch_scope,
+)
+
+
+class FakeControl:
+    """UIA control double that counts every cross-process property read."""
+
+    reads = 0
+
+    def __init__(self, runtime_id, name, rect, role="TextControl", children=()):
+        self._runtime_id = runtime_id
+        self._name = name
+        self._rect = rect
+        self._role = role
+        self.children = list(children)
+
+    def _read(self, value):
+        FakeControl.reads += 1
+        return value
+
+    @property
+    def Name(self):
+        return self._read(self._name)
+
+    @property
+    def ControlTypeName(self):
+        return self._read(self._role)
+
+    @property
+    def BoundingRectangle(self):
+        return self._read(self._rect)
+
+    @property
+    def IsOffscreen(self):
+        return self._read(False)
+
+    @property
+    def IsEnabled(self):
+        return self._read(True)
+
+    @property
+    def AutomationId(self):
+        return self._read(f"id-{self._runtime_id}")
+
+    def GetRuntimeId(self):
+        return self._read([42, self._runtime_id])
+
+    def GetSelectionItemPattern(self):
+        self._read(None)
+        raise RuntimeError("pattern unavailable")
+
+    def GetChildren(self):
+        return self._read(list(self.children))
+
+
+def fake_tree(cart_text="총 수량 0개"):
+    menu = [
+        FakeControl(10 + index, f"메뉴{index}", (10, 100 + index * 50, 300, 140 + index * 50))
+        for index in range(12)
+    ]
+    menu_panel = FakeControl(2, "", (0, 80, 700, 1600), role="PaneControl", children=menu)
+    cart_line = FakeControl(3, cart_text, (720, 100, 1070, 140))
+    cart_panel = FakeControl(4, "", (700, 0, 1080, 1920), role="PaneControl", children=[cart_line])
+    root = FakeControl(1, "키오스크", (0, 0, 1080, 1920), role="WindowControl")
+    root.children = [menu_panel, cart_panel]
+    return root, cart_line
+
+
+def observe_counting(provider, root):
+    FakeControl.reads = 0
+    texts = [element.text for element in provider.observe_root(root)]
+    return texts, FakeControl.reads
+
+
+class UIATreeCacheTest(unittest.TestCase):
+    def test_cached_walk_matches_uncached_walk(self):
+        root, _ = fake_tree()
+        uncached, _ = observe_counting(UIAutomationProvider(tree_cache=False), root)
+        provider = UIAutomationProvider()
+        provider.change_events_active = True
+        first, _ = observe_counting(provider, root)
+        second, _ = observe_counting(provider, root)
+
+        self.assertEqual(first, uncached)
+        self.assertEqual(second, uncached)
+
+    def test_clean_subtrees_are_reused_while_change_events_are_active(self):
+        root, _ = fake_tree()
+        provider = UIAutomationProvider()
+        provider.change_events_active = True
+        _, first_reads = observe_counting(provider, root)
+        _, second_reads = observe_counting(provider, root)
+
+        self.assertLess(second_reads * 5, first_reads)
+        self.assertEqual(provider.last_walk_stats["read"], 0)
+
+    def test_changed_control_is_rewalked_without_rereading_siblings(self):
+        root, cart_line = fake_tree()
+        provider = UIAutomationProvider()
+        provider.change_events_active = True
+        observe_counting(provider, root)
+
+        cart_line._name = "총 수량 1개"
+        provider.mark_changed([42, 3])
+        texts, _ = observe_counting(provider, root)
+
+        self.assertIn("총 수량 1개", texts)
+        self.assertNotIn("총 수량 0개", texts)
+        # Only the window, the cart pane, and the cart line are re-read.
+        self.assertEqual(provider.last_walk_stats["read"], 3)
+
+    def test_structure_probe_detects_added_children_without_an_event(self):
+        root, _ = fake_tree()
+        provider = UIAutomationProvider()
+        provider.change_events_active = True
+        observe_counting(provider, root)
+
+        modal = FakeControl(99, "옵션 선택", (100, 500, 900, 900), role="WindowControl")
+        root.children.append(modal)
+        texts, _ = observe_counting(provider, root)
+
+        self.assertIn("옵션 선택", texts)
+
+    def test_without_change_events_immutable_properties_are_still_cached(self):
+        root, cart_line = fake_tree()
+        provider = UIAutomationProvider()
+        _, first_reads = observe_counting(provider, root)
+        cart_line._name = "총 수량 1개"
+        texts, second_reads = observe_counting(provider, root)
+
+        self.assertIn("총 수량 1개", texts)
+        self.assertLess(second_reads, first_reads)
+        self.assertEqual(provider.last_walk_stats["reused"], 0)
+
+    def test_unknown_changed_control_forces_a_full_walk(self):
+        root, _ = fake_tree()
+        provider = UIAutomationProvider()
+        provider.change_events_active = True
+        observe_counting(provider, root)
+
+        provider.mark_changed([42, 12345])
+        observe_counting(provider, root)
+
+        self.assertEqual(provider.last_walk_stats["reused"], 0)
+
+
+class FakeCachedArray:
+    def __init__(self, elements):
+        self.elements = list(elements)
+        self.Length = len(self.elements)
+
+    def GetElement(self, index):
+        return self.elements[index]
+
+
+class FakeCachedElement:
+    """IUIAutomationElement double whose Cached* values need no round trip."""
+
+    def __init__(self, name, rect, control_type=50020, children=(), selected=None):
+        self.CachedName = name
+        self.CachedBoundingRectangle = rect
+        self.CachedControlType = control_type
+        self.CachedIsOffscreen = False
+        self.CachedIsEnabled = True
+        self.CachedAutomationId = ""
+        self.children = list(children)
+        self.selected = selected
+        self.selection_reads = 0
+
+    def GetCachedChildren(self):
+        return FakeCachedArray(self.children) if self.children else None
+
+    def GetCachedPropertyValue(self, property_id):
+        self.selection_reads += 1
+        return self.selected
+
+
+class FakeRootElement:
+    def __init__(self, cached):
+        self.cached = cached
+        self.round_trips = 0
+
+    def BuildUpdatedCache(self, request):
+        self.round_trips += 1
+        return self.cached
+
+
+class UIABatchedObservationTest(unittest.TestCase):
+    def test_subtree_is_materialized_from_one_cache_request(self):
+        label = FakeCachedElement("아메리카노 4,500원", (10, 10, 300, 60))
+        hot = FakeCachedElement("따뜻하게", (10, 100, 200, 160), control_type=50013, selected=True)
+        ice = FakeCachedElement("아이스", (220, 100, 400, 160), control_type=50013, selected=False)
+        hidden = FakeCachedElement("숨김", (10, 200, 200, 260), control_type=50000)
+        hidden.CachedIsOffscreen = True
+        window = FakeCachedElement(
+            "", (0, 0, 1080, 1920), control_type=50032, children=[label, hot, ice, hidden]
+        )
+        root = FakeRootElement(window)
+
+        elements = UIAutomationProvider().observe_batched(root, request=object())
+
+        self.assertEqual(root.round_trips, 1)
+        self.assertEqual(
+            [(element.text, element.role, element.selected) for element in elements],
+            [
+                ("아이스", "RadioButtonControl", False),
+                ("따뜻하게", "RadioButtonControl", True),
+                ("아메리카노 4,500원", "TextControl", None),
+            ],
+        )
+        self.assertEqual(label.selection_reads, 0)
+        self.assertEqual(hot.selection_reads, 1)
+
+    def test_unsupported_selection_value_is_not_reported_as_selected(self):
+        item = FakeCachedElement("카페 라떼", (10, 10, 300, 60), control_type=50007)
+        item.selected = object()  # UIA ReservedNotSupportedValue
+        window = FakeCachedElement("", (0, 0, 1080, 1920), control_type=50032, children=[item])
+
+        elements = UIAutomationProvider().observe_batched(FakeRootElement(window), object())
+
+        self.assertIsNone(elements[0].selected)
+
+    def test_batched_subtree_respects_the_depth_bound(self):
+        leaf = FakeCachedElement("깊은 항목", (10, 10, 300, 60))
+        parent = FakeCachedElement("", (0, 0, 1080, 1920), control_type=50033, children=[leaf])
+        window = FakeCachedElement("", (0, 0, 1080, 1920), control_type=50032, children=[parent])
+
+        elements = UIAutomationProvider(max_depth=1).observe_batched(
+            FakeRootElement(window), object()
+        )
+
+        self.assertEqual(elements, [])
+
+    def test_stale_element_is_skipped_without_failing_the_observation(self):
+        class StaleElement(FakeCachedElement):
+            @property
+            def CachedName(self):
+                raise OSError("element not available")
+
+            @CachedName.setter
+            def CachedName(self, value):
+                pass
+
+        stale = StaleElement("사라진 항목", (10, 10, 300, 60))
+        label = FakeCachedElement("아메리카노 4,500원", (10, 100, 300, 160))
+        window = FakeCachedElement(
+            "", (0, 0, 1080, 1920), control_type=50032, children=[stale, label]
+        )
+
+        elements = UIAutomationProvider().observe_batched(FakeRootElement(window), object())
+
+        self.assertEqual([element.text for element in elements], ["아메리카노 4,500원"])
+
+    def test_cache_scope_is_narrowed_for_shallow_depth_bounds(self):
+        self.assertEqual(_batch_scope(0), 1)
+        self.assertEqual(_batch_scope(1), 3)
+        self.assertEqual(_batch_scope(10), 7)
+
+    def test_clean_window_reuses_the_batched_result_without_a_round_trip(self):
+        label = FakeCachedElement("아메리카노 4,500원", (10, 10, 300, 60))
+        window = FakeCachedElement("", (0, 0, 1080, 1920), control_type=50032, children=[label])
+        root = FakeRootElement(window)
+        provider = UIAutomationProvider()
+        provider.change_events_active = True
+
+        first = provider.observe_batched(root, object())
+        second = provider.observe_batched(root, object())
+        self.assertEqual(root.round_trips, 1)
+        self.assertEqual(second, first)
+        self.assertEqual(provider.last_walk_stats["reused"], 1)
+
+        label.CachedName = "카페 라떼 5,000원"
+        provider.mark_changed([42, 7])
+        changed = provider.observe_batched(root, object())
+        self.assertEqual(root.round_trips, 2)
+        self.assertEqual([element.text for element in changed], ["카페 라떼 5,000원"])
+
+    def test_full_and_region_observations_share_one_batched_cache(self):
+        menu = FakeCachedElement("아메리카노 4,500원", (10, 10, 300, 60))
+        cart = FakeCachedElement("총 수량 1개", (600, 10, 900, 60))
+        window = FakeCachedElement(
+            "", (0, 0, 1080, 1920), control_type=50032, children=[menu, cart]
+        )
+        root = FakeRootElement(window)
+        provider = UIAutomationProvider()
+        provider.change_events_active = True
+
+        full = provider.observe_batched(root, object())
+        menu_only = provider.observe_batched(root, object(), region=Rect(0, 0, 540, 1920))
+        again = provider.observe_batched(root, object())
+
+        self.assertEqual(root.round_trips, 1)
+        self.assertEqual(len(full), 2)
+        self.assertEqual([element.text for element in menu_only], ["아메리카노 4,500원"])
+        self.assertEqual(again, full)
+
+    def test_batched_result_is_not_reused_without_change_events(self):
+        window = FakeCachedElement("", (0, 0, 1080, 1920), control_type=50032)
+        root = FakeRootElement(window)
+        provider = UIAutomationProvider()
+
+        provider.observe_batched(root, object())
+        provider.observe_batched(root, object())
+
+        self.assertEqual(root.round_trips, 2)
+
+    def test_handlers_for_the_previous_window_are_removed(self):
+        removed = []
+        client = SimpleNamespace(
+            IUIAutomation=SimpleNamespace(
+                RemoveStructureChangedEventHandler=lambda element, handler: removed.append(
+                    ("structure", element, handler)
+                ),
+                RemovePropertyChangedEventHandler=lambda element, handler: removed.append(
+                    ("property", element, handler)
+                ),
+            )
+        )
+        automation = SimpleNamespace(
+            _AutomationClient=SimpleNamespace(instance=lambda: client)
+        )
+        provider = UIAutomationProvider()
+        provider._event_handler, provider._event_root = "handler", "old window"
+        provider.change_events_active = True
+
+        provider._unregister_change_events(automation)
+        provider._unregister_change_events(automation)
+
+        self.assertEqual(
+            removed,
+            [("structure", "old window", "handler"), ("property", "old window", "handler")],
+        )
+        self.assertFalse(provider.change_events_active)
+
+
+class FakeFrame:
+    """Screen capture double: text boxes stand in for pixels."""
+
+    def __init__(self, texts, width=1080, height=1920, left=0, top=0):
+        self.texts = texts
+        self.left, self.top = left, top
+        self.shape = (height, width, 3)
+
+    def __getitem__(self, key):
+        rows, cols = key
+        return FakeFrame(
+            self.texts,
+            cols.stop - cols.start,
+            rows.stop - rows.start,
+            self.left + cols.start,
+            self.top + rows.start,
+        )
+
+    def bounds(self):
+        return Rect(self.left, self.top, self.left + self.shape[1], self.top + self.shape[0])
+
+    def fingerprint(self):
+        bounds = self.bounds()
+        return tuple(
+            sorted(
+                (text, box)
+                for text, box in self.texts
+                if box[0] < bounds.right
+                and bounds.left < box[2]
+                and box[1] < bounds.bottom
+                and bounds.top < box[3]
+            )
+        )
+
+
+class FakeReader:
+    def __init__(self):
+        self.pixels = 0
+
+    def readtext(self, frame):
+        bounds = frame.bounds()
+        self.pixels += frame.shape[0] * frame.shape[1]
+        found = []
+        for text, (left, top, right, bottom) in frame.texts:
+            if (
+                left >= bounds.left
+                and top >= bounds.top
+                and right <= bounds.right
+                and bottom <= bounds.bottom
+            ):
+                x0, y0 = left - bounds.left, top - bounds.top
+                x1, y1 = right - bounds.left, bottom - bounds.top
+                found.append((((x0, y0), (x1, y0), (x1, y1), (x0, y1)), text, 0.9))
+        return found
+
+
+def menu_screen(cart_lines):
+    texts = [
+        (f"메뉴{index}", (20 + (index % 2) * 360, 200 + (index // 2) * 240, 300 + (index % 2) * 360, 240 + (index // 2) * 240))
+        for index in range(10)
+    ]
+    texts.extend(
+        (line, (760, 120 + row * 60, 1060, 160 + row * 60)) for row, line in enumerate(cart_lines)
+    )
+    return FakeFrame(texts)
+
+
+def tile_provider(reader):
+    provider = OCRProvider()
+    provider.tiles = TileChangeDetector(8, 4, hasher=lambda tile: tile.fingerprint())
+    provider._reader = reader
+    provider.result_cache = None
+    return provider
+
+
+def element_set(elements):
+    return sorted((element.text, element.rect) for element in elements)
+
+
+class TileDiffOCRTest(unittest.TestCase):
+    def test_changed_cart_region_matches_a_full_ocr_pass(self):
+        reader = FakeReader()
+        provider = tile_provider(reader)
+        provider.recognize(menu_screen(["아이스 아메리카노 1", "총 수량 1개"]))
+        full_pixels = reader.pixels
+
+        reader.pixels = 0
+        after = menu_screen(["아이스 아메리카노 1", "카페 라떼 1", "총 수량 2개"])
+        merged = provider.recognize(after)
+
+        full = OCRProvider(tile_diff=False, cache_entries=0)
+        full._reader = FakeReader()
+        self.assertEqual(element_set(merged), element_set(full.recognize(after)))
+        self.assertTrue(provider.last_dirty_regions)
+        self.assertLess(reader.pixels * 4, full_pixels)
+
+    def test_unchanged_frame_reuses_previous_text_without_recognition(self):
+        reader = FakeReader()
+        provider = tile_provider(reader)
+        first = provider.recognize(menu_screen(["총 수량 1개"]))
+        reader.pixels = 0
+
+        second = provider.recognize(menu_screen(["총 수량 1개"]))
+
+        self.assertEqual(reader.pixels, 0)
+        self.assertEqual(element_set(first), element_set(second))
+
+    def test_removed_text_in_a_dirty_tile_is_not_carried_over(self):
+        reader = FakeReader()
+        provider = tile_provider(reader)
+        provider.recognize(menu_screen(["아이스 아메리카노 1", "총 수량 1개"]))
+
+        merged = provider.recognize(menu_screen(["총 수량 0개"]))
+
+        texts = [element.text for element in merged]
+        self.assertNotIn("아이스 아메리카노 1", texts)
+        self.assertNotIn("총 수량 1개", texts)
+        self.assertIn("총 수량 0개", texts)
+
+    def test_large_change_falls_back_to_full_recognition(self):
+        detector = TileChangeDetector(2, 2, hasher=lambda tile: tile.fingerprint())
+        detector.update(FakeFrame([("A", (10, 10, 100, 50))], 200, 200))
+
+        changed = FakeFrame(
+            [("B", (10, 10, 90, 50)), ("C", (110, 10, 190, 50)), ("D", (10, 110, 90, 150))],
+            200,
+            200,
+        )
+
+        self.assertIsNone(detector.update(changed))
+        self.assertIsNone(detector.update(FakeFrame([], 100, 100)))
+
+    def test_default_digest_marks_a_one_glyph_change_dirty(self):
+        quantity_one = PixelFrame(64, 64, [(40, 20), (40, 21), (40, 22)])
+        quantity_two = PixelFrame(64, 64, [(40, 20), (40, 21), (41, 22)])
+        detector = TileChangeDetector(2, 2)
+        detector.update(quantity_one)
+
+        self.assertEqual(detector.update(PixelFrame(64, 64, [(40, 20), (40, 21), (40, 22)])), [])
+        self.assertEqual(detector.update(quantity_two), [Rect(32, 0, 64, 32)])
+
+
+class PixelFrame:
+    """Pixel grid double with the slicing and ``tobytes`` a BGR frame offers."""
+
+    def __init__(self, width, height, dark=(), rows=None):
+        self.rows = rows or [
+            bytes(0 if (x, y) in set(dark) else 255 for x in range(width) for _ in range(3))
+            for y in range(height)
+        ]
+        self.shape = (len(self.rows), len(self.rows[0]) // 3, 3)
+
+    def __getitem__(self, key):
+        rows, cols = key
+        return PixelFrame(
+            0, 0, rows=[row[cols.start * 3 : cols.stop * 3] for row in self.rows[rows]]
+        )
+
+    def tobytes(self):
+        return b"".join(self.rows)
+
+
+def frame_key(frame):
+    return repr((frame.shape, frame.fingerprint()))
+
+
+class OCRResultCacheTest(unittest.TestCase):
+    def test_repeated_screen_resolves_without_running_the_recognizer(self):
+        reader = FakeReader()
+        provider = OCRProvider(tile_diff=False)
+        provider.result_cache = OCRResultCache(8, key=frame_key)
+        provider._reader = reader
+        menu = menu_screen(["총 수량 0개"])
+
+        first = provider.recognize(menu)
+        provider.recognize(menu_screen(["총 수량 1개"]))
+        reader.pixels = 0
+        again = provider.recognize(menu)
+
+        self.assertEqual(reader.pixels, 0)
+        self.assertEqual(element_set(first), element_set(again))
+        self.assertEqual(provider.result_cache.stats()["hits"], 1)
+        self.assertEqual(provider.result_cache.stats()["misses"], 2)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = OCRResultCache(2)
+        cache.put("a", [("A", 0.9, (0, 0, 1, 1))])
+        cache.put("b", [("B", 0.9, (0, 0, 1, 1))])
+        cache.get("a")
+        cache.put("c", [("C", 0.9, (0, 0, 1, 1))])
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_spilled_cache_is_warm_after_restart_for_the_same_model_only(self):
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "ocr-cache.json")
+            cache = OCRResultCache(4, path=path, namespace="model-a")
+            cache.put("screen", [("결제하기", 0.93, (10, 20, 110, 60))])
+            cache.flush()
+
+            warm = OCRResultCache(4, path=path, namespace="model-a")
+            other = OCRResultCache(4, path=path, namespace="model-b")
+
+            self.assertEqual(warm.get("screen"), (("결제하기", 0.93, (10, 20, 110, 60)),))
+            self.assertEqual(len(other), 0)
+
+
+class FakeGrabber:
+    monitors = [{}, {"left": 0, "top": 0, "width": 1080, "height": 1920}]
+
+    def __init__(self):
+        self.grabs = []
+        self.closed = False
+
+    def grab(self, region):
+        self.grabs.append(dict(region))
+        return ("shot", region["width"], region["height"])
+
+    def close(self):
+        self.closed = True
+
+
+def fake_window(handle=77, title="Kiosk"):
+    from types import SimpleNamespace
+
+    return SimpleNamespace(
+        _hWnd=handle, title=title, left=100, top=0, width=1080, height=1920, isMinimized=False
+    )
+
+
+class CaptureSessionTest(unittest.TestCase):
+    def session(self, windows, rects=None):
+        grabbers = []
+        enumerations = []
+
+        def factory():
+            grabbers.append(FakeGrabber())
+            return grabbers[-1]
+
+        def list_windows():
+            enumerations.append(1)
+            return windows()
+
+        buffers = []
+
+        def convert(shot, buffer):
+            buffers.append(buffer)
+            return shot, buffer or ["preallocated"]
+
+        session = CaptureSession(
+            "Kiosk",
+            grabber_factory=factory,
+            list_windows=list_windows,
+            window_rect=rects or (lambda handle: {"left": 100, "top": 0, "width": 1080, "height": 1920}),
+            convert=convert,
+            windows_platform=True,
+        )
+        return session, grabbers, enumerations, buffers
+
+    def test_grabber_window_and_buffer_persist_across_frames(self):
+        session, grabbers, enumerations, buffers = self.session(lambda: [fake_window()])
+
+        for _ in range(3):
+            frame, region = session.grab(session.target_region())
+
+        self.assertEqual(len(grabbers), 1)
+        self.assertEqual(len(enumerations), 1)
+        self.assertEqual(buffers, [None, ["preallocated"], ["preallocated"]])
+        self.assertEqual(region["left"], 100)
+        self.assertEqual(frame, ("shot", 1080, 1920))
+        self.assertEqual(set(session.last_timings), {"locate", "grab", "convert"})
+
+        session.close()
+        self.assertTrue(grabbers[0].closed)
+
+    def test_lost_handle_reenumerates_and_rejects_a_different_window(self):
+        current = [fake_window(77)]
+        session, _, enumerations, _ = self.session(lambda: current, rects=lambda handle: None)
+        session.target_region()
+
+        current[:] = [fake_window(78)]
+        with self.assertRaises(RuntimeError):
+            session.target_region()
+        self.assertEqual(len(enumerations), 2)
+
+    def test_ambiguous_title_is_rejected_on_first_binding(self):
+        session, _, _, _ = self.session(lambda: [fake_window(1), fake_window(2)])
+
+        with self.assertRaises(RuntimeError):
+            session.target_region()
+
+    def test_unpinned_session_uses_the_configured_monitor(self):
+        session, grabbers, _, _ = self.session(lambda: [])
+        session.window_title = ""
+
+        self.assertIsNone(session.target_region())
+        _, region = session.grab(None)
+        self.assertEqual(region["width"], 1080)
+        self.assertEqual(grabbers[0].grabs, [FakeGrabber.monitors[1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class OCRWarmupTest(unittest.TestCase):
+    def provider(self, reader_factory):
+        provider = OCRProvider(tile_diff=False, cache_entries=0)
+        provider._create_reader = reader_factory
+        provider._warmup_image = lambda: menu_screen(["워밍업"])
+        return provider
+
+    def test_background_warmup_loads_once_and_reports_timings(self):
+        created = []
+
+        def factory():
+            created.append(FakeReader())
+            return created[-1]
+
+        provider = self.provider(factory)
+        self.assertEqual(provider.readiness()["state"], "cold")
+
+        provider.start_warmup().join(timeout=5)
+        provider.recognize(menu_screen(["결제하기"]))
+
+        readiness = provider.readiness()
+        self.assertEqual(readiness["state"], "ready")
+        self.assertIn("load_sec", readiness)
+        self.assertIn("first_inference_sec", readiness)
+        self.assertEqual(len(created), 1)
+
+    def test_failed_warmup_is_reported_without_raising(self):
+        def factory():
+            raise RuntimeError("model files are missing")
+
+        provider = self.provider(factory)
+
+        self.assertFalse(provider.warm_up())
+        self.assertEqual(provider.readiness()["state"], "failed")
+        self.assertIn("model files", provider.readiness()["error"])
+
+
+class FakeCapture:
+    window_handle = None
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.last_timings = {}
+        self.frame = {"left": 0, "top": 0, "width": 1080, "height": 1920}
+
+    def target_region(self):
+        return self.frame
+
+    def monitor_region(self):
+        return self.frame
+
+    def grab(self, region=None):
+        region = region or self.frame
+        left, top = region["left"], region["top"]
+        image = self.screen[top : top + region["height"], left : left + region["width"]]
+        return image, region
+
+    def close(self):
+        pass
+
+
+def ocr_observer(screen, reader):
+    cfg = SimpleNamespace(
+        kiosk_window_title="",
+        uia_enabled=False,
+        ocr_tile_diff=False,
+        ocr_cache_entries=0,
+    )
+    observer = HybridScreenObserver(cfg)
+    observer.capture = observer.ocr.capture = FakeCapture(screen)
+    observer.ocr._reader = reader
+    observer.ocr.visual_hash = lambda image: repr(image.fingerprint())
+    return observer
+
+
+class RegionObservationTest(unittest.TestCase):
+    CART_REGION = (0.68, 0.0, 1.0, 0.3)
+
+    def test_cart_region_is_read_from_a_crop_in_window_coordinates(self):
+        reader = FakeReader()
+        observer = ocr_observer(menu_screen(["아이스 아메리카노 1", "총 수량 1개"]), reader)
+        full = observer.observe()
+        full_pixels, reader.pixels = reader.pixels, 0
+
+        scoped = observer.observe(self.CART_REGION)
+
+        self.assertLess(reader.pixels * 3, full_pixels)
+        self.assertEqual(scoped.texts, ("아이스 아메리카노 1", "총 수량 1개"))
+        self.assertEqual((scoped.width, scoped.height), (full.width, full.height))
+        self.assertEqual(
+            {element.rect for element in scoped.elements},
+            {
+                element.rect
+                for element in full.elements
+                if element.text in scoped.texts
+            },
+        )
+        self.assertNotEqual(scoped.signature, full.signature)
+
+    def test_uia_walk_skips_subtrees_outside_the_region(self):
+        root, _ = fake_tree()
+        provider = UIAutomationProvider()
+        provider.change_events_active = True
+
+        texts = [
+            element.text
+            for element in provider.observe_root(root, region=Rect(700, 0, 1080, 600))
+        ]
+        skipped = provider.last_walk_stats["skipped"]
+        full, _ = observe_counting(provider, root)
+
+        self.assertIn("총 수량 0개", texts)
+        self.assertNotIn("메뉴0", texts)
+        self.assertEqual(skipped, 1)
+        self.assertIn("메뉴0", full)
+
+
+class ObserverProbeTest(unittest.TestCase):
+    def test_probe_tracks_the_frame_the_last_observation_read(self):
+        reader = FakeReader()
+        observer = ocr_observer(menu_screen(["총 수량 0개"]), reader)
+        observer.ocr.tiles = TileChangeDetector(8, 4, hasher=lambda tile: tile.fingerprint())
+        self.assertIsNone(observer.probe())
+
+        observer.observe()
+        settled = observer.probe()
+        reader.pixels = 0
+
+        self.assertEqual(observer.probe(), settled)
+        observer.capture.screen = menu_screen(["총 수량 1개"])
+        self.assertNotEqual(observer.probe(), settled)
+        self.assertEqual(reader.pixels, 0)
+
+    def test_uia_probe_requires_change_events(self):
+        provider = UIAutomationProvider()
+        observer = HybridScreenObserver(SimpleNamespace(kiosk_window_title="", ocr_enabled=False))
+        observer.uia = provider
+        observer._probe_sources = ("uia",)
+
+        self.assertIsNone(observer.probe())
+        provider.change_events_active = True
+        settled = observer.probe()
+        provider.mark_changed([42, 3])
+
+        self.assertNotEqual(observer.probe(), settled)
+        self.assertTrue(provider.wait_for_change(settled[0], 0))
+
+
+class FakeUIA:
+    last_root_rect = None
+    change_events_active = False
+
+    def __init__(self, texts, delay=0.0):
+        self.texts = texts
+        self.delay = delay
+
+    def bind_window(self, handle):
+        pass
+
+    def close(self):
+        pass
+
+    def observe(self, region=None):
+        time.sleep(self.delay)
+        return [
+            ObservedElement(text, Rect(760, 120 + row * 60, 1060, 160 + row * 60), source="uia")
+            for row, text in enumerate(self.texts)
+        ]
+
+
+class ParallelObservationTest(unittest.TestCase):
+    def observer(self, uia, cart_lines):
+        reader = FakeReader()
+        observer = ocr_observer(menu_screen(cart_lines), reader)
+        observer.uia = uia
+        observer.parallel = True
+        observer.uia_latency_budget_sec = 0.01
+        self.addCleanup(observer.close)
+        return observer, reader
+
+    def test_slow_but_sufficient_uia_drops_the_speculative_ocr(self):
+        lines = ["아이스 아메리카노 1", "카페라떼 1", "총 수량 2개"]
+        observer, reader = self.observer(FakeUIA(lines, delay=0.05), lines)
+
+        observation = observer.observe()
+        observer.close()
+
+        self.assertGreater(reader.pixels, 0)
+        self.assertEqual({element.source for element in observation.elements}, {"uia"})
+        self.assertIn("uia", observation.timings)
+        self.assertGreaterEqual(observation.timings["total"], observation.timings["uia"])
+
+    def test_thin_uia_result_is_merged_with_ocr_in_both_modes(self):
+        for parallel in (True, False):
+            observer, _ = self.observer(FakeUIA(["총 수량 1개"]), ["총 수량 1개"])
+            observer.parallel = parallel
+
+            observation = observer.observe()
+
+            self.assertEqual(observation.texts.count("총 수량 1개"), 1, parallel)
+            self.assertIn("메뉴0", observation.texts)
+            self.assertEqual(set(observation.timings), {"uia", "ocr", "total"})
+
+    def test_uia_meeting_the_minimum_element_count_skips_ocr(self):
+        lines = ["아이스 아메리카노 1", "총 수량 1개"]
+        for parallel in (True, False):
+            observer, reader = self.observer(FakeUIA(lines), lines)
+            observer.parallel = parallel
+            observer.uia_min_elements = 2
+
+            observation = observer.observe()
+
+            self.assertEqual(reader.pixels, 0, parallel)
+            self.assertEqual(observation.texts, tuple(lines))
+
+    def test_empty_uia_result_falls_back_to_ocr(self):
+        observer, _ = self.observer(FakeUIA([]), ["총 수량 1개"])
+
+        observation = observer.observe()
+
+        self.assertIn("메뉴0", observation.texts)
+        self.assertIn("총 수량 1개", observation.texts)
+        self.assertEqual(set(observation.timings), {"uia", "ocr", "total"})
+
+    def test_cancelled_ocr_stops_between_regions_and_forgets_tile_state(self):
+        reader = FakeReader()
+        provider = tile_provider(reader)
+        provider.recognize(menu_screen(["총 수량 0개"]))
+        reader.pixels = 0
+        reads = []
+
+        with self.assertRaises(OCRCancelled):
+            provider.recognize(
+                menu_screen(["아이스 아메리카노 1", "총 수량 1개"]),
+                cancelled=lambda: reads.append(1) or len(reads) > 1,
+            )
+
+        self.assertEqual(reader.pixels, 0)
+        full = provider.recognize(menu_screen(["아이스 아메리카노 1", "총 수량 1개"]))
+        self.assertIn("아이스 아메리카노 1", [element.text for element in full])
+        self.assertIsNone(provider.last_dirty_regions)
+
+
+class ObservationDerivedValuesTest(unittest.TestCase):
+    def observation(self, text="총 수량 1개"):
+        elements = (
+            ObservedElement(text, Rect(760, 120, 1060, 160), role="TextControl"),
+            ObservedElement(" ", Rect(0, 0, 10, 10)),
+        )
+        return ScreenObservation(elements, 1080, 1920, visual_hash="frame")
+
+    def test_derived_values_are_computed_once_and_shared(self):
+        observation = self.observation()
+
+        signature = observation.signature
+        self.assertIs(observation.signature, signature)
+        self.assertIs(observation.normalized_texts, observation.normalized_texts)
+        self.assertEqual(observation.normalized_texts, ("총수량1개", ""))
+        self.assertEqual(observation.visible_texts, ("총수량1개",))
+        self.assertAlmostEqual(observation.normalized_centers[0][0], 910 / 1080)
+
+    def test_memo_does_not_leak_across_copies(self):
+        from dataclasses import replace
+
+        observation = self.observation()
+        signature = observation.signature
+        changed = replace(observation, elements=self.observation("총 수량 2개").elements)
+
+        self.assertNotEqual(changed.signature, signature)
+        self.assertEqual(self.observation().signature, signature)
@@ -0,0 +1,195 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "macro_pkg" / "macro"))
+
+from voice import profile_bundle  # noqa: E402
+from voice.errors import ProfileError  # noqa: E402
+from voice.index_loader import MenuIndex  # noqa: E402
+from voice.kiosk_profile import KioskProfile  # noqa: E402
+from voice.navigator import Navigator  # noqa: E402
+from voice.profile_bundle import (  # noqa: E402
+    ProfileStore,
+    compile_bundle,
+    read_bundle,
+    validate_sources,
+    write_bundle,
+)
+
+
+SETTINGS = ROOT / "macro_pkg" / "settingPack"
+SOURCES = ("kiosk_profile.json", "menu_cards.json", "kiosk_ui_coords_easyocr.json")
+
+
+class ProfileBundleTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        for name in SOURCES:
+            shutil.copy(SETTINGS / name, self.root / name)
+        self.paths = tuple(str(self.root / name) for name in SOURCES)
+        self.artifact = str(self.root / "cache" / "profile.bundle")
+        self.now = [0.0]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def edit_cards(self, change, mtime_ns=None):
+        path = self.root / "menu_cards.json"
+        cards = json.loads(path.read_text(encoding="utf-8"))
+        change(cards)
+        path.write_text(json.dumps(cards, ensure_ascii=False), encoding="utf-8")
+        stamp = mtime_ns or os.stat(path).st_mtime_ns + 1_000_000_000
+        os.utime(path, ns=(stamp, stamp))
+
+    def store(self, **options):
+        return ProfileStore(*self.paths, clock=lambda: self.now[0], **options)
+
+    def test_compiled_bundle_resolves_like_separately_loaded_sources(self):
+        bundle = compile_bundle(*self.paths)
+        index = MenuIndex(self.paths[2], self.paths[1])
+        profile = KioskProfile.load(self.paths[0], index)
+
+        for raw in ({"name": "아이스 아메리카노"}, {"name": "카페라떼", "temperature": "HOT"}):
+            self.assertEqual(
+                bundle.profile.resolve_order_item(raw).menu, profile.resolve_order_item(raw).menu
+            )
+        self.assertEqual(bundle.index.name_to_entry, index.name_to_entry)
+        self.assertIs(bundle.graph, bundle.profile.transition_graph())
+
+    def test_artifact_round_trips_and_rejects_corruption(self):
+        bundle = compile_bundle(*self.paths)
+        write_bundle(bundle, self.artifact)
+
+        loaded = read_bundle(self.artifact)
+        self.assertEqual(loaded.sources, bundle.sources)
+        self.assertEqual(loaded.profile.resolve_order_item({"name": "카페라떼"}).menu.name, "카페 라떼")
+
+        blob = bytearray(Path(self.artifact).read_bytes())
+        blob[-5] ^= 0xFF
+        Path(self.artifact).write_bytes(bytes(blob))
+        with self.assertRaisesRegex(ProfileError, "checksum"):
+            read_bundle(self.artifact)
+        Path(self.artifact).write_bytes(bytes(blob[:6]))
+        with self.assertRaisesRegex(ProfileError, "truncated"):
+            read_bundle(self.artifact)
+
+    def test_validation_reports_cross_file_inconsistencies(self):
+        profile = json.loads((self.root / SOURCES[0]).read_text(encoding="utf-8"))
+        cards = json.loads((self.root / SOURCES[1]).read_text(encoding="utf-8"))
+        ui = json.loads((self.root / SOURCES[2]).read_text(encoding="utf-8"))
+        self.assertEqual(validate_sources(profile, cards, ui), [])
+
+        cards.append(dict(cards[0], name=cards[0]["name"].replace(" ", "")))
+        cards[1]["category"] = "주류"
+        profile["transitions"][0]["destination"] = "receipt"
+        problems = validate_sources(profile, cards, ui)
+
+        self.assertEqual(len(problems), 3, problems)
+        self.edit_cards(lambda rows: rows[0].update(page=0))
+        with self.assertRaisesRegex(ProfileError, "page must be a positive integer"):
+            compile_bundle(*self.paths)
+
+    def test_store_loads_a_matching_artifact_without_compiling(self):
+        self.store(artifact_path=self.artifact).load()
+
+        with mock.patch.object(profile_bundle, "compile_bundle", side_effect=AssertionError):
+            bundle = self.store(artifact_path=self.artifact).load()
+        self.assertEqual(len(bundle.profile.menu_records), len(bundle.index.name_to_entry))
+
+        self.edit_cards(lambda rows: rows[0].update(page=2))
+        bundle = self.store(artifact_path=self.artifact).load()
+        self.assertEqual(bundle.index.name_to_entry[bundle.profile.menu_records[0].name][1], 2)
+
+    def test_store_reloads_changed_sources_and_keeps_last_good_bundle(self):
+        store = self.store(check_interval=1.0)
+        first = store.load()
+        path = self.root / "menu_cards.json"
+        os.utime(path, ns=(1, 1))
+        self.now[0] = 2.0
+        self.assertIs(store.current(), first)
+
+        self.edit_cards(lambda rows: rows[0].update(page=3))
+        self.now[0] = 2.5
+        self.assertIs(store.current(), first)
+        self.now[0] = 4.0
+        second = store.current()
+        self.assertIsNot(second, first)
+        self.assertEqual(store.generation, 2)
+
+        self.edit_cards(lambda rows: rows[0].update(category="주류"))
+        self.now[0] = 6.0
+        self.assertIs(store.current(), second)
+        self.assertIn("not a ui category", store.last_error)
+
+    def test_navigator_adopts_reloaded_profile_only_when_refreshed(self):
+        store = self.store(check_interval=0.0)
+        bundle = store.load()
+        nav = Navigator(
+            bundle.index,
+            SimpleNamespace(dry_run=True),
+            observer=object(),
+            profile=bundle.profile,
+            profiles=store,
+        )
+        self.assertFalse(nav.refresh_profile())
+
+        self.edit_cards(lambda rows: rows[0].update(page=4))
+        nav.current_page = 2
+        self.assertIs(nav.profile, bundle.profile)
+        self.assertTrue(nav.refresh_profile())
+        self.assertIsNot(nav.profile, bundle.profile)
+        self.assertEqual(nav.idx.name_to_entry[nav.profile.menu_records[0].name][1], 4)
+        self.assertEqual(nav.current_page, 1)
+
+    def test_navigator_reports_a_failed_reload_once(self):
+        store = self.store(check_interval=0.0)
+        bundle = store.load()
+        nav = Navigator(
+            bundle.index,
+            SimpleNamespace(dry_run=True),
+            observer=object(),
+            profile=bundle.profile,
+            profiles=store,
+        )
+        store.artifact_error = "profile artifact not written: disk full"
+        with mock.patch("builtins.print") as printed:
+            nav.refresh_profile()
+        printed.assert_not_called()
+
+        self.edit_cards(lambda rows: rows[0].update(category="주류"))
+        with mock.patch("builtins.print") as printed:
+            self.assertFalse(nav.refresh_profile())
+            self.assertFalse(nav.refresh_profile())
+        self.assertEqual(printed.call_count, 1)
+        self.assertIn("not a ui category", printed.call_args[0][0])
+
+    def test_artifact_holds_plain_data_and_is_validated_on_load(self):
+        write_bundle(compile_bundle(*self.paths), self.artifact)
+        blob = Path(self.artifact).read_bytes()
+        header_length = profile_bundle._PREFIX.unpack_from(blob)[2]
+        payload = json.loads(blob[profile_bundle._PREFIX.size + header_length :])
+        self.assertEqual(set(payload), {"profile", "menu_cards", "ui_coords"})
+
+        payload["menu_cards"][0]["category"] = "주류"
+        write_bundle(
+            profile_bundle.ProfileBundle(
+                None, None, None, (), (payload["profile"], payload["menu_cards"], payload["ui_coords"])
+            ),
+            self.artifact,
+        )
+        with self.assertRaisesRegex(ProfileError, "not a ui category"):
+            read_bundle(self.artifact)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import random
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "macro_pkg" / "macro"))
+
+from voice.perception import HybridScreenObserver, ObservedElement, Rect  # noqa: E402
+from voice.spatial import GridIndex  # noqa: E402
+
+
+def naive_deduplicate(elements):
+    kept = []
+    for candidate in sorted(elements, key=lambda item: (item.source != "uia", -item.confidence)):
+        normalized = "".join(candidate.text.split()).casefold()
+        if not any(
+            "".join(existing.text.split()).casefold() == normalized
+            and abs(existing.rect.center[0] - candidate.rect.center[0]) < 20
+            and abs(existing.rect.center[1] - candidate.rect.center[1]) < 20
+            for existing in kept
+        ):
+            kept.append(candidate)
+    return tuple(kept)
+
+
+class GridIndexTest(unittest.TestCase):
+    def test_rectangle_and_neighbour_queries_match_brute_force(self):
+        generator = random.Random(3)
+        points = [(generator.uniform(-0.1, 1.1), generator.uniform(-0.1, 1.1)) for _ in range(300)]
+        grid = GridIndex.build(points, 1 / 16)
+        for _ in range(50):
+            left, right = sorted(generator.uniform(-0.2, 1.2) for _ in range(2))
+            top, bottom = sorted(generator.uniform(-0.2, 1.2) for _ in range(2))
+            x, y = generator.uniform(0, 1), generator.uniform(0, 1)
+
+            self.assertEqual(
+                grid.within(left, top, right, bottom),
+                [
+                    position
+                    for position, (px, py) in enumerate(points)
+                    if left <= px <= right and top <= py <= bottom
+                ],
+            )
+            self.assertEqual(
+                sorted(grid.near(x, y, 0.05, 0.08)),
+                [
+                    position
+                    for position, (px, py) in enumerate(points)
+                    if abs(px - x) < 0.05 and abs(py - y) < 0.08
+                ],
+            )
+
+    def test_grid_deduplication_matches_pairwise_scan(self):
+        generator = random.Random(11)
+        elements = [
+            ObservedElement(
+                generator.choice(["아메리카노", "카페 라떼", "카페라떼", "다음"]),
+                Rect(x, y, x + generator.randint(40, 200), y + 40),
+                source=generator.choice(["uia", "ocr"]),
+                confidence=generator.random(),
+            )
+            for x, y in (
+                (generator.randint(0, 400), generator.randint(0, 400)) for _ in range(400)
+            )
+        ]
+
+        self.assertEqual(
+            HybridScreenObserver._deduplicate(elements), naive_deduplicate(elements)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
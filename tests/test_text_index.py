@@ -0,0 +1,68 @@
+import random
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "macro_pkg" / "macro"))
+
+from voice.perception import ObservedElement, Rect, ScreenObservation  # noqa: E402
+from voice.text_index import ObservationIndex, PatternSet  # noqa: E402
+
+
+def naive_present(patterns, texts):
+    return {
+        pattern
+        for pattern in patterns
+        if pattern and any(pattern == text or pattern in text for text in texts if text)
+    }
+
+
+class ObservationIndexTest(unittest.TestCase):
+    def test_automaton_matches_naive_substring_search(self):
+        generator = random.Random(7)
+        alphabet = "아메리카노라떼ab"
+        for _ in range(200):
+            texts = [
+                "".join(generator.choice(alphabet) for _ in range(generator.randint(0, 8)))
+                for _ in range(generator.randint(0, 6))
+            ]
+            patterns = [
+                "".join(generator.choice(alphabet) for _ in range(generator.randint(1, 4)))
+                for _ in range(generator.randint(1, 60))
+            ]
+            index = ObservationIndex(texts)
+
+            self.assertEqual(
+                set(PatternSet(patterns).search("\n".join(texts))), naive_present(patterns, texts)
+            )
+            self.assertEqual(set(index.present(patterns)), naive_present(patterns, texts))
+
+    def test_patterns_never_match_across_two_texts(self):
+        index = ObservationIndex(["아이스", "아메리카노"])
+
+        self.assertTrue(index.contains("아메리"))
+        self.assertFalse(index.contains("스아메"))
+        self.assertEqual(index.positions("아이스"), (0,))
+        self.assertEqual(index.present(["스\n아", "아이스"]), frozenset({"아이스"}))
+
+    def test_region_index_is_built_once_per_observation_and_region(self):
+        observation = ScreenObservation(
+            (
+                ObservedElement("페이지2 메뉴", Rect(10, 10, 90, 40)),
+                ObservedElement("총 수량 1개", Rect(110, 10, 190, 40)),
+            ),
+            200,
+            100,
+        )
+        menu = observation.text_index((0.0, 0.0, 0.5, 1.0))
+
+        self.assertIs(observation.text_index((0.0, 0.0, 0.5, 1.0)), menu)
+        self.assertTrue(menu.contains("페이지2"))
+        self.assertFalse(menu.contains("총수량"))
+        self.assertTrue(observation.text_index().contains("총수량"))
+
+
+if __name__ == "__main__":
+    unittest.main()
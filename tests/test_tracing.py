@@ -0,0 +1,101 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "macro_pkg" / "macro"))
+
+from voice.index_loader import MenuIndex  # noqa: E402
+from voice.kiosk_profile import KioskProfile  # noqa: E402
+from voice.macro import OrderMacro  # noqa: E402
+from voice.navigator import Navigator  # noqa: E402
+from voice.tracing import NULL_TRACER, Tracer  # noqa: E402
+
+
+SETTINGS = ROOT / "macro_pkg" / "settingPack"
+
+
+class TracerTest(unittest.TestCase):
+    def test_spans_nest_and_export_as_chrome_complete_events(self):
+        now = [10.0]
+
+        def clock():
+            now[0] += 0.5
+            return now[0]
+
+        tracer = Tracer(clock=clock)
+        with tracer.span("activate", target="checkout"):
+            with tracer.span("observe"):
+                pass
+            with tracer.span("observe"):
+                pass
+
+        events = tracer.chrome_trace()["traceEvents"]
+        self.assertEqual([event["name"] for event in events], ["activate", "observe", "observe"])
+        self.assertEqual({event["ph"] for event in events}, {"X"})
+        self.assertEqual(events[0]["ts"], 500000.0)
+        self.assertEqual(events[0]["dur"], 2500000.0)
+        self.assertEqual(events[0]["args"], {"target": "checkout"})
+        self.assertEqual([span.depth for span in tracer.spans], [1, 1, 0])
+
+        summary = tracer.summary()
+        self.assertEqual(list(summary["spans"]), ["activate", "observe"])
+        self.assertEqual(summary["spans"]["observe"], {"count": 2, "total_ms": 1000.0, "max_ms": 500.0})
+        self.assertEqual(summary["elapsed_ms"], 3000.0)
+
+    def test_order_result_carries_a_trace_summary_and_writes_the_chrome_trace(self):
+        index = MenuIndex(
+            str(SETTINGS / "kiosk_ui_coords_easyocr.json"), str(SETTINGS / "menu_cards.json")
+        )
+        with tempfile.TemporaryDirectory() as trace_dir:
+            cfg = SimpleNamespace(
+                dry_run=True, allow_payment_navigation=False, trace_orders=True, trace_dir=trace_dir
+            )
+            nav = Navigator(
+                index,
+                cfg,
+                observer=object(),
+                profile=KioskProfile.load(str(SETTINGS / "kiosk_profile.json"), index),
+            )
+
+            summary = OrderMacro(nav).perform([{"name": "아이스 아메리카노", "quantity": 1}])
+
+            self.assertTrue(summary["cart_success"])
+            trace = summary["trace"]
+            self.assertEqual(trace["spans"]["order"]["count"], 1)
+            self.assertEqual(trace["spans"]["add_item"]["count"], 1)
+            self.assertIn("activate", trace["spans"])
+            events = json.loads(Path(trace["path"]).read_text(encoding="utf-8"))["traceEvents"]
+            self.assertEqual(events[0]["name"], "order")
+            self.assertIs(nav.tracer, NULL_TRACER)
+
+            cfg.trace_orders = False
+            self.assertIsNone(OrderMacro(nav).perform([{"name": "아이스 아메리카노"}])["trace"])
+
+    def test_tracer_is_detached_when_the_order_raises(self):
+        index = MenuIndex(
+            str(SETTINGS / "kiosk_ui_coords_easyocr.json"), str(SETTINGS / "menu_cards.json")
+        )
+        cfg = SimpleNamespace(dry_run=True, allow_payment_navigation=True, trace_orders=True)
+        nav = Navigator(
+            index,
+            cfg,
+            observer=object(),
+            profile=KioskProfile.load(str(SETTINGS / "kiosk_profile.json"), index),
+        )
+
+        def fail():
+            raise RuntimeError("observer died")
+
+        nav.navigate_to_payment_ready = fail
+        with self.assertRaisesRegex(RuntimeError, "observer died"):
+            OrderMacro(nav).perform([{"name": "아이스 아메리카노", "quantity": 1}])
+        self.assertIs(nav.tracer, NULL_TRACER)
+
+
+if __name__ == "__main__":
+    unittest.main()